@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of the authentication path.
+
+Measures how long it takes to put authorization headers on a request, both by
+calling auth objects directly and through the ``Authentication`` middleware with
+a no-op handler, so the numbers show the overhead added to every ``fetch``.
+
+Usage::
+
+    PYTHONPATH=src python -m benchmarks.auth [--number 100000]
+"""
+
+import argparse
+import timeit
+from typing import Callable, Dict, Generator
+
+from apiwrappers import Method, Request, Response
+from apiwrappers.auth import ApiKeyAuth, BasicAuth, TokenAuth
+from apiwrappers.middleware.auth import Authentication
+
+RESPONSE = Response(
+    request=Request(Method.GET, "https://example.org"),
+    status_code=200,
+    url="https://example.org",
+    headers=None,  # type: ignore
+    cookies=None,  # type: ignore
+    content=b'{"token": "token"}',
+    encoding="utf-8",
+)
+
+
+def handler(request: Request, *args, **kwargs) -> Response:
+    # pylint: disable=unused-argument
+    return RESPONSE
+
+
+def auth_flow() -> Generator[Request, Response, Dict[str, str]]:
+    response = yield Request(Method.POST, "https://example.org/token")
+    return {"Authorization": f"Bearer {response.json()['token']}"}  # type: ignore
+
+
+def through_middleware(auth) -> Callable[[], Response]:
+    middleware = Authentication(handler)
+
+    def call() -> Response:
+        return middleware(Request(Method.GET, "https://example.org", auth=auth))
+
+    return call
+
+
+def without_middleware() -> Response:
+    return handler(Request(Method.GET, "https://example.org"))
+
+
+CASES: Dict[str, Callable[[], object]] = {
+    "BasicAuth()": BasicAuth("username", "password"),
+    "TokenAuth()": TokenAuth("token"),
+    "ApiKeyAuth()": ApiKeyAuth("key"),
+    "request without middleware": without_middleware,
+    "middleware, no auth": through_middleware(None),
+    "middleware, tuple auth": through_middleware(("username", "password")),
+    "middleware, BasicAuth": through_middleware(BasicAuth("username", "password")),
+    "middleware, TokenAuth": through_middleware(TokenAuth("token")),
+    "middleware, auth flow": through_middleware(auth_flow),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    width = max(len(name) for name in CASES)
+    for name, func in CASES.items():
+        timings = timeit.repeat(func, number=args.number, repeat=args.repeat)
+        per_call = min(timings) / args.number * 1e9
+        print(f"{name:<{width}}  {per_call:10.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Benchmark of drivers against a local server.
+
+Makes requests with ``RequestsDriver``, ``Urllib3Driver``, ``AioHttpDriver`` and
+``AsyncioDriver`` to a server running on loopback and reports throughput and
+latency percentiles. Each driver is measured with different number of middleware,
+payload sizes and with or without ``model=`` decoding, and compared to the same
+requests made with plain requests/urllib3/aiohttp, so the overhead shows what
+*apiwrappers* adds on top.
+
+Usage::
+
+    PYTHONPATH=src python -m benchmarks.drivers [--number 1000] [--sizes 1 100]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Sequence, Type
+
+import aiohttp
+import requests
+import urllib3
+
+from apiwrappers import Method, Request, fetch, make_driver
+from apiwrappers.drivers.asyncio import AsyncioDriver
+from apiwrappers.middleware import BaseMiddleware
+from benchmarks.server import serve
+
+
+@dataclass
+class Item:
+    id: int
+    name: str
+    price: float
+    tags: List[str]
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    latencies: List[float]
+    elapsed: float
+
+    @property
+    def rps(self) -> float:
+        return len(self.latencies) / self.elapsed
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.latencies)
+
+    def percentile(self, percent: int) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, len(latencies) * percent // 100)]
+
+
+def make_middleware(depth: int) -> List[Type[BaseMiddleware]]:
+    # middleware of the same type is added to a chain only once
+    return [type(f"Noop{i}", (BaseMiddleware,), {}) for i in range(depth)]
+
+
+def run(name: str, size: int, call: Callable[[], object], number: int) -> Result:
+    call()  # warm up connection pool
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(number):
+        request_start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - request_start)
+    return Result(name, size, latencies, time.perf_counter() - start)
+
+
+async def run_async(
+    name: str,
+    size: int,
+    call: Callable[[], Awaitable[object]],
+    number: int,
+    concurrency: int,
+) -> Result:
+    await call()  # warm up connection pool
+    latencies: List[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            request_start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - request_start)
+
+    counts = [number // concurrency] * concurrency
+    counts[0] += number % concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(count) for count in counts))
+    return Result(name, size, latencies, time.perf_counter() - start)
+
+
+def bench_requests(
+    url: str, size: int, depths: Sequence[int], number: int
+) -> List[Result]:
+    url = f"{url}/items?size={size}"
+    results = []
+    with requests.Session() as session:
+        call = lambda: session.get(url).json()  # noqa: E731
+        results.append(run("requests", size, call, number))
+
+    request = Request(Method.GET, url)
+    for depth in depths:
+        driver = make_driver("requests", *make_middleware(depth))
+        call_driver = lambda: fetch(driver, request).json()  # noqa: E731
+        name = f"RequestsDriver, {depth} middleware"
+        results.append(run(name, size, call_driver, number))
+        driver.close()  # type: ignore
+
+    driver = make_driver("requests")
+    name = "RequestsDriver, model=List[Item]"
+    call_model = lambda: fetch(driver, request, model=List[Item])  # noqa: E731
+    results.append(run(name, size, call_model, number))
+    driver.close()  # type: ignore
+    return results
+
+
+def bench_urllib3(
+    url: str, size: int, depths: Sequence[int], number: int
+) -> List[Result]:
+    url = f"{url}/items?size={size}"
+    results = []
+    with urllib3.PoolManager() as poolmanager:
+        call = lambda: poolmanager.request("GET", url).json()  # noqa: E731
+        results.append(run("urllib3", size, call, number))
+
+    request = Request(Method.GET, url)
+    for depth in depths:
+        driver = make_driver("urllib3", *make_middleware(depth))
+        call_driver = lambda: fetch(driver, request).json()  # noqa: E731
+        name = f"Urllib3Driver, {depth} middleware"
+        results.append(run(name, size, call_driver, number))
+        driver.close()  # type: ignore
+
+    # the same request with requests to see how much is saved by skipping it
+    driver = make_driver("requests")
+    call_requests = lambda: fetch(driver, request).json()  # noqa: E731
+    results.append(run("RequestsDriver, 0 middleware", size, call_requests, number))
+    driver.close()  # type: ignore
+    return results
+
+
+async def bench_aiohttp(
+    url: str, size: int, depths: Sequence[int], number: int, concurrency: int
+) -> List[Result]:
+    url = f"{url}/items?size={size}"
+    results = []
+    async with aiohttp.ClientSession() as session:
+
+        async def call() -> object:
+            async with session.get(url) as response:
+                return await response.json()
+
+        results.append(await run_async("aiohttp", size, call, number, concurrency))
+
+    request = Request(Method.GET, url)
+    for depth in depths:
+        driver = make_driver("aiohttp", *make_middleware(depth))
+
+        async def call_driver() -> object:
+            return (await fetch(driver, request)).json()  # type: ignore
+
+        name = f"AioHttpDriver, {depth} middleware"
+        results.append(await run_async(name, size, call_driver, number, concurrency))
+        await driver.close()  # type: ignore
+
+    driver = make_driver("aiohttp")
+    name = "AioHttpDriver, model=List[Item]"
+    call_model = lambda: fetch(driver, request, model=List[Item])  # noqa: E731
+    results.append(await run_async(name, size, call_model, number, concurrency))
+    await driver.close()  # type: ignore
+    return results
+
+
+async def bench_asyncio(
+    url: str, size: int, depths: Sequence[int], number: int, concurrency: int
+) -> List[Result]:
+    url = f"{url}/items?size={size}"
+    results = []
+    async with aiohttp.ClientSession() as session:
+
+        async def call() -> object:
+            async with session.get(url) as response:
+                return await response.json()
+
+        results.append(await run_async("aiohttp", size, call, number, concurrency))
+
+    request = Request(Method.GET, url)
+    for use_httptools in (True, False):
+        parser = "httptools" if use_httptools else "python"
+        for depth in depths:
+            driver = AsyncioDriver(
+                *make_middleware(depth), timeout=30, use_httptools=use_httptools
+            )
+
+            async def call_driver() -> object:
+                return (await fetch(driver, request)).json()  # type: ignore
+
+            name = f"AsyncioDriver, {parser}, {depth} middleware"
+            results.append(
+                await run_async(name, size, call_driver, number, concurrency)
+            )
+            await driver.close()  # type: ignore
+
+    # the same request with aiohttp to see how much is saved by skipping it
+    driver = make_driver("aiohttp")
+
+    async def call_aiohttp() -> object:
+        return (await fetch(driver, request)).json()  # type: ignore
+
+    name = "AioHttpDriver, 0 middleware"
+    results.append(await run_async(name, size, call_aiohttp, number, concurrency))
+    await driver.close()  # type: ignore
+    return results
+
+
+def report(results: List[Result]) -> None:
+    # the first result is always made with a plain HTTP client
+    baseline = results[0]
+    for result in results:
+        overhead = (result.mean - baseline.mean) * 1e6
+        print(
+            f"{result.name:<40} {result.size:>6} {result.rps:>9.0f} "
+            f"{result.percentile(50) * 1e3:>8.2f} "
+            f"{result.percentile(90) * 1e3:>8.2f} "
+            f"{result.percentile(99) * 1e3:>8.2f} "
+            f"{overhead:>+10.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--middleware", type=int, nargs="+", default=[0, 1, 5])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="number of concurrent requests for async drivers",
+    )
+    parser.add_argument(
+        "--driver",
+        choices=["requests", "urllib3", "aiohttp", "asyncio"],
+        nargs="+",
+    )
+    args = parser.parse_args()
+    drivers = args.driver or ["requests", "urllib3", "aiohttp", "asyncio"]
+
+    print(
+        f"{'case':<40} {'size':>6} {'req/s':>9} "
+        f"{'p50, ms':>8} {'p90, ms':>8} {'p99, ms':>8} {'overhead, us':>10}"
+    )
+    benchmarks: Dict[str, Callable[[str, int], List[Result]]] = {
+        "requests": lambda url, size: bench_requests(
+            url, size, args.middleware, args.number
+        ),
+        "urllib3": lambda url, size: bench_urllib3(
+            url, size, args.middleware, args.number
+        ),
+        "aiohttp": lambda url, size: asyncio.run(
+            bench_aiohttp(url, size, args.middleware, args.number, args.concurrency)
+        ),
+        "asyncio": lambda url, size: asyncio.run(
+            bench_asyncio(url, size, args.middleware, args.number, args.concurrency)
+        ),
+    }
+    with serve() as server:
+        for driver in drivers:
+            for size in args.sizes:
+                report(benchmarks[driver](server.url, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Micro-benchmark of ``fromjson``.
+
+Measures how long it takes to decode JSON into dataclasses, NamedTuples, nested
+generic types and large lists. Results can be saved as JSON and compared to a
+baseline, failing if any case became slower than the threshold allows.
+
+Usage::
+
+    # save a baseline, e.g. on the master branch
+    PYTHONPATH=src python -m benchmarks.fromjson --output baseline.json
+
+    # compare changes to the baseline, fails on regression
+    PYTHONPATH=src python -m benchmarks.fromjson --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from apiwrappers.typedefs import Json
+from apiwrappers.utils import fromjson
+
+
+@dataclass
+class Tag:
+    name: str
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+    email: Optional[str]
+    tags: List[Tag]
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+    label: str = ""
+
+
+def make_user(i: int) -> Dict[str, Json]:
+    return {
+        "id": i,
+        "name": f"user-{i}",
+        "email": None if i % 2 else f"user-{i}@example.org",
+        "tags": [{"name": "a"}, {"name": "b"}],
+        "scores": {"x": 1.0, "y": 2.5},
+    }
+
+
+def make_cases(sizes: List[int]) -> Dict[str, Tuple[Any, Json]]:
+    cases: Dict[str, Tuple[Any, Json]] = {
+        "int": (int, 1),
+        "dataclass": (User, make_user(1)),
+        "NamedTuple from list": (Point, [1, 2, "point"]),
+        "NamedTuple from dict": (Point, {"x": 1, "y": 2}),
+        "Dict[str, List[Optional[int]]]": (
+            Dict[str, List[Optional[int]]],
+            {str(i): [i, None, i] for i in range(10)},
+        ),
+    }
+    for size in sizes:
+        cases[f"List[int], {size} items"] = (List[int], list(range(size)))
+        cases[f"List[Point], {size} items"] = (
+            List[Point],
+            [[i, i, "point"] for i in range(size)],
+        )
+        cases[f"List[User], {size} items"] = (
+            List[User],
+            [make_user(i) for i in range(size)],
+        )
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> float:
+    """Returns the best time of a single call in seconds."""
+    # picks number of calls so each repetition takes at least `min_time`
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 10
+    timings = [elapsed] + timeit.repeat(func, number=number, repeat=repeat - 1)
+    return min(timings) / number
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[str]:
+    """Returns names of the cases that are slower than baseline."""
+    regressions = []
+    for name, seconds in results.items():
+        if name in baseline and seconds > baseline[name] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="number of items in large lists, e.g. 1000 1000000",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum duration of a single repetition, in seconds",
+    )
+    parser.add_argument("--output", help="a path to save results as JSON")
+    parser.add_argument("--baseline", help="a path to results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown relative to the baseline, 0.1 means 10%%",
+    )
+    args = parser.parse_args()
+
+    baseline: Dict[str, float] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    cases = make_cases(args.sizes)
+    width = max(len(name) for name in cases)
+    results: Dict[str, float] = {}
+    for name, (objtype, data) in cases.items():
+        seconds = measure(lambda: fromjson(objtype, data), args.repeat, args.min_time)
+        results[name] = seconds
+        line = f"{name:<{width}}  {seconds * 1e6:14.2f} us/call"
+        if name in baseline:
+            line += f"  {seconds / baseline[name] - 1:+8.1%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            meta = {"python": platform.python_version(), "machine": platform.machine()}
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nSlower than baseline by more than {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+A local HTTP server for benchmarks.
+
+The server runs an aiohttp application on loopback in a background thread,
+so benchmarks measure the client side rather than the network.
+
+Endpoints:
+    * ``GET /items?size=N`` - a JSON list of ``N`` items.
+"""
+
+import asyncio
+import contextlib
+import json
+import socket
+import threading
+from typing import Dict, Iterator, List
+
+from aiohttp import web
+
+from apiwrappers.typedefs import Json
+
+
+def make_items(size: int) -> List[Dict[str, Json]]:
+    return [
+        {"id": i, "name": f"item-{i}", "price": i * 0.5, "tags": ["a", "b"]}
+        for i in range(size)
+    ]
+
+
+class Server:
+    def __init__(self, host: str = "127.0.0.1"):
+        self.socket = socket.socket()
+        self.socket.bind((host, 0))
+        self._payloads: Dict[int, bytes] = {}
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.socket.getsockname()
+        return f"http://{host}:{port}"
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/items", self.items)
+        return app
+
+    async def items(self, request: web.Request) -> web.Response:
+        size = int(request.query.get("size", 1))
+        # payloads are cached, so encoding JSON doesn't skew the numbers
+        if size not in self._payloads:
+            self._payloads[size] = json.dumps(make_items(size)).encode()
+        return web.Response(body=self._payloads[size], content_type="application/json")
+
+    async def _start(self) -> None:
+        await self._runner.setup()
+        await web.SockSite(self._runner, self.socket).start()
+
+    def start(self) -> None:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@contextlib.contextmanager
+def serve() -> Iterator[Server]:
+    """Starts a local server and stops it on exit."""
+    server = Server()
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
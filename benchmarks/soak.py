@@ -0,0 +1,242 @@
+"""
+Memory soak test of drivers.
+
+Makes lots of requests with ``RequestsDriver`` and ``AioHttpDriver`` to a local
+server, tracking memory with ``tracemalloc`` and process RSS. Reports memory
+still allocated per request, garbage collector runs per request, the biggest
+allocation sites, and number of live ``Response``, middleware and session
+objects.
+
+Allocations are compared between the first checkpoint, after a warm up batch,
+and the last one, leaving out those made by the soak test itself. Live objects
+are compared between the second checkpoint, when caches and pools are already
+filled, and the last one. The command fails if more than ``--max-growth`` bytes
+per request stay allocated, on top of ``--slack`` bytes that may stay allocated
+regardless of number of requests, or live objects keep piling up.
+
+Usage::
+
+    PYTHONPATH=src python -m benchmarks.soak [--number 200000] [--driver requests]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import resource
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+import aiohttp
+import requests
+
+from apiwrappers import Method, Request, Response, fetch, make_driver
+from apiwrappers.middleware import BaseMiddleware
+from benchmarks.server import serve
+
+# live objects of these types should not grow with number of requests
+TRACKED_TYPES: Tuple[type, ...] = (
+    Response,
+    BaseMiddleware,
+    requests.Session,
+    aiohttp.ClientSession,
+)
+
+
+# allocations of the soak test itself, such as checkpoints and object counts
+HARNESS_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class Noop(BaseMiddleware):
+    pass
+
+
+@dataclass
+class Checkpoint:
+    requests: int
+    traced: int
+    rss: int
+    collections: int
+    objects: Dict[str, int] = field(default_factory=dict)
+
+
+Results = Tuple[List[Checkpoint], tracemalloc.Snapshot, tracemalloc.Snapshot]
+
+
+def rss() -> int:
+    """Returns current resident set size in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # peak RSS, in kilobytes on Linux and bytes on macOS
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+
+def count_objects() -> Dict[str, int]:
+    counts: Dict[str, int] = {tp.__name__: 0 for tp in TRACKED_TYPES}
+    for obj in gc.get_objects():
+        for tp in TRACKED_TYPES:
+            if isinstance(obj, tp):
+                counts[tp.__name__] += 1
+    return counts
+
+
+def checkpoint(count: int) -> Checkpoint:
+    # only memory that is still referenced is of interest
+    gc.collect()
+    return Checkpoint(
+        requests=count,
+        traced=tracemalloc.get_traced_memory()[0],
+        rss=rss(),
+        # full collections are made by checkpoints, so they are not counted
+        collections=sum(stat["collections"] for stat in gc.get_stats()[:2]),
+        objects=count_objects(),
+    )
+
+
+def soak(call: Callable[[int], None], number: int, checkpoints: int) -> Results:
+    """
+    Makes ``number`` requests in batches, taking a checkpoint after each one.
+
+    ``call`` makes as many requests as it is asked to.
+    """
+    batch = max(1, number // checkpoints)
+    call(batch)  # warm up
+    results = [checkpoint(0)]
+    start = tracemalloc.take_snapshot()
+    for i in range(1, checkpoints + 1):
+        call(batch)
+        results.append(checkpoint(i * batch))
+    end = tracemalloc.take_snapshot()
+    # filtering allocates, so it is done only once both snapshots are taken
+    return (
+        results,
+        start.filter_traces(HARNESS_FILTERS),
+        end.filter_traces(HARNESS_FILTERS),
+    )
+
+
+def report(name: str, soaked: Results, max_growth: float, slack: int) -> bool:
+    results, start, end = soaked
+    first, last = results[1], results[-1]
+    count = last.requests - first.requests
+    stats = end.compare_to(start, "lineno")
+    size = sum(stat.size_diff for stat in stats)
+    allocated = size / last.requests
+    blocks = sum(stat.count_diff for stat in stats) / last.requests
+    collections = (last.collections - results[0].collections) / last.requests
+    print(f"\n{name}: {last.requests} requests")
+    print(f"{'requests':>10} {'traced, KiB':>12} {'RSS, MiB':>10}  live objects")
+    for item in results:
+        objects = ", ".join(f"{k}={v}" for k, v in item.objects.items())
+        print(
+            f"{item.requests:>10} {item.traced / 1024:>12.1f} "
+            f"{item.rss / 2**20:>10.1f}  {objects}"
+        )
+    print(f"allocated memory:   {allocated:.2f} bytes/request")
+    print(f"allocated blocks:   {blocks:.4f} per request")
+    print(f"RSS growth:         {(last.rss - first.rss) / count:.2f} bytes/request")
+    print(f"young GC runs:      {collections * 1000:.2f} per 1000 requests")
+    print("top allocation sites by growth:")
+    for stat in stats[:5]:
+        print(f"    {stat}")
+
+    ok = True
+    if size > max_growth * last.requests + slack:
+        print(f"FAIL: more than {max_growth} bytes/request stay allocated")
+        ok = False
+    for key, value in last.objects.items():
+        # allow for objects alive at the moment of a checkpoint
+        if value > first.objects[key] + 10:
+            print(f"FAIL: live {key} objects grew from {first.objects[key]} to {value}")
+            ok = False
+    return ok
+
+
+def soak_requests(url: str, number: int, checkpoints: int) -> Results:
+    driver = make_driver("requests", Noop)
+    request = Request(Method.GET, url)
+
+    def call(count: int) -> None:
+        for _ in range(count):
+            fetch(driver, request).json()
+
+    try:
+        return soak(call, number, checkpoints)
+    finally:
+        driver.close()  # type: ignore
+
+
+def soak_aiohttp(url: str, number: int, checkpoints: int) -> Results:
+    driver = make_driver("aiohttp", Noop)
+    request = Request(Method.GET, url)
+    loop = asyncio.new_event_loop()
+
+    async def make_requests(count: int) -> None:
+        for _ in range(count):
+            (await fetch(driver, request)).json()
+
+    def call(count: int) -> None:
+        loop.run_until_complete(make_requests(count))
+
+    try:
+        return soak(call, number, checkpoints)
+    finally:
+        loop.run_until_complete(driver.close())  # type: ignore
+        loop.close()
+
+
+def checkpoints_number(value: str) -> int:
+    number = int(value)
+    if number < 2:
+        # growth is measured from the second checkpoint
+        raise argparse.ArgumentTypeError("at least 2 checkpoints are required")
+    return number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    parser.add_argument("--checkpoints", type=checkpoints_number, default=10)
+    parser.add_argument("--size", type=int, default=10, help="items in a response")
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=1.0,
+        help="allowed memory growth in bytes per request",
+    )
+    parser.add_argument(
+        "--slack",
+        type=int,
+        default=64 * 1024,
+        help=(
+            "allowed memory growth in bytes that doesn't depend on number of "
+            "requests, e.g. timers waiting to be cleaned up by event loop"
+        ),
+    )
+    parser.add_argument(
+        "--driver", choices=["requests", "aiohttp"], nargs="+", default=[]
+    )
+    args = parser.parse_args()
+    drivers = {"requests": soak_requests, "aiohttp": soak_aiohttp}
+
+    tracemalloc.start()
+    ok = True
+    with serve() as server:
+        url = f"{server.url}/items?size={args.size}"
+        for name in args.driver or drivers:
+            results = drivers[name](url, args.number, args.checkpoints)
+            ok = report(name, results, args.max_growth, args.slack) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
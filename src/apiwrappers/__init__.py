@@ -1,6 +1,13 @@
+from apiwrappers.dns import DNSCache  # noqa: F401
 from apiwrappers.entities import Method, Request, Response  # noqa: F401
 from apiwrappers.exceptions import ConnectionFailed, DriverError, Timeout  # noqa: F401
 from apiwrappers.factories import make_driver  # noqa: F401
 from apiwrappers.protocols import AsyncDriver, Driver  # noqa: F401
 from apiwrappers.shortcuts import fetch  # noqa: F401
-from apiwrappers.structures import Url  # noqa: F401
+from apiwrappers.structures import (  # noqa: F401
+    Deadline,
+    PoolStats,
+    Timeouts,
+    Timings,
+    Url,
+)
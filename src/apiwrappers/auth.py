@@ -1,8 +1,36 @@
+import abc
 import base64
-from typing import Dict
+from typing import Any, Dict, Optional
 
 
-class BasicAuth:
+class StaticAuth(abc.ABC):
+    """
+    Base class for authentication with credentials known beforehand.
+
+    Authorization headers are computed on the first call and then reused for
+    every subsequent request. Changing any attribute resets the cached headers.
+
+    Subclasses should implement :py:meth:`make_headers`.
+    """
+
+    _headers: Optional[Dict[str, str]] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name != "_headers":
+            super().__setattr__("_headers", None)
+
+    def __call__(self) -> Dict[str, str]:
+        if self._headers is None:
+            self._headers = self.make_headers()
+        return self._headers
+
+    @abc.abstractmethod
+    def make_headers(self) -> Dict[str, str]:
+        """Returns authorization headers to add to every request."""
+
+
+class BasicAuth(StaticAuth):
     def __init__(self, username: str, password: str):
         self.username = username
         self.password = password
@@ -14,11 +42,11 @@ class BasicAuth:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} '{self.username}'>"
 
-    def __call__(self) -> Dict[str, str]:
+    def make_headers(self) -> Dict[str, str]:
         return {"Authorization": str(self)}
 
 
-class TokenAuth:
+class TokenAuth(StaticAuth):
     def __init__(self, token: str, kind: str = "Bearer"):
         self.token = token
         self.kind = kind
@@ -29,11 +57,11 @@ class TokenAuth:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} '{self.kind} ...'>"
 
-    def __call__(self) -> Dict[str, str]:
+    def make_headers(self) -> Dict[str, str]:
         return {"Authorization": str(self)}
 
 
-class ApiKeyAuth:
+class ApiKeyAuth(StaticAuth):
     def __init__(self, key: str, header: str = "X-Api-Key"):
         self.key = key
         self.header = header
@@ -44,5 +72,5 @@ class ApiKeyAuth:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} '{self.header} ...'>"
 
-    def __call__(self) -> Dict[str, str]:
+    def make_headers(self) -> Dict[str, str]:
         return {self.header: self.key}
@@ -0,0 +1,301 @@
+"""
+Load generator for API wrappers.
+
+Calls a wrapper method or makes a single request over and over for a given
+duration, either as fast as possible with fixed concurrency, or at target rate,
+and prints throughput, latency percentiles, errors and CPU time per request.
+
+Usage::
+
+    # call a wrapper method, wrapper is instantiated as `GitHub(host, driver)`
+    python -m apiwrappers.bench example.client.GitHub.users \\
+        --host https://api.github.com --arg since=10 --rps 5 --duration 10
+
+    # make a request with aiohttp driver and 50 concurrent requests
+    python -m apiwrappers.bench "GET https://example.org" \\
+        --driver aiohttp --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from apiwrappers.entities import Method, Request, Response
+from apiwrappers.factories import make_driver
+from apiwrappers.protocols import AsyncDriver, Driver
+from apiwrappers.shortcuts import fetch
+
+Call = Callable[[], Any]
+AsyncCall = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Report:
+    """
+    Results of a load test.
+
+    Args:
+        latencies: latency of every call, in seconds. When calls are made at
+            target rate, latency is measured from the time a call was scheduled,
+            so it includes time spent waiting for a free worker.
+        errors: number of errors by exception name or HTTP status.
+        elapsed: duration of a load test, in seconds.
+        cpu_time: CPU time spent by the process, in seconds.
+    """
+
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+    cpu_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cpu_per_call(self) -> float:
+        return self.cpu_time / len(self.latencies) if self.latencies else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
+
+    def record(self, result: Any, scheduled: float) -> None:
+        self.latencies.append(time.perf_counter() - scheduled)
+        if isinstance(result, BaseException):
+            self.errors[type(result).__name__] += 1
+        elif isinstance(result, Response) and result.status_code >= 400:
+            self.errors[f"HTTP {result.status_code}"] += 1
+
+    def format(self) -> str:
+        lines = [
+            f"Calls:          {len(self.latencies)} in {self.elapsed:.2f}s",
+            f"Throughput:     {self.throughput:.1f} calls/s",
+            f"CPU per call:   {self.cpu_per_call * 1e3:.3f} ms",
+            "Latency, ms:    "
+            + "  ".join(
+                f"p{percent}={self.percentile(percent) * 1e3:.2f}"
+                for percent in (50, 90, 99)
+            )
+            + f"  max={max(self.latencies, default=0) * 1e3:.2f}",
+            f"Errors:         {sum(self.errors.values())}",
+        ]
+        for name, count in self.errors.most_common():
+            lines.append(f"    {name}: {count}")
+        return "\n".join(lines)
+
+
+class Schedule:
+    """
+    Hands out start times of calls to workers until duration is over.
+
+    Without ``rate`` calls start as soon as a worker is free.
+    """
+
+    def __init__(self, duration: float, rate: Optional[float] = None):
+        self.start = time.perf_counter()
+        self.end = self.start + duration
+        self.rate = rate
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> Optional[float]:
+        if self.rate is None:
+            now = time.perf_counter()
+            return now if now < self.end else None
+        with self._lock:
+            scheduled = self.start + self._count / self.rate
+            self._count += 1
+        return scheduled if scheduled < self.end else None
+
+
+def run(
+    call: Call, duration: float, concurrency: int = 1, rate: Optional[float] = None
+) -> Report:
+    """
+    Calls ``call`` from ``concurrency`` threads for ``duration`` seconds.
+
+    Args:
+        call: a function to call.
+        duration: for how long to make calls, in seconds.
+        concurrency: number of threads making calls.
+        rate: target number of calls per second. If not set, calls are made
+            as fast as possible.
+
+    Returns:
+        Results of a load test.
+    """
+    cpu_start = time.process_time()
+    schedule = Schedule(duration, rate)
+
+    def worker(report: Report) -> None:
+        while True:
+            scheduled = schedule.next()
+            if scheduled is None:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                result = call()
+            except Exception as exc:  # pylint: disable=broad-except
+                result = exc
+            report.record(result, scheduled)
+
+    # every thread records into its own report, so no locking is needed
+    reports = [Report() for _ in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(item,)) for item in reports]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report = Report(
+        elapsed=time.perf_counter() - schedule.start,
+        cpu_time=time.process_time() - cpu_start,
+    )
+    for item in reports:
+        report.latencies.extend(item.latencies)
+        report.errors.update(item.errors)
+    return report
+
+
+async def run_async(
+    call: AsyncCall,
+    duration: float,
+    concurrency: int = 1,
+    rate: Optional[float] = None,
+) -> Report:
+    """
+    The same as :py:func:`run`, but calls are made from ``concurrency`` tasks.
+    """
+    report = Report()
+    cpu_start = time.process_time()
+    schedule = Schedule(duration, rate)
+
+    async def worker() -> None:
+        while True:
+            scheduled = schedule.next()
+            if scheduled is None:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                result = await call()
+            except Exception as exc:  # pylint: disable=broad-except
+                result = exc
+            report.record(result, scheduled)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.elapsed = time.perf_counter() - schedule.start
+    report.cpu_time = time.process_time() - cpu_start
+    return report
+
+
+def make_call(
+    target: str,
+    driver: Union[Driver, AsyncDriver],
+    host: Optional[str] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> Union[Call, AsyncCall]:
+    """
+    Makes a function to call during a load test.
+
+    Args:
+        target: either a request, e.g. ``GET https://example.org``, or an
+            importable wrapper method, e.g. ``example.client.GitHub.users``.
+        driver: a driver to make requests with.
+        host: a host to instantiate a wrapper with.
+        kwargs: keyword arguments for a wrapper method.
+
+    Returns:
+        A function without arguments.
+    """
+    method, _, url = target.partition(" ")
+    if method in Method.__members__:
+        request = Request(Method[method], url.strip())
+        return functools.partial(fetch, driver, request)
+
+    path, _, name = target.rpartition(".")
+    wrapper = import_string(path)(host, driver=driver)
+    return functools.partial(getattr(wrapper, name), **(kwargs or {}))
+
+
+def import_string(path: str) -> Any:
+    module_path, _, attr = path.rpartition(".")
+    try:
+        module = importlib.import_module(path)
+    except ImportError:
+        if not module_path:
+            raise
+        return getattr(import_string(module_path), attr)
+    return module
+
+
+def parse_kwargs(items: Sequence[str]) -> Dict[str, Any]:
+    kwargs = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        try:
+            kwargs[key] = json.loads(value)
+        except ValueError:
+            kwargs[key] = value
+    return kwargs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Report:
+    parser = argparse.ArgumentParser(
+        prog="python -m apiwrappers.bench",
+        description=__doc__.split("\n\n")[0].strip(),
+    )
+    parser.add_argument(
+        "target", help="'METHOD URL' or a path to a wrapper method, e.g. pkg.Api.get"
+    )
+    parser.add_argument("--driver", default="requests", help="default: requests")
+    parser.add_argument("--host", help="a host to instantiate a wrapper with")
+    parser.add_argument(
+        "--arg",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="an argument for a wrapper method, value is parsed as JSON if possible",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="in seconds")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rps", type=float, help="target number of calls per second")
+    args = parser.parse_args(argv)
+
+    driver = make_driver(args.driver)
+    call = make_call(args.target, driver, args.host, parse_kwargs(args.arg))
+    if asyncio.iscoroutinefunction(driver.fetch):
+
+        async def run_and_close() -> Report:
+            try:
+                return await run_async(call, args.duration, args.concurrency, args.rps)
+            finally:
+                await driver.close()  # type: ignore
+
+        report = asyncio.run(run_and_close())
+    else:
+        try:
+            report = run(call, args.duration, args.concurrency, args.rps)
+        finally:
+            driver.close()  # type: ignore
+    print(report.format())
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import ipaddress
+import socket
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+Overrides = Mapping[str, Union[str, Sequence[str]]]
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """
+    Resolved addresses of hosts shared by connections of a driver.
+
+    Without a cache every new connection resolves a host again, which adds
+    latency and load on a resolver. Addresses are kept for ``ttl`` seconds,
+    and the same instance can be shared between several drivers.
+
+    Args:
+        ttl: how many seconds to keep resolved addresses for. If set to
+            ``None``, addresses are kept until :py:meth:`clear` is called.
+        overrides: addresses to use for hosts instead of resolving them,
+            e.g. to point a driver at a test server. Either a single address
+            or a list of addresses can be set for a host.
+
+    Usage::
+
+        >>> from apiwrappers import DNSCache
+        >>> from apiwrappers.drivers.requests import RequestsDriver
+        >>> dns = DNSCache(ttl=60, overrides={"example.org": "127.0.0.1"})
+        >>> driver = RequestsDriver(timeout=5, dns=dns)
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 10,
+        overrides: Optional[Overrides] = None,
+    ):
+        self.ttl = ttl
+        self.overrides: Dict[str, List[str]] = {
+            host: [addresses] if isinstance(addresses, str) else list(addresses)
+            for host, addresses in (overrides or {}).items()
+        }
+        self._cache: Dict[str, Tuple[List[str], Optional[float]]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"ttl={repr(self.ttl)}, "
+            f"overrides={repr(self.overrides)}"
+            ")"
+        )
+
+    def get(self, host: str) -> Optional[List[str]]:
+        """
+        Returns addresses of a host, if they are known.
+
+        Args:
+            host: a host name or an IP address.
+
+        Returns:
+            A list of addresses or ``None`` if a host needs to be resolved.
+        """
+        if host in self.overrides:
+            return self.overrides[host]
+        if is_ip_address(host):
+            return [host]
+        try:
+            addresses, expires_at = self._cache[host]
+        except KeyError:
+            return None
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._cache.pop(host, None)
+            return None
+        return addresses
+
+    def set(self, host: str, addresses: List[str]) -> None:
+        """Stores resolved addresses of a host for ``ttl`` seconds."""
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        self._cache[host] = (addresses, expires_at)
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """
+        Returns addresses of a host, resolving it if they are not known.
+
+        Raises:
+            socket.gaierror: if a host can't be resolved.
+        """
+        addresses = self.get(host)
+        if addresses is None:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            # the order is preserved, so preferred addresses are tried first
+            addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+            self.set(host, addresses)
+        return addresses
+
+    def clear(self) -> None:
+        """Forgets all resolved addresses, but not overrides."""
+        self._cache.clear()
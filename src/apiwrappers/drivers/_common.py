@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+from email.message import Message
+from http.cookies import SimpleCookie
+from typing import Any, Awaitable, Callable, Iterable, Optional, Tuple, Union, overload
+
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Trace
+from apiwrappers.protocols import AsyncDriver, Driver
+from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from apiwrappers.typedefs import Timeout
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def make_response(
+    request: Request,
+    url: str,
+    status_code: int,
+    headers: Iterable[Tuple[str, str]],
+    content: bytes,
+    trace: Trace,
+) -> Response:
+    """Builds a response from raw header pairs, as they are received."""
+    response_headers: CaseInsensitiveDict[str] = CaseInsensitiveDict()
+    cookies: SimpleCookie = SimpleCookie()
+    for name, value in headers:
+        if name.lower() == "set-cookie":
+            cookies.load(value)
+        if name in response_headers:
+            # the same way as HTTP clients combine repeated headers
+            value = f"{response_headers[name]}, {value}"
+        response_headers[name] = value
+    message = Message()
+    message["Content-Type"] = response_headers.get("Content-Type", "")
+    return Response(
+        request=request,
+        status_code=status_code,
+        url=url,
+        headers=response_headers,
+        cookies=cookies,
+        content=content,
+        encoding=message.get_content_charset() or "utf-8",
+        timings=trace.timings(),
+    )
+
+
+async def close_replaced(
+    close: Callable[[], Awaitable[Any]],
+    loop: Optional[asyncio.AbstractEventLoop],
+) -> None:
+    """
+    Closes connections that a driver replaces with new ones.
+
+    Connections are bound to the event loop they are created in. If that loop
+    is running in another thread, they are closed there. Connections of
+    a loop that is stopped or closed can't be closed gracefully anymore,
+    so closing them is only attempted.
+    """
+
+    async def run() -> None:
+        await close()
+
+    if loop is None or loop is asyncio.get_event_loop():
+        await run()
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(run(), loop)
+    else:
+        with contextlib.suppress(RuntimeError):
+            await run()
+
+
+@overload
+def fetch_wrapped(
+    driver: Driver, request: Request, timeout: Union[Timeout, NoValue]
+) -> Response: ...
+
+
+@overload
+def fetch_wrapped(
+    driver: AsyncDriver, request: Request, timeout: Union[Timeout, NoValue]
+) -> Awaitable[Response]: ...
+
+
+def fetch_wrapped(
+    driver: Union[Driver, AsyncDriver],
+    request: Request,
+    timeout: Union[Timeout, NoValue],
+) -> Union[Response, Awaitable[Response]]:
+    """
+    Makes a request with a driver wrapped by another one.
+
+    Authentication is already applied by middleware of the outer driver,
+    so it is removed from the request to not be applied twice.
+    """
+    return driver.fetch(dataclasses.replace(request, auth=None), timeout=timeout)
@@ -1,24 +1,250 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import socket
 import ssl
+import time
+from collections import defaultdict
+from contextvars import ContextVar
 from datetime import timedelta
 from http.cookies import SimpleCookie
 from ssl import SSLContext
-from typing import Iterable, List, Optional, Tuple, Type, Union
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakSet
 
 import aiohttp
-import certifi
 from aiohttp import FormData
+from aiohttp.client_reqrep import ConnectionKey
+from yarl import URL
 
 from apiwrappers import exceptions
+from apiwrappers.dns import DNSCache
+from apiwrappers.drivers._common import close_replaced
+from apiwrappers.drivers.tls import make_ssl_context
 from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
 from apiwrappers.middleware import MiddlewareChain
 from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
 from apiwrappers.protocols import AsyncMiddleware
-from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from apiwrappers.structures import (
+    CaseInsensitiveDict,
+    Deadline,
+    NoValue,
+    PoolCounters,
+    PoolStats,
+    Timeouts,
+)
 from apiwrappers.typedefs import ClientCert, Data, QueryParams, Timeout, Verify
 
+if TYPE_CHECKING:
+    # only typed since aiohttp 3.9
+    from aiohttp.abc import ResolveResult
+
+
+async def mark(
+    event: str,
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: Any,
+) -> None:
+    # pylint: disable=unused-argument
+    context.trace_request_ctx.mark(event)
+
+
+async def connection_created(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: Any,
+) -> None:
+    # pylint: disable=unused-argument
+    trace = context.trace_request_ctx
+    trace.mark("connect_end")
+    # connection is created only after TLS handshake is completed
+    if str(trace.request.url).startswith("https:"):
+        trace.mark("tls_end")
+
+
+# when the current task started establishing a new connection, if it did
+creation_start: ContextVar[Optional[float]] = ContextVar("creation_start", default=None)
+
+
+async def connection_creation_started(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: Any,
+) -> None:
+    # pylint: disable=unused-argument
+    creation_start.set(time.perf_counter())
+
+
+def make_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    signals = [
+        (trace_config.on_dns_resolvehost_start, "dns_start"),
+        (trace_config.on_dns_resolvehost_end, "dns_end"),
+        (trace_config.on_connection_create_start, "connect_start"),
+        (trace_config.on_connection_reuseconn, "connection_reused"),
+        (trace_config.on_request_end, "headers"),
+    ]
+    for signal, event in signals:
+        signal.append(functools.partial(mark, event))
+    trace_config.on_connection_create_start.append(connection_creation_started)
+    trace_config.on_connection_create_end.append(connection_created)
+    trace_config.freeze()
+    return trace_config
+
+
+TRACE_CONFIG = make_trace_config()
+
+
+class PoolStatsConnector(aiohttp.BaseConnector):
+    """
+    A connector keeping statistics of its pool per host.
+
+    Connections are counted as they are returned by :py:meth:`connect`,
+    while idle and evicted connections are only known to the pool itself,
+    so ``_conns`` and ``_cleanup`` of aiohttp 3.x connector are relied upon.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counters: DefaultDict[ConnectionKey, PoolCounters] = defaultdict(
+            PoolCounters
+        )
+        self.acquired: DefaultDict[ConnectionKey, WeakSet[Any]] = defaultdict(WeakSet)
+        self.protocols: WeakSet[Any] = WeakSet()
+
+    async def connect(self, req, *args, **kwargs):
+        key = req.connection_key
+        counters = self.counters[key]
+        token = creation_start.set(None)
+        start = time.perf_counter()
+        try:
+            conn = await super().connect(req, *args, **kwargs)
+            created_at = creation_start.get()
+        finally:
+            creation_start.reset(token)
+        if conn.protocol in self.protocols:
+            counters.reused += 1
+            counters.wait_time += time.perf_counter() - start
+        else:
+            self.protocols.add(conn.protocol)
+            counters.created += 1
+            # without trace signals, e.g. on warmup, creation isn't waited for
+            if created_at is not None:
+                counters.wait_time += created_at - start
+            counters.handshake(conn.transport.get_extra_info("ssl_object"))
+        self.acquired[key].add(conn)
+        return conn
+
+    def _cleanup(self) -> None:
+        before = self.idle()
+        super()._cleanup()
+        after = self.idle()
+        for key, count in before.items():
+            self.counters[key].evicted += count - after.get(key, 0)
+
+    def idle(self) -> Dict[ConnectionKey, int]:
+        return {key: len(conns) for key, conns in self._conns.items()}
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        idle = self.idle()
+        stats = {}
+        for key in set(self.counters) | set(idle):
+            counters = self.counters[key]
+            # connection is closed once it is released back to the pool
+            counters.in_use = sum(not conn.closed for conn in self.acquired[key])
+            scheme = "https" if key.is_ssl else "http"
+            host = f"{scheme}://{key.host}:{key.port}"
+            stats[host] = counters.snapshot(idle.get(key, 0))
+        return stats
+
+
+class TCPConnector(PoolStatsConnector, aiohttp.TCPConnector):
+    pass
+
+
+class UnixConnector(PoolStatsConnector, aiohttp.UnixConnector):
+    """A connector making all connections to a Unix socket.
+
+    Connections are still pooled by host from URL."""
+
+
+def make_resolver() -> aiohttp.abc.AbstractResolver:
+    try:
+        # aiodns doesn't occupy threads of the default executor
+        return aiohttp.AsyncResolver()
+    except RuntimeError:  # aiodns is not installed
+        return aiohttp.ThreadedResolver()
+
+
+class Resolver(aiohttp.abc.AbstractResolver):
+    """
+    A resolver with aiodns, if it is installed, keeping addresses
+    in a :py:class:`DNSCache <apiwrappers.DNSCache>`.
+    """
+
+    def __init__(self, dns: DNSCache):
+        self.dns = dns
+        self.resolver = make_resolver()
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> List[ResolveResult]:
+        addresses = self.dns.get(host)
+        if addresses is None:
+            results = await self.resolver.resolve(host, port, family)
+            addresses = list(dict.fromkeys(result["host"] for result in results))
+            self.dns.set(host, addresses)
+        return [
+            {
+                "hostname": host,
+                "host": address,
+                "port": port,
+                "family": socket.AF_INET6 if ":" in address else socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+            }
+            for address in addresses
+        ]
+
+    async def close(self) -> None:
+        await self.resolver.close()
+
+
+async def close_pool(
+    connector: Optional[PoolStatsConnector], resolver: Optional[Resolver]
+) -> None:
+    if connector is not None:
+        await connector.close()
+    if resolver is not None:
+        # connector doesn't close a resolver it is given
+        await resolver.close()
+
+
+def convert_error(exc: Union[asyncio.TimeoutError, aiohttp.ClientError]) -> Exception:
+    if isinstance(exc, asyncio.TimeoutError):
+        return exceptions.Timeout()
+    if isinstance(exc, aiohttp.ClientSSLError):
+        return ssl.SSLError(str(exc))
+    if isinstance(exc, aiohttp.ClientConnectionError):
+        return exceptions.ConnectionFailed()
+    return exceptions.DriverError()
+
 
 class AioHttpDriver:
     middleware = MiddlewareChain(Authentication)
@@ -29,11 +255,22 @@ class AioHttpDriver:
         timeout: Timeout,
         verify: Verify = True,
         cert: ClientCert = None,
+        unix_socket: Optional[str] = None,
+        dns: Optional[DNSCache] = None,
     ):
+        # pylint: disable=too-many-arguments
         self.middleware = middleware
         self.timeout = timeout
         self.verify = verify
         self.cert = cert
+        self.unix_socket = unix_socket
+        self.dns = dns
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        self.connector: Optional[PoolStatsConnector] = None
+        self.resolver: Optional[Resolver] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ssl: Optional[Tuple[Any, Union[bool, SSLContext]]] = None
 
     def __repr__(self) -> str:
         middleware = [m.__name__ for m in self.middleware]
@@ -57,7 +294,14 @@ class AioHttpDriver:
         request: Request,
         timeout: Union[Timeout, NoValue] = NoValue(),
     ) -> Response:
-        async with aiohttp.ClientSession() as session:
+        trace = Trace(request, self.hooks)
+        # session is cheap to create and keeps cookies isolated between requests,
+        # while connections are pooled by the shared connector
+        async with aiohttp.ClientSession(
+            connector=await self._get_connector(),
+            connector_owner=False,
+            trace_configs=[TRACE_CONFIG],
+        ) as session:
             try:
                 response = await session.request(
                     request.method.value,
@@ -69,15 +313,12 @@ class AioHttpDriver:
                     json=request.json,
                     timeout=self._prepare_timeout(timeout),
                     ssl=self._prepare_ssl(),
+                    trace_request_ctx=trace,
                 )
-            except asyncio.TimeoutError as exc:
-                raise exceptions.Timeout from exc
-            except aiohttp.ClientSSLError as exc:
-                raise ssl.SSLError(str(exc)) from exc
-            except aiohttp.ClientConnectionError as exc:
-                raise exceptions.ConnectionFailed from exc
-            except aiohttp.ClientError as exc:
-                raise exceptions.DriverError from exc
+                content = await response.read()
+                trace.mark("body")
+            except (asyncio.TimeoutError, aiohttp.ClientError) as exc:
+                raise convert_error(exc) from exc
 
             return Response(
                 request=request,
@@ -85,10 +326,95 @@ class AioHttpDriver:
                 url=str(response.url),
                 headers=CaseInsensitiveDict(response.headers),
                 cookies=SimpleCookie(response.cookies),
-                content=await response.read(),
+                content=content,
                 encoding=response.get_encoding(),
+                timings=trace.timings(),
             )
 
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pool statistics.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        if self.connector is None:
+            return {}
+        return self.connector.pool_stats()
+
+    async def warmup(
+        self,
+        hosts: Iterable[str],
+        connections_per_host: int = 1,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> None:
+        """
+        Opens connections to hosts in advance, so first requests to them
+        don't wait for DNS lookup, TCP connection and TLS handshake.
+
+        All connections are opened concurrently and kept idle in the pool.
+
+        Args:
+            hosts: URLs of hosts, e.g. ``https://example.org``.
+            connections_per_host: how many connections to open to each host.
+            timeout: how long to wait for each connection.
+
+        Raises:
+            ConnectionFailed: if a connection can't be established.
+            Timeout: if a connection isn't established in time.
+        """
+        connector = await self._get_connector()
+        connect_timeout = self._prepare_connect_timeout(timeout)
+        loop = asyncio.get_event_loop()
+        # requests are only used to make connection keys, the same as
+        # for requests made with fetch
+        requests = [
+            aiohttp.ClientRequest("GET", URL(host), loop=loop, ssl=self._prepare_ssl())
+            for host in hosts
+            for _ in range(connections_per_host)
+        ]
+        # connections are held until all of them are open, otherwise
+        # an idle connection would be taken again instead of opening a new one
+        results = await asyncio.gather(
+            *(connector.connect(request, [], connect_timeout) for request in requests),
+            return_exceptions=True,
+        )
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                result.release()
+        if errors:
+            if isinstance(errors[0], (asyncio.TimeoutError, aiohttp.ClientError)):
+                raise convert_error(errors[0]) from errors[0]
+            raise errors[0]
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        await close_pool(self.connector, self.resolver)
+        self.resolver = None
+
+    async def _get_connector(self) -> PoolStatsConnector:
+        # connector is bound to the event loop it is created in
+        loop = asyncio.get_event_loop()
+        if self.connector is None or self.connector.closed or self._loop is not loop:
+            close = functools.partial(close_pool, self.connector, self.resolver)
+            await close_replaced(close, self._loop)
+            self.resolver = None
+            if self.unix_socket is not None:
+                self.connector = UnixConnector(self.unix_socket)
+            elif self.dns is not None:
+                # addresses are cached by DNSCache, which may be shared
+                self.resolver = Resolver(self.dns)
+                self.connector = TCPConnector(
+                    resolver=self.resolver, use_dns_cache=False
+                )
+            else:
+                self.connector = TCPConnector()
+            self._loop = loop
+        return self.connector
+
     @staticmethod
     def _prepare_query_params(params: QueryParams) -> Tuple[Tuple[str, str], ...]:
         query_params: List[Tuple[str, str]] = []
@@ -103,13 +429,41 @@ class AioHttpDriver:
 
     def _prepare_timeout(
         self, timeout: Union[Timeout, NoValue]
-    ) -> Union[int, float, None]:
+    ) -> Union[int, float, None, aiohttp.ClientTimeout]:
         if isinstance(timeout, NoValue):
             return self._prepare_timeout(self.timeout)
         if isinstance(timeout, timedelta):
             return timeout.total_seconds()
+        if isinstance(timeout, Deadline):
+            return self._prepare_timeout(timeout.timeout())
+        if isinstance(timeout, Timeouts):
+            # aiohttp doesn't distinguish waiting for a free connection from
+            # establishing a new one, so both share the same budget
+            acquire = timeout.pool
+            if acquire is not None and timeout.connect is not None:
+                acquire += timeout.connect
+            return aiohttp.ClientTimeout(
+                total=timeout.total,
+                connect=acquire,
+                sock_connect=timeout.connect,
+                sock_read=timeout.read,
+            )
         return timeout
 
+    def _prepare_connect_timeout(
+        self, timeout: Union[Timeout, NoValue]
+    ) -> aiohttp.ClientTimeout:
+        prepared = self._prepare_timeout(timeout)
+        if isinstance(prepared, aiohttp.ClientTimeout):
+            # connector only limits time to acquire a connection
+            connect = prepared.connect
+            if connect is None:
+                connect = prepared.total
+            return aiohttp.ClientTimeout(
+                connect=connect, sock_connect=prepared.sock_connect
+            )
+        return aiohttp.ClientTimeout(connect=prepared)
+
     @staticmethod
     def _prepare_data(request: Request) -> Optional[Union[Data, FormData]]:
         if request.data is not None:
@@ -135,35 +489,9 @@ class AioHttpDriver:
         return None
 
     def _prepare_ssl(self) -> Union[bool, SSLContext]:
-        if self.verify is False:
-            return False
-        if self.verify is True:
-            context = ssl.create_default_context(cafile=certifi.where())
-        else:
-            try:
-                context = ssl.create_default_context(cafile=self.verify)
-            except FileNotFoundError as exc:
-                msg = (
-                    f"Could not find a suitable TLS CA certificate bundle, "
-                    f"invalid path: {self.verify}"
-                )
-                raise FileNotFoundError(msg) from exc
-
-        cert: Optional[str]
-        key: Optional[str]
-        if isinstance(self.cert, tuple):
-            cert, key = self.cert
-        else:
-            cert, key = self.cert, None
-
-        if cert is not None:
-            try:
-                context.load_cert_chain(cert, key)
-            except FileNotFoundError as exc:
-                msg = (
-                    f"Could not find the TLS certificate file, "
-                    f"invalid path: {self.cert}"
-                )
-                raise FileNotFoundError(msg) from exc
-
-        return context
+        # SSL context is a part of a connection key, so creating a new one
+        # for every request would prevent connections from being reused
+        settings = (self.verify, self.cert)
+        if self._ssl is None or self._ssl[0] != settings:
+            self._ssl = (settings, make_ssl_context(self.verify, self.cert))
+        return self._ssl[1]
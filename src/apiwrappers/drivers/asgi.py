@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, Union
+from urllib.parse import unquote, urlsplit
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import DEFAULT_PORTS, make_response
+from apiwrappers.encoders import encode_request
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
+from apiwrappers.protocols import AsyncMiddleware
+from apiwrappers.structures import CaseInsensitiveDict, Deadline, NoValue, Timeouts
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+Message = Dict[str, Any]
+ASGIApp = Callable[
+    [Message, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]],
+    Awaitable[None],
+]
+
+
+class ASGIDriver:
+    """
+    A driver that calls an ASGI application in-process instead of making
+    requests over the network.
+
+    Requests are dispatched straight to the application, so the driver is
+    useful to test and benchmark API clients and middleware without
+    network overhead. The host part of a URL is only used to fill in the
+    ``Host`` header and ``server`` of a scope. Only ``total`` timeout is
+    enforced, and exceptions raised by the application are propagated as is.
+    Lifespan events are not sent.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        app: an ASGI application to call.
+        timeout: how long a call to the application may take.
+
+    Usage::
+
+        >>> from apiwrappers.drivers.asgi import ASGIDriver
+        >>> from myservice import app
+        >>> driver = ASGIDriver(app=app)
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[AsyncMiddleware],
+        app: ASGIApp,
+        timeout: Timeout = None,
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        self.middleware = middleware
+        self.app = app
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"app={repr(self.app)}, "
+            f"timeout={repr(self.timeout)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<AsyncDriver 'asgi'>"
+
+    @middleware.wrap
+    async def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        trace = Trace(request, self.hooks)
+        url, headers, content = encode_request(request)
+        start: Message = {}
+        chunks: List[bytes] = []
+        complete = asyncio.Event()
+        body_sent = False
+
+        async def receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": content, "more_body": False}
+            # apps listening for disconnect should not be interrupted
+            # until the response is sent
+            await complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+                trace.mark("headers")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    complete.set()
+
+        seconds = self._get_timeout(timeout)
+        call = self.app(self._make_scope(request, url, headers), receive, send)
+        try:
+            if seconds is None:
+                await call
+            else:
+                await asyncio.wait_for(call, seconds)
+        except asyncio.TimeoutError as exc:
+            raise exceptions.Timeout from exc
+        finally:
+            complete.set()
+        trace.mark("body")
+
+        if not start:
+            raise exceptions.DriverError("ASGI app didn't start a response")
+        response_headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in start.get("headers", [])
+        ]
+        return make_response(
+            request, url, start["status"], response_headers, b"".join(chunks), trace
+        )
+
+    def _get_timeout(self, timeout: Union[Timeout, NoValue]) -> Optional[float]:
+        if isinstance(timeout, NoValue):
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return self._get_timeout(timeout.timeout())
+        if isinstance(timeout, Timeouts):
+            return timeout.total
+        if isinstance(timeout, timedelta):
+            return timeout.total_seconds()
+        return timeout
+
+    @staticmethod
+    def _make_scope(
+        request: Request, url: str, headers: CaseInsensitiveDict[str]
+    ) -> Message:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        path = parts.path or "/"
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": request.method.value,
+            "scheme": scheme,
+            "path": unquote(path),
+            "raw_path": path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (
+                parts.hostname or "localhost",
+                parts.port or DEFAULT_PORTS.get(scheme, 80),
+            ),
+            "extensions": {},
+        }
@@ -0,0 +1,834 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import ssl
+import time
+import zlib
+from collections import deque
+from http.cookies import SimpleCookie
+from types import ModuleType
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type, Union
+from urllib.parse import urljoin, urlsplit
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import DEFAULT_PORTS, make_response
+from apiwrappers.drivers.tls import SSLContext, make_ssl_context
+from apiwrappers.encoders import (
+    Body,
+    body_length,
+    encode_body,
+    encode_headers,
+    encode_url,
+    iter_body,
+)
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
+from apiwrappers.protocols import AsyncMiddleware
+from apiwrappers.structures import (
+    CaseInsensitiveDict,
+    Deadline,
+    NoValue,
+    PoolCounters,
+    PoolStats,
+    Seconds,
+    Timeouts,
+)
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+# the same limits as in aiohttp
+MAX_REDIRECTS = 10
+MAX_HEAD_SIZE = 2**16
+
+# idle connections kept per host
+POOL_SIZE = 10
+# connections open at once per host, the same as in aiohttp
+POOL_LIMIT = 100
+
+REDIRECT_CODES = frozenset([301, 302, 303, 307, 308])
+NO_BODY_CODES = frozenset([204, 304])
+
+Headers = List[Tuple[str, str]]
+PoolKey = Tuple[str, str, int]
+
+
+def load_httptools() -> Optional[ModuleType]:
+    try:
+        import httptools  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return httptools
+
+
+httptools = load_httptools()
+
+
+class ParseError(Exception):
+    """Raised when a server sends malformed response."""
+
+
+class BaseParser(abc.ABC):
+    """
+    Incremental parser of HTTP/1.1 responses.
+
+    Data is fed as it arrives, and ``headers_complete`` and ``complete``
+    are set as soon as the corresponding part of a response is parsed.
+    """
+
+    def __init__(self, method: str):
+        self.method = method
+        self.status_code = 0
+        self.headers: Headers = []
+        self.body: List[bytes] = []
+        self.keep_alive = True
+        self.headers_complete = False
+        self.complete = False
+        self.chunked = False
+        self.content_length: Optional[str] = None
+        # response without length is terminated by closing connection
+        self.until_eof = False
+
+    @abc.abstractmethod
+    def feed(self, data: bytes) -> None:
+        """Parses the next piece of a response as it arrives."""
+
+    def feed_eof(self) -> None:
+        if not (self.headers_complete and self.until_eof):
+            raise ConnectionResetError("Connection closed before response completed")
+        self.complete = True
+
+    def on_headers(self, version: str) -> bool:
+        """Returns whether response has a body."""
+        connection = ""
+        for name, value in self.headers:
+            lowered = name.lower()
+            if lowered == "connection":
+                connection = value.lower()
+            elif lowered == "transfer-encoding":
+                self.chunked = "chunked" in value.lower()
+            elif lowered == "content-length":
+                self.content_length = value
+        if version == "1.0":
+            self.keep_alive = connection == "keep-alive"
+        else:
+            self.keep_alive = connection != "close"
+        self.headers_complete = True
+        if self.method == "HEAD" or self.status_code in NO_BODY_CODES:
+            return False
+        if not self.chunked and self.content_length is None:
+            self.until_eof = True
+            self.keep_alive = False
+        return True
+
+
+class ResponseParser(BaseParser):
+    """A parser written in pure Python."""
+
+    def __init__(self, method: str):
+        super().__init__(method)
+        self._buffer = bytearray()
+        self._state = self._parse_head
+        self._remaining = 0
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+        while not self.complete and self._state():
+            pass
+        if self.complete and self._buffer:
+            # connection is in unknown state after unexpected data
+            self.keep_alive = False
+
+    def _parse_head(self) -> bool:
+        end = self._buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._buffer) > MAX_HEAD_SIZE:
+                raise ParseError("Response headers are too long")
+            return False
+        lines = self._buffer[:end].decode("latin-1").split("\r\n")
+        del self._buffer[: end + 4]
+        parts = lines[0].split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/1.") or len(parts[1]) != 3:
+            raise ParseError(f"Invalid status line: {lines[0]!r}")
+        try:
+            self.status_code = int(parts[1])
+        except ValueError as exc:
+            raise ParseError(f"Invalid status line: {lines[0]!r}") from exc
+        if self.status_code < 200:
+            # informational responses are followed by the final one
+            return True
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise ParseError(f"Invalid header: {line!r}")
+            self.headers.append((name.strip(), value.strip()))
+
+        if not self.on_headers(parts[0][5:]):
+            self.complete = True
+        elif self.until_eof:
+            self._state = self._parse_until_eof
+        elif self.chunked:
+            self._state = self._parse_chunk_size
+        else:
+            try:
+                self._remaining = int(self.content_length)  # type: ignore
+            except ValueError as exc:
+                msg = f"Invalid Content-Length: {self.content_length!r}"
+                raise ParseError(msg) from exc
+            self._state = self._parse_body
+            self.complete = self._remaining == 0
+        return True
+
+    def _parse_body(self) -> bool:
+        if not self._buffer:
+            return False
+        chunk = bytes(self._buffer[: self._remaining])
+        del self._buffer[: len(chunk)]
+        self.body.append(chunk)
+        self._remaining -= len(chunk)
+        self.complete = self._remaining == 0
+        return True
+
+    def _parse_chunk_size(self) -> bool:
+        end = self._buffer.find(b"\r\n")
+        if end < 0:
+            return False
+        line = bytes(self._buffer[:end]).split(b";", 1)[0]
+        del self._buffer[: end + 2]
+        try:
+            size = int(line, 16)
+        except ValueError as exc:
+            raise ParseError(f"Invalid chunk size: {line!r}") from exc
+        if size == 0:
+            self._state = self._parse_trailers
+        else:
+            self._remaining = size
+            self._state = self._parse_chunk
+        return True
+
+    def _parse_chunk(self) -> bool:
+        if not self._buffer:
+            return False
+        chunk = bytes(self._buffer[: self._remaining])
+        del self._buffer[: len(chunk)]
+        self.body.append(chunk)
+        self._remaining -= len(chunk)
+        if self._remaining == 0:
+            self._state = self._parse_chunk_end
+        return True
+
+    def _parse_chunk_end(self) -> bool:
+        if len(self._buffer) < 2:
+            return False
+        if self._buffer[:2] != b"\r\n":
+            raise ParseError("Chunk is not terminated with CRLF")
+        del self._buffer[:2]
+        self._state = self._parse_chunk_size
+        return True
+
+    def _parse_trailers(self) -> bool:
+        end = self._buffer.find(b"\r\n")
+        if end < 0:
+            return False
+        del self._buffer[: end + 2]
+        # trailers are ignored, an empty line ends the response
+        self.complete = end == 0
+        return True
+
+    def _parse_until_eof(self) -> bool:
+        if self._buffer:
+            self.body.append(bytes(self._buffer))
+            self._buffer.clear()
+        return False
+
+
+class HttptoolsParser(BaseParser):
+    """A parser using httptools, which is several times faster."""
+
+    def __init__(self, method: str):
+        super().__init__(method)
+        self._parser = httptools.HttpResponseParser(self)  # type: ignore
+
+    def feed(self, data: bytes) -> None:
+        try:
+            self._parser.feed_data(data)
+        except httptools.HttpParserError as exc:  # type: ignore
+            if not self.complete:
+                raise ParseError(str(exc)) from exc
+            self.keep_alive = False
+
+    def on_header(self, name: bytes, value: bytes) -> None:
+        if self._ignore() or self.headers_complete:
+            # trailers are ignored
+            return
+        self.headers.append((name.decode("latin-1"), value.decode("latin-1")))
+
+    def on_headers_complete(self) -> None:
+        if self._ignore():
+            return
+        self.status_code = self._parser.get_status_code()
+        if self.status_code < 200:
+            self.headers.clear()
+            return
+        if not self.on_headers(self._parser.get_http_version()):
+            # httptools doesn't know that responses to HEAD have no body,
+            # so the rest of the data is not fed to it
+            self.complete = True
+
+    def on_body(self, body: bytes) -> None:
+        if not self._ignore():
+            self.body.append(body)
+
+    def on_message_complete(self) -> None:
+        if self.status_code >= 200:
+            self.complete = True
+
+    def _ignore(self) -> bool:
+        if self.complete:
+            # connection is in unknown state after unexpected data
+            self.keep_alive = False
+        return self.complete
+
+
+class Connection(asyncio.Protocol):
+    """A connection sending one request at a time."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.transport: Any = None
+        self.parser: Optional[BaseParser] = None
+        self.closed = False
+        self.received = False
+        self._exc: Optional[BaseException] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._paused = False
+
+    def connection_made(self, transport: Any) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        if self.parser is None or self.parser.complete:
+            # nothing is expected from an idle connection
+            self.close()
+            return
+        self.received = True
+        try:
+            self.parser.feed(data)
+        except ParseError as exc:
+            self._exc = exc
+            self.close()
+        self._wakeup()
+
+    def eof_received(self) -> None:
+        self.close()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.closed = True
+        if self.parser is not None and not self.parser.complete and self._exc is None:
+            try:
+                self.parser.feed_eof()
+            except ConnectionResetError as reset:
+                self._exc = exc or reset
+        self._wakeup()
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._wakeup()
+
+    def close(self) -> None:
+        self.closed = True
+        self.transport.close()
+
+    @property
+    def reusable(self) -> bool:
+        return (
+            not self.closed
+            and self.parser is not None
+            and self.parser.complete
+            and self.parser.keep_alive
+        )
+
+    async def request(
+        self,
+        parser: BaseParser,
+        head: bytes,
+        body: Body,
+        chunked: bool,
+        timeouts: Timeouts,
+        deadline: Optional[float],
+        trace: Trace,
+    ) -> BaseParser:
+        # pylint: disable=too-many-arguments
+        self.parser = parser
+        self.received = False
+        if isinstance(body, bytes):
+            self.transport.write(head + body)
+        else:
+            self.transport.write(head)
+            for chunk in iter_body(body):
+                if chunked:
+                    chunk = b"%x\r\n%s\r\n" % (len(chunk), chunk)
+                self.transport.write(chunk)
+                while self._paused and not self.closed:
+                    await self._wait(timeouts.write, deadline)
+            if chunked:
+                self.transport.write(b"0\r\n\r\n")
+        while not parser.headers_complete:
+            await self._wait(timeouts.read, deadline)
+        trace.mark("headers")
+        while not parser.complete:
+            await self._wait(timeouts.read, deadline)
+        return parser
+
+    async def _wait(self, timeout: Optional[float], deadline: Optional[float]) -> None:
+        if self._exc is not None:
+            raise self._exc
+        timeout = get_timeout(self.loop, timeout, deadline)
+        waiter = self.loop.create_future()
+        self._waiter = waiter
+        handle = None
+        if timeout is not None:
+            handle = self.loop.call_later(timeout, expire, waiter)
+        try:
+            await waiter
+        finally:
+            self._waiter = None
+            if handle is not None:
+                handle.cancel()
+
+    def _wakeup(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+def expire(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_exception(asyncio.TimeoutError())
+
+
+def get_timeout(
+    loop: asyncio.AbstractEventLoop, timeout: Optional[float], deadline: Optional[float]
+) -> Optional[float]:
+    """Returns timeout of the next operation, limited by the deadline."""
+    if deadline is None:
+        return timeout
+    remaining = deadline - loop.time()
+    if remaining <= 0:
+        raise asyncio.TimeoutError()
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class Pool:
+    """
+    Idle keep-alive connections to a single host.
+
+    Requests take a slot of the pool for as long as they use a connection,
+    so no more than ``limit`` connections are open at once, and requests
+    over the limit wait for a slot instead of connecting.
+    """
+
+    def __init__(self, maxsize: int = POOL_SIZE, limit: int = POOL_LIMIT):
+        self.maxsize = maxsize
+        self.idle: Deque[Connection] = deque()
+        self.counters = PoolCounters()
+        self.slots = asyncio.Semaphore(limit)
+
+    async def reserve(
+        self, timeout: Optional[float], deadline: Optional[float]
+    ) -> None:
+        """Takes a slot, waiting at most ``timeout`` seconds for it to be free."""
+        if not self.slots.locked():
+            await self.slots.acquire()
+            return
+        loop = asyncio.get_event_loop()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                self.slots.acquire(), get_timeout(loop, timeout, deadline)
+            )
+        finally:
+            self.counters.wait_time += time.perf_counter() - start
+
+    def free(self) -> None:
+        self.slots.release()
+
+    def acquire(self) -> Optional[Connection]:
+        while self.idle:
+            conn = self.idle.pop()
+            if not conn.closed:
+                self.counters.reused += 1
+                self.counters.in_use += 1
+                return conn
+        return None
+
+    def created(self, conn: Connection) -> None:
+        """Counts a new connection taken into use."""
+        self.counters.created += 1
+        self.counters.in_use += 1
+        self.counters.handshake(conn.transport.get_extra_info("ssl_object"))
+
+    def release(self, conn: Connection) -> None:
+        self.counters.in_use -= 1
+        if not conn.reusable:
+            conn.close()
+        elif len(self.idle) >= self.maxsize:
+            self.counters.evicted += 1
+            conn.close()
+        else:
+            conn.parser = None
+            self.idle.append(conn)
+
+    def stats(self) -> PoolStats:
+        return self.counters.snapshot(sum(not conn.closed for conn in self.idle))
+
+    def close(self) -> None:
+        while self.idle:
+            self.idle.pop().close()
+
+
+def prepare_timeout(timeout: Union[Seconds, Timeouts]) -> Timeouts:
+    if isinstance(timeout, Timeouts):
+        return timeout
+    return Timeouts(total=timeout)
+
+
+def encode_head(method: str, url: str, headers: CaseInsensitiveDict[str]) -> bytes:
+    parts = urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    lines = [f"{method} {target} HTTP/1.1"]
+    for name, value in headers.items():
+        line = f"{name}: {value}"
+        if "\r" in line or "\n" in line:
+            raise exceptions.DriverError(f"Invalid header: {name}")
+        lines.append(line)
+    lines.append("\r\n")
+    return "\r\n".join(lines).encode("latin-1")
+
+
+def decode_content(headers: Headers, content: bytes) -> bytes:
+    encoding = next((v for n, v in headers if n.lower() == "content-encoding"), "")
+    encoding = encoding.strip().lower()
+    if encoding == "gzip":
+        return zlib.decompress(content, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(content)
+        except zlib.error:
+            # some servers send raw deflate stream without zlib header
+            return zlib.decompress(content, -zlib.MAX_WBITS)
+    return content
+
+
+class AsyncioDriver:
+    """
+    A driver that makes HTTP/1.1 requests with asyncio directly.
+
+    Compared to :py:class:`AioHttpDriver
+    <apiwrappers.drivers.aiohttp.AioHttpDriver>`, the driver has no client
+    session, cookie jar and request objects in between, and keeps
+    connections alive in a simple pool. Responses are parsed with
+    `httptools <https://github.com/MagicStack/httptools>`_ if it is
+    installed, or with a parser in pure Python otherwise.
+
+    Redirects are followed, and cookies set by them are sent to the same
+    host. Content is decompressed only if a server sends it compressed,
+    because ``Accept-Encoding`` is not sent by default. Proxies are not
+    supported.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        timeout: how long to wait for a response. A number or a ``timedelta``
+            limits the whole request, use :py:class:`Timeouts
+            <apiwrappers.Timeouts>` to limit its phases.
+        verify: whether to verify TLS certificate or a path to a CA bundle.
+        cert: a path to client certificate or a ('cert', 'key') tuple.
+        use_httptools: whether to parse responses with httptools, if it is
+            installed.
+        limit: how many connections to open to a single host at once.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> driver = make_driver("asyncio")
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[AsyncMiddleware],
+        timeout: Timeout,
+        verify: Verify = True,
+        cert: ClientCert = None,
+        use_httptools: bool = True,
+        limit: int = POOL_LIMIT,
+    ):
+        # pylint: disable=too-many-arguments
+        self.middleware = middleware
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.use_httptools = use_httptools
+        self.limit = limit
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        self.pools: Dict[PoolKey, Pool] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+        self._settings: Optional[Tuple[Any, ...]] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"timeout={repr(self.timeout)}, "
+            f"verify={repr(self.verify)}, "
+            f"cert={repr(self.cert)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<AsyncDriver 'asyncio'>"
+
+    @middleware.wrap
+    async def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        timeouts = prepare_timeout(self._get_timeout(timeout))
+        loop = asyncio.get_event_loop()
+        ssl_context = self._prepare(loop)
+        deadline = None
+        if timeouts.total is not None:
+            deadline = loop.time() + timeouts.total
+        trace = Trace(request, self.hooks)
+        method = request.method.value
+        url = encode_url(request)
+        body, content_type = encode_body(request)
+        headers = encode_headers(request, content_type)
+        cookies = dict(request.cookies)
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                parser = await self._send(
+                    method, url, headers, body, ssl_context, timeouts, deadline, trace
+                )
+                location = next(
+                    (v for n, v in parser.headers if n.lower() == "location"), None
+                )
+                if parser.status_code not in REDIRECT_CODES or location is None:
+                    break
+                method, url, body = self._redirect(
+                    parser, method, url, urljoin(url, location), headers, body, cookies
+                )
+            else:
+                raise exceptions.DriverError(f"Too many redirects: {url}")
+            content = decode_content(parser.headers, b"".join(parser.body))
+        except asyncio.TimeoutError as exc:
+            raise exceptions.Timeout from exc
+        except ssl.SSLError:
+            raise
+        except (ParseError, zlib.error) as exc:
+            raise exceptions.DriverError(str(exc)) from exc
+        except OSError as exc:
+            raise exceptions.ConnectionFailed from exc
+        trace.mark("body")
+        return make_response(
+            request, url, parser.status_code, parser.headers, content, trace
+        )
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pool statistics.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        return {
+            f"{scheme}://{host}:{port}": pool.stats()
+            for (scheme, host, port), pool in self.pools.items()
+        }
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        for pool in self.pools.values():
+            pool.close()
+        self.pools = {}
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: CaseInsensitiveDict[str],
+        body: Body,
+        ssl_context: ssl.SSLContext,
+        timeouts: Timeouts,
+        deadline: Optional[float],
+        trace: Trace,
+    ) -> BaseParser:
+        # pylint: disable=too-many-arguments
+        parts = urlsplit(url)
+        if parts.scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise exceptions.DriverError(f"Unsupported URL: {url}")
+        port = parts.port or DEFAULT_PORTS[parts.scheme]
+        key = (parts.scheme, parts.hostname, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = Pool(limit=self.limit)
+        chunked = False
+        if not isinstance(body, bytes) or body:
+            length = body_length(body)
+            if length is None:
+                chunked = True
+                headers["Transfer-Encoding"] = "chunked"
+            else:
+                headers["Content-Length"] = str(length)
+        head = encode_head(method, url, headers)
+        parser_cls: Type[BaseParser] = ResponseParser
+        if httptools is not None and self.use_httptools:
+            parser_cls = HttptoolsParser
+
+        await pool.reserve(timeouts.pool, deadline)
+        try:
+            conn = pool.acquire()
+            if conn is not None:
+                trace.mark("connection_reused")
+                try:
+                    return await conn.request(
+                        parser_cls(method),
+                        head,
+                        body,
+                        chunked,
+                        timeouts,
+                        deadline,
+                        trace,
+                    )
+                except ConnectionResetError:
+                    # server may close idle connection at any moment, so a request
+                    # is repeated on a new connection if nothing is received
+                    if conn.received:
+                        raise
+                finally:
+                    pool.release(conn)
+
+            conn = await self._connect(
+                parts.scheme,
+                parts.hostname,
+                port,
+                ssl_context,
+                timeouts,
+                deadline,
+                trace,
+            )
+            pool.created(conn)
+            try:
+                return await conn.request(
+                    parser_cls(method), head, body, chunked, timeouts, deadline, trace
+                )
+            finally:
+                pool.release(conn)
+        finally:
+            pool.free()
+
+    async def _connect(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        ssl_context: ssl.SSLContext,
+        timeouts: Timeouts,
+        deadline: Optional[float],
+        trace: Trace,
+    ) -> Connection:
+        # pylint: disable=too-many-arguments
+        loop = asyncio.get_event_loop()
+        trace.mark("connect_start")
+        transport, conn = await asyncio.wait_for(
+            loop.create_connection(lambda: Connection(loop), host, port),
+            get_timeout(loop, timeouts.connect, deadline),
+        )
+        if scheme == "https":
+            trace.mark("tls_start")
+            try:
+                conn.transport = await asyncio.wait_for(
+                    loop.start_tls(transport, conn, ssl_context, server_hostname=host),
+                    get_timeout(loop, timeouts.connect, deadline),
+                )
+            except BaseException:
+                transport.close()
+                raise
+        trace.mark("connect_end")
+        if scheme == "https":
+            trace.mark("tls_end")
+        return conn
+
+    @staticmethod
+    def _redirect(
+        parser: BaseParser,
+        method: str,
+        url: str,
+        location: str,
+        headers: CaseInsensitiveDict[str],
+        body: Body,
+        cookies: Dict[str, str],
+    ) -> Tuple[str, str, Body]:
+        # pylint: disable=too-many-arguments
+        if (parser.status_code == 303 and method != "HEAD") or (
+            parser.status_code in (301, 302) and method == "POST"
+        ):
+            method, body = "GET", b""
+            for name in ("Content-Type", "Content-Length", "Transfer-Encoding"):
+                headers.pop(name, None)
+        netloc = urlsplit(location).netloc
+        if netloc != urlsplit(url).netloc:
+            # credentials and cookies are not sent to other hosts
+            headers["Host"] = netloc
+            headers.pop("Authorization", None)
+            headers.pop("Cookie", None)
+            cookies.clear()
+            return method, location, body
+        for name, value in parser.headers:
+            if name.lower() == "set-cookie":
+                cookie: SimpleCookie = SimpleCookie(value)
+                cookies.update((key, morsel.value) for key, morsel in cookie.items())
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        return method, location, body
+
+    def _prepare(self, loop: asyncio.AbstractEventLoop) -> ssl.SSLContext:
+        # connections are bound to the event loop they are created in
+        settings = (self.verify, self.cert, loop)
+        if self._settings != settings:
+            if self._settings is not None and self._settings[-1] is loop:
+                for pool in self.pools.values():
+                    pool.close()
+            self.pools = {}
+            self._ssl = None
+            self._settings = settings
+        if self._ssl is None:
+            # a bundle and certificates are loaded once, not for every connection
+            context = make_ssl_context(self.verify, self.cert)
+            if context is False:
+                context = SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl = context  # type: ignore
+        return self._ssl  # type: ignore
+
+    def _get_timeout(
+        self, timeout: Union[Timeout, NoValue]
+    ) -> Union[Seconds, Timeouts]:
+        if isinstance(timeout, NoValue):
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return timeout.timeout()
+        return timeout
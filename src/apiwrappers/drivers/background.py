@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from apiwrappers.entities import Request, Response
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.protocols import AsyncDriver, Middleware
+from apiwrappers.structures import NoValue, PoolStats
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+T = TypeVar("T")
+
+
+async def fetch_all(
+    driver: AsyncDriver,
+    requests: List[Request],
+    timeout: Union[Timeout, NoValue],
+) -> List[Response]:
+    aws = [driver.fetch(request, timeout=timeout) for request in requests]
+    return list(await asyncio.gather(*aws))
+
+
+async def cancel_tasks() -> None:
+    # e.g. requests left after a failed fetch_many or an interrupt
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def submit(
+    loop: asyncio.AbstractEventLoop,
+    func: Callable[..., Awaitable[T]],
+    *args: Any,
+    **kwargs: Any,
+) -> Future[T]:
+    # coroutines are created in the loop thread, so a coroutine of
+    # a cancelled call is never left unawaited
+    async def run() -> T:
+        return await func(*args, **kwargs)
+
+    return asyncio.run_coroutine_threadsafe(run(), loop)
+
+
+class BackgroundDriver:
+    """
+    A driver that makes requests with an asynchronous driver running on
+    an event loop in a background thread.
+
+    That way synchronous code shares connection pool and asynchronous
+    middleware of ``driver`` and can make several requests concurrently
+    with :py:meth:`fetch_many`. The event loop and its thread are started
+    on the first request and the same instance can be used from several
+    threads at once.
+
+    ``timeout``, ``verify`` and ``cert`` are those of ``driver``. Authentication
+    is also left to ``driver``, and ``middleware`` run in the calling thread
+    only around requests made with :py:meth:`fetch`.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        driver: an asynchronous driver to make requests with.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.drivers.background import BackgroundDriver
+        >>> driver = BackgroundDriver(driver=make_driver("aiohttp"))
+    """
+
+    middleware = MiddlewareChain()
+
+    def __init__(self, *middleware: Type[Middleware], driver: AsyncDriver):
+        self.middleware = middleware
+        self.driver = driver
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"driver={repr(self.driver)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'background'>"
+
+    @property
+    def timeout(self) -> Timeout:
+        return self.driver.timeout
+
+    @timeout.setter
+    def timeout(self, value: Timeout) -> None:
+        self.driver.timeout = value
+
+    @property
+    def verify(self) -> Verify:
+        return self.driver.verify
+
+    @verify.setter
+    def verify(self, value: Verify) -> None:
+        self.driver.verify = value
+
+    @property
+    def cert(self) -> ClientCert:
+        return self.driver.cert
+
+    @cert.setter
+    def cert(self, value: ClientCert) -> None:
+        self.driver.cert = value
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        return self._run(self.driver.fetch, request, timeout=timeout)
+
+    def fetch_many(
+        self,
+        requests: Iterable[Request],
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> List[Response]:
+        """
+        Makes requests concurrently and returns responses in the same order.
+
+        Requests go through middleware of ``driver``, but not through
+        middleware of this driver. If any request fails, the first error
+        is raised, while other requests are still completed in the background.
+
+        Args:
+            requests: request objects with data to send to server.
+            timeout: how many seconds to wait for the server to send data before
+                giving up. Applies to each request separately, unless it is
+                a :py:class:`Deadline <apiwrappers.Deadline>`.
+
+        Returns:
+            A list of responses from the server.
+        """
+        return self._run(fetch_all, self.driver, list(requests), timeout)
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pool statistics of ``driver``.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``
+            or an empty one, if ``driver`` doesn't have them.
+        """
+        pool_stats = getattr(self.driver, "pool_stats", None)
+        if pool_stats is None:
+            return {}
+        return cast(Dict[str, PoolStats], pool_stats())
+
+    def warmup(
+        self,
+        hosts: Iterable[str],
+        connections_per_host: int = 1,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> None:
+        """
+        Opens connections to hosts in advance with ``driver``.
+
+        Args:
+            hosts: URLs with scheme, host and, optionally, port to connect to.
+            connections_per_host: how many connections to open to each host.
+            timeout: how many seconds to wait for a connection to be established.
+                If provided, will take precedence over connect timeout of
+                ``driver``.
+
+        Raises:
+            AttributeError: if ``driver`` can't warm up connections.
+        """
+        warmup = self.driver.warmup  # type: ignore
+        self._run(warmup, hosts, connections_per_host, timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Closes ``driver``, cancels unfinished requests and stops the event loop.
+
+        The driver can still be used after that, and a new event loop
+        is started on the next request.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        close = getattr(self.driver, "close", None)
+        try:
+            if close is not None:
+                submit(loop, close).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.run_until_complete(cancel_tasks())
+            loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name=f"{self.__class__.__name__}-{id(self):x}",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _run(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        future = submit(self._get_loop(), func, *args, **kwargs)
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt, so the request doesn't outlive the caller
+            future.cancel()
+            raise
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, Mapping, Optional, Tuple, Type, Union
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import fetch_wrapped
+from apiwrappers.entities import Request, Response
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.protocols import AsyncDriver, AsyncMiddleware, Driver, Middleware
+from apiwrappers.structures import CaseInsensitiveDict, Deadline, NoValue, Timeouts
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+Distribution = Callable[[random.Random], float]
+
+
+def fixed(seconds: float) -> Distribution:
+    """Always the same latency."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Distribution:
+    """Latency uniformly distributed between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean: float) -> Distribution:
+    """Exponentially distributed latency with the given mean, in seconds."""
+    return lambda rng: rng.expovariate(1 / mean)
+
+
+def lognormal(median: float, sigma: float) -> Distribution:
+    """
+    Log-normally distributed latency, which is how latency of real services
+    usually looks like: most requests are close to ``median`` with a long tail.
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def limit_latency(latency: float, timeout: Timeout) -> Tuple[float, bool]:
+    """
+    Returns how long to wait for injected latency and whether a request
+    times out after that.
+
+    Latency is waited for instead of a response from the server, so it is
+    limited by ``read`` and ``total`` timeouts, or what is left of a deadline.
+    """
+    if isinstance(timeout, Deadline):
+        limit: Optional[float] = timeout.remaining()
+    elif isinstance(timeout, Timeouts):
+        limits = [t for t in (timeout.read, timeout.total) if t is not None]
+        limit = min(limits, default=None)
+    elif isinstance(timeout, timedelta):
+        limit = timeout.total_seconds()
+    else:
+        limit = timeout
+    if limit is None or latency <= limit:
+        return latency, False
+    return limit, True
+
+
+@dataclass(frozen=True)
+class Faults:
+    """
+    Faults to inject into requests.
+
+    Rates are probabilities from 0 to 1 and are mutually exclusive, so their
+    sum can't exceed 1. Latency is added before any fault. If latency
+    exceeds timeout of a request, :py:class:`Timeout <apiwrappers.Timeout>`
+    is raised once the timeout expires.
+
+    Args:
+        latency: latency distribution, e.g. :py:func:`lognormal`.
+        error_rate: how often to respond with ``error_status`` without
+            making a request.
+        timeout_rate: how often to raise :py:class:`Timeout <apiwrappers.Timeout>`.
+        connection_failure_rate: how often to raise
+            :py:class:`ConnectionFailed <apiwrappers.ConnectionFailed>`.
+        error_status: status code of injected error responses.
+
+    Raises:
+        ValueError: if rates are out of range.
+    """
+
+    latency: Optional[Distribution] = None
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    connection_failure_rate: float = 0.0
+    error_status: int = 503
+
+    def __post_init__(self) -> None:
+        rates = (self.error_rate, self.timeout_rate, self.connection_failure_rate)
+        if any(rate < 0 for rate in rates) or sum(rates) > 1:
+            raise ValueError("Rates should be non-negative and add up to at most 1")
+
+
+NO_FAULTS = Faults()
+
+
+class FaultInjector:
+    """
+    Decides which fault to inject into a request.
+
+    Decisions are made with a random generator seeded with ``seed``,
+    so the same sequence of requests gets the same faults.
+    """
+
+    def __init__(
+        self,
+        faults: Faults = NO_FAULTS,
+        templates: Optional[Mapping[str, Faults]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.faults = faults
+        self.templates = dict(templates or {})
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.counts: Counter[Tuple[str, str]] = Counter()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"faults={repr(self.faults)}, "
+            f"templates={repr(self.templates)}, "
+            f"seed={repr(self.seed)}"
+            ")"
+        )
+
+    def get_faults(self, request: Request) -> Faults:
+        return self.templates.get(request.url.template, self.faults)
+
+    def decide(self, request: Request) -> Tuple[float, Optional[str]]:
+        """
+        Returns latency to add and a fault to inject, if any.
+
+        Faults are one of ``"connection_failure"``, ``"timeout"`` and ``"error"``.
+        """
+        faults = self.get_faults(request)
+        latency = faults.latency(self.random) if faults.latency is not None else 0.0
+        roll = self.random.random()
+        fault = None
+        for name, rate in (
+            ("connection_failure", faults.connection_failure_rate),
+            ("timeout", faults.timeout_rate),
+            ("error", faults.error_rate),
+        ):
+            if roll < rate:
+                fault = name
+                break
+            roll -= rate
+        self.counts[(request.url.template, fault or "none")] += 1
+        return max(latency, 0.0), fault
+
+    def inject(self, request: Request, fault: Optional[str]) -> Optional[Response]:
+        """Raises an injected exception or returns an injected response."""
+        if fault == "connection_failure":
+            raise exceptions.ConnectionFailed("Injected connection failure")
+        if fault == "timeout":
+            raise exceptions.Timeout("Injected timeout")
+        if fault == "error":
+            return Response(
+                request=request,
+                status_code=self.get_faults(request).error_status,
+                url=str(request.url),
+                headers=CaseInsensitiveDict(),
+                cookies=SimpleCookie(),
+                content=b"",
+                encoding="utf-8",
+            )
+        return None
+
+
+class FaultDriver:
+    """
+    A driver that injects latency and failures into requests made
+    by another driver.
+
+    Faults are configured per :py:attr:`Url.template <apiwrappers.Url.template>`,
+    falling back to ``faults`` for other URLs. That way, retries, timeouts
+    and concurrency limits of an API client can be tested under load
+    against a local server.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        driver: a driver to make requests with.
+        faults: faults to inject into all requests.
+        templates: faults to inject into requests per URL template.
+        seed: seed for a random generator to get reproducible faults.
+        timeout: timeout of requests, the one of ``driver`` if not set.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.drivers.faults import FaultDriver, Faults, lognormal
+        >>> driver = FaultDriver(
+        ...     driver=make_driver("requests"),
+        ...     faults=Faults(latency=lognormal(0.05, 0.5), error_rate=0.01),
+        ...     templates={"http://localhost/users/{id}": Faults(timeout_rate=0.1)},
+        ...     seed=42,
+        ... )
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[Middleware],
+        driver: Driver,
+        faults: Faults = NO_FAULTS,
+        templates: Optional[Mapping[str, Faults]] = None,
+        seed: Optional[int] = None,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self.middleware = middleware
+        self.driver = driver
+        self.injector = FaultInjector(faults, templates, seed)
+        self._timeout = timeout
+        self.verify = verify
+        self.cert = cert
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"driver={repr(self.driver)}, "
+            f"injector={repr(self.injector)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'faults'>"
+
+    @property
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Number of requests per URL template and injected fault."""
+        return dict(self.injector.counts)
+
+    @property
+    def timeout(self) -> Timeout:
+        if isinstance(self._timeout, NoValue):
+            return self.driver.timeout
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Timeout) -> None:
+        self._timeout = value
+
+    def _get_timeout(self, timeout: Union[Timeout, NoValue]) -> Timeout:
+        return self.timeout if isinstance(timeout, NoValue) else timeout
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        latency, fault = self.injector.decide(request)
+        delay, timed_out = limit_latency(latency, self._get_timeout(timeout))
+        if delay:
+            time.sleep(delay)
+        if timed_out:
+            raise exceptions.Timeout("Injected latency exceeded timeout")
+        response = self.injector.inject(request, fault)
+        if response is not None:
+            return response
+        return fetch_wrapped(self.driver, request, timeout)
+
+
+class AsyncFaultDriver:
+    """
+    The same as :py:class:`FaultDriver`, but for asynchronous code.
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[AsyncMiddleware],
+        driver: AsyncDriver,
+        faults: Faults = NO_FAULTS,
+        templates: Optional[Mapping[str, Faults]] = None,
+        seed: Optional[int] = None,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self.middleware = middleware
+        self.driver = driver
+        self.injector = FaultInjector(faults, templates, seed)
+        self._timeout = timeout
+        self.verify = verify
+        self.cert = cert
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"driver={repr(self.driver)}, "
+            f"injector={repr(self.injector)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<AsyncDriver 'faults'>"
+
+    @property
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Number of requests per URL template and injected fault."""
+        return dict(self.injector.counts)
+
+    @property
+    def timeout(self) -> Timeout:
+        if isinstance(self._timeout, NoValue):
+            return self.driver.timeout
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Timeout) -> None:
+        self._timeout = value
+
+    def _get_timeout(self, timeout: Union[Timeout, NoValue]) -> Timeout:
+        return self.timeout if isinstance(timeout, NoValue) else timeout
+
+    @middleware.wrap
+    async def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        latency, fault = self.injector.decide(request)
+        delay, timed_out = limit_latency(latency, self._get_timeout(timeout))
+        if delay:
+            await asyncio.sleep(delay)
+        if timed_out:
+            raise exceptions.Timeout("Injected latency exceeded timeout")
+        response = self.injector.inject(request, fault)
+        if response is not None:
+            return response
+        return await fetch_wrapped(self.driver, request, timeout)
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+from collections import defaultdict
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from typing import Any, AsyncIterator, DefaultDict, Dict, Optional, Tuple, Type, Union
+
+import httpx
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import close_replaced
+from apiwrappers.drivers.tls import make_ssl_context
+from apiwrappers.encoders import body_length, encode_data, encode_url, iter_body
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
+from apiwrappers.protocols import AsyncMiddleware, Middleware
+from apiwrappers.structures import (
+    CaseInsensitiveDict,
+    Deadline,
+    NoValue,
+    PoolCounters,
+    PoolStats,
+    Seconds,
+    Timeouts,
+)
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+CHUNK_SIZE = 2**16
+
+# httpcore trace events and phases they mark
+EVENTS = {
+    "connection.connect_tcp.started": "connect_start",
+    "connection.start_tls.started": "tls_start",
+    "connection.start_tls.complete": "tls_end",
+    "http11.receive_response_headers.complete": "headers",
+    "http2.receive_response_headers.complete": "headers",
+}
+
+Counters = DefaultDict[str, PoolCounters]
+
+
+class Tracer:
+    """Marks phases of a request from httpcore trace events."""
+
+    __slots__ = ("trace", "counters")
+
+    def __init__(self, trace: Trace, counters: PoolCounters):
+        self.trace = trace
+        self.counters = counters
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        # pylint: disable=unused-argument
+        if name == "connection.connect_tcp.started":
+            self.counters.created += 1
+        elif name.endswith(".send_request_headers.started"):
+            if "connect_start" not in self.trace.marks:
+                self.counters.reused += 1
+                self.trace.mark("connection_reused")
+        elif name == "connection.connect_tcp.complete":
+            # connection is established only after TLS handshake
+            if not str(self.trace.request.url).startswith("https:"):
+                self.trace.mark("connect_end")
+        elif name == "connection.start_tls.complete":
+            stream = info["return_value"]
+            self.counters.handshake(stream.get_extra_info("ssl_object"))
+        event = EVENTS.get(name)
+        if event == "tls_end":
+            self.trace.mark("connect_end")
+        if event is not None:
+            self.trace.mark(event)
+
+
+class AsyncTracer(Tracer):
+    __slots__ = ()
+
+    async def __call__(self, name: str, info: Dict[str, Any]) -> None:  # type: ignore
+        super().__call__(name, info)
+
+
+def get_origin(url: httpx.URL) -> str:
+    port = url.port or (443 if url.scheme == "https" else 80)
+    return f"{url.scheme}://{url.host}:{port}"
+
+
+def get_pool_stats(
+    transport: Union[httpx.HTTPTransport, httpx.AsyncHTTPTransport, None],
+    counters: Counters,
+) -> Dict[str, PoolStats]:
+    connections: DefaultDict[str, Tuple[int, int]] = defaultdict(lambda: (0, 0))
+    pool = getattr(transport, "_pool", None)
+    for conn in getattr(pool, "connections", []):
+        origin = conn._origin  # pylint: disable=protected-access
+        key = f"{origin.scheme.decode()}://{origin.host.decode()}:{origin.port}"
+        opened, idle = connections[key]
+        connections[key] = (opened + 1, idle + conn.is_idle())
+    stats = {}
+    for key in set(counters) | set(connections):
+        opened, idle = connections[key]
+        stats[key] = PoolStats(
+            open=opened,
+            idle=idle,
+            # with HTTP/2 a single connection serves many requests at once
+            in_use=opened - idle,
+            created=counters[key].created,
+            reused=counters[key].reused,
+            tls_handshakes=counters[key].tls_handshakes,
+            tls_resumed=counters[key].tls_resumed,
+        )
+    return stats
+
+
+def prepare_timeout(
+    timeout: Union[Seconds, Timeouts],
+) -> Tuple[httpx.Timeout, Optional[float]]:
+    """
+    Returns httpx timeout and a total timeout httpx doesn't support.
+
+    Total timeout is checked while a body is read, so no phase of
+    a request is allowed to take longer than it.
+    """
+    if isinstance(timeout, timedelta):
+        return httpx.Timeout(timeout.total_seconds()), None
+    if isinstance(timeout, Timeouts):
+        total = timeout.total
+        httpx_timeout = httpx.Timeout(
+            connect=limit_timeout(timeout.connect, total),
+            read=limit_timeout(timeout.read, total),
+            write=limit_timeout(timeout.write, total),
+            pool=limit_timeout(timeout.pool, total),
+        )
+        return httpx_timeout, total
+    return httpx.Timeout(timeout), None
+
+
+def limit_timeout(timeout: Optional[float], total: Optional[float]) -> Optional[float]:
+    if total is None:
+        return timeout
+    if timeout is None:
+        return total
+    return min(timeout, total)
+
+
+def prepare_request_kwargs(request: Request) -> Dict[str, Any]:
+    headers = CaseInsensitiveDict(request.headers)
+    kwargs: Dict[str, Any] = {"headers": headers}
+    if request.json is not None:
+        kwargs["json"] = request.json
+    elif request.files is not None:
+        kwargs["files"] = request.files
+    else:
+        content, content_type = encode_data(request.data)
+        if content_type is not None:
+            headers.setdefault("Content-Type", content_type)
+        if not isinstance(content, bytes):
+            # otherwise streams are sent with chunked encoding
+            length = body_length(content)
+            if length is not None:
+                headers.setdefault("Content-Length", str(length))
+        kwargs["content"] = content
+    return kwargs
+
+
+def is_ssl_error(exc: BaseException) -> bool:
+    # httpx wraps httpcore exception, which wraps the original one
+    cause: Optional[BaseException] = exc
+    while cause is not None:
+        if isinstance(cause, ssl.SSLError):
+            return True
+        cause = cause.__cause__ or cause.__context__
+    return False
+
+
+def convert_error(exc: httpx.HTTPError) -> Exception:
+    if isinstance(exc, httpx.TimeoutException):
+        return exceptions.Timeout()
+    if isinstance(exc, httpx.ConnectError) and is_ssl_error(exc):
+        return ssl.SSLError(str(exc))
+    if isinstance(exc, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return exceptions.ConnectionFailed()
+    return exceptions.DriverError()
+
+
+def make_response(
+    request: Request, response: httpx.Response, content: bytes, trace: Trace
+) -> Response:
+    return Response(
+        request=request,
+        status_code=response.status_code,
+        url=str(response.url),
+        headers=CaseInsensitiveDict(response.headers),
+        cookies=SimpleCookie(dict(response.cookies)),
+        encoding=response.encoding or "utf-8",
+        content=content,
+        timings=trace.timings(),
+    )
+
+
+class HttpxDriver:
+    """
+    A driver using `httpx <https://www.python-httpx.org>`_ with HTTP/2 enabled.
+
+    Connections are pooled, and with HTTP/2 many concurrent requests to the
+    same host are multiplexed over a single connection. HTTP/2 is negotiated
+    during TLS handshake, so plain HTTP requests use HTTP/1.1.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        timeout: how many seconds to wait for the server to send data before
+            giving up.
+        verify: whether to verify the server's TLS certificate or a path to
+            a CA bundle to use.
+        cert: a path to SSL client cert file (.pem) or a ('cert', 'key') tuple.
+        http2: whether to use HTTP/2 if server supports it.
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[Middleware],
+        timeout: Timeout,
+        verify: Verify = True,
+        cert: ClientCert = None,
+        http2: bool = True,
+    ):
+        self.middleware = middleware
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.http2 = http2
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        self.transport: Optional[httpx.HTTPTransport] = None
+        self.counters: Counters = defaultdict(PoolCounters)
+        self._settings: Optional[Tuple[Any, ...]] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"timeout={repr(self.timeout)}, "
+            f"verify={repr(self.verify)}, "
+            f"cert={repr(self.cert)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'httpx'>"
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        httpx_timeout, total = prepare_timeout(self._get_timeout(timeout))
+        deadline = time.monotonic() + total if total is not None else None
+        trace = Trace(request, self.hooks)
+        url = httpx.URL(encode_url(request))
+        tracer = Tracer(trace, self.counters[get_origin(url)])
+        # client is cheap to create and keeps cookies isolated between requests,
+        # while connections are pooled by the shared transport
+        client = httpx.Client(
+            transport=self._get_transport(),
+            cookies=dict(request.cookies),
+            follow_redirects=True,
+            trust_env=False,
+        )
+        kwargs = prepare_request_kwargs(request)
+        if not isinstance(kwargs.get("content", b""), bytes):
+            kwargs["content"] = iter_body(kwargs["content"])
+        try:
+            httpx_request = client.build_request(
+                request.method.value,
+                url,
+                timeout=httpx_timeout,
+                extensions={"trace": tracer},
+                **kwargs,
+            )
+            response = client.send(httpx_request, stream=True)
+            try:
+                content = self._read_content(response, deadline)
+            finally:
+                response.close()
+            trace.mark("body")
+        except httpx.HTTPError as exc:
+            raise convert_error(exc) from exc
+        return make_response(request, response, content, trace)
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pool statistics.
+
+        ``evicted`` and ``wait_time`` are not tracked, and with HTTP/2
+        ``in_use`` is the number of connections serving at least one request.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        return get_pool_stats(self.transport, self.counters)
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def _get_transport(self) -> httpx.HTTPTransport:
+        settings = (self.verify, self.cert, self.http2)
+        if self.transport is None or self._settings != settings:
+            if self.transport is not None:
+                self.transport.close()
+            self.transport = httpx.HTTPTransport(
+                verify=make_ssl_context(self.verify, self.cert),
+                http2=self.http2,
+            )
+            self._settings = settings
+        return self.transport
+
+    def _get_timeout(
+        self, timeout: Union[Timeout, NoValue]
+    ) -> Union[Seconds, Timeouts]:
+        if isinstance(timeout, NoValue):
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return timeout.timeout()
+        return timeout
+
+    @staticmethod
+    def _read_content(response: httpx.Response, deadline: Optional[float]) -> bytes:
+        if deadline is None:
+            return response.read()
+        chunks = []
+        # decoded the same way as with read()
+        for chunk in response.iter_bytes(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise exceptions.Timeout
+        return b"".join(chunks)
+
+
+class AsyncHttpxDriver:
+    """
+    The same as :py:class:`HttpxDriver`, but for asynchronous code.
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[AsyncMiddleware],
+        timeout: Timeout,
+        verify: Verify = True,
+        cert: ClientCert = None,
+        http2: bool = True,
+    ):
+        self.middleware = middleware
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.http2 = http2
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        self.transport: Optional[httpx.AsyncHTTPTransport] = None
+        self.counters: Counters = defaultdict(PoolCounters)
+        self._settings: Optional[Tuple[Any, ...]] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"timeout={repr(self.timeout)}, "
+            f"verify={repr(self.verify)}, "
+            f"cert={repr(self.cert)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<AsyncDriver 'httpx'>"
+
+    @middleware.wrap
+    async def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        httpx_timeout, total = prepare_timeout(self._get_timeout(timeout))
+        deadline = time.monotonic() + total if total is not None else None
+        trace = Trace(request, self.hooks)
+        url = httpx.URL(encode_url(request))
+        tracer = AsyncTracer(trace, self.counters[get_origin(url)])
+        # client is cheap to create and keeps cookies isolated between requests,
+        # while connections are pooled by the shared transport
+        client = httpx.AsyncClient(
+            transport=await self._get_transport(),
+            cookies=dict(request.cookies),
+            follow_redirects=True,
+            trust_env=False,
+        )
+        kwargs = prepare_request_kwargs(request)
+        if not isinstance(kwargs.get("content", b""), bytes):
+            kwargs["content"] = self._iter_content(kwargs["content"])
+        try:
+            httpx_request = client.build_request(
+                request.method.value,
+                url,
+                timeout=httpx_timeout,
+                extensions={"trace": tracer},
+                **kwargs,
+            )
+            response = await client.send(httpx_request, stream=True)
+            try:
+                content = await self._read_content(response, deadline)
+            finally:
+                await response.aclose()
+            trace.mark("body")
+        except httpx.HTTPError as exc:
+            raise convert_error(exc) from exc
+        return make_response(request, response, content, trace)
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pool statistics.
+
+        ``evicted`` and ``wait_time`` are not tracked, and with HTTP/2
+        ``in_use`` is the number of connections serving at least one request.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        return get_pool_stats(self.transport, self.counters)
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        if self.transport is not None:
+            await self.transport.aclose()
+            self.transport = None
+
+    async def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        # connections are bound to the event loop they are created in
+        settings = (self.verify, self.cert, self.http2, asyncio.get_event_loop())
+        if self.transport is None or self._settings != settings:
+            if self.transport is not None and self._settings is not None:
+                await close_replaced(self.transport.aclose, self._settings[-1])
+            self.transport = httpx.AsyncHTTPTransport(
+                verify=make_ssl_context(self.verify, self.cert),
+                http2=self.http2,
+            )
+            self._settings = settings
+        return self.transport
+
+    def _get_timeout(
+        self, timeout: Union[Timeout, NoValue]
+    ) -> Union[Seconds, Timeouts]:
+        if isinstance(timeout, NoValue):
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return timeout.timeout()
+        return timeout
+
+    @staticmethod
+    async def _read_content(
+        response: httpx.Response, deadline: Optional[float]
+    ) -> bytes:
+        if deadline is None:
+            return await response.aread()
+        chunks = []
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise exceptions.Timeout
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _iter_content(body: Any) -> AsyncIterator[bytes]:
+        for chunk in iter_body(body):
+            yield chunk
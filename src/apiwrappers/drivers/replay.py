@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+from http.cookies import SimpleCookie
+from typing import IO, Any, Dict, Mapping, Optional, Type, Union
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import fetch_wrapped
+from apiwrappers.encoders import (
+    Body,
+    MultipartStream,
+    encode_body,
+    encode_form,
+    iter_body,
+)
+from apiwrappers.entities import Request, Response
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.protocols import AsyncDriver, AsyncMiddleware, Driver, Middleware
+from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+Entry = Dict[str, Any]
+
+
+class Cassette:
+    """
+    Responses recorded to a file.
+
+    Responses are stored one JSON object per line and indexed by HTTP method,
+    rendered URL, query parameters and a hash of the body. Headers are not
+    part of the index, so changing credentials doesn't invalidate a cassette.
+    If the path ends with ``.gz``, the file is compressed with gzip.
+
+    The whole file is loaded into memory when a cassette is created,
+    and new responses are appended to it as soon as they are recorded.
+
+    Args:
+        path: a path to a cassette file. It is created on the first record.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.entries: Dict[str, Entry] = {}
+        if os.path.exists(self.path):
+            with self._open("rt") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    entry["content"] = base64.b64decode(entry["content"])
+                    self.entries[entry.pop("key")] = entry
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} '{self.path}'>"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")  # type: ignore
+        return open(self.path, mode, encoding="utf-8")
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        params = request.query_params
+        items = params.items() if isinstance(params, Mapping) else params
+        # order of parameters doesn't matter, but order of values does
+        query = encode_form(sorted(items, key=lambda item: item[0]))
+        if request.files is not None:
+            # boundary of a stream is random, so it is fixed to be the same
+            # for the same fields, file names and contents
+            body: Body = MultipartStream(request.files, boundary="cassette")
+        else:
+            body, _ = encode_body(request)
+        digest = hashlib.sha256()
+        for chunk in iter_body(body):
+            digest.update(chunk)
+        return f"{request.method.value} {request.url} {query} {digest.hexdigest()}"
+
+    def get(self, request: Request) -> Optional[Response]:
+        """Returns a new response for a request, if there is one recorded."""
+        entry = self.entries.get(self.make_key(request))
+        if entry is None:
+            return None
+        return Response(
+            request=request,
+            status_code=entry["status_code"],
+            url=entry["url"],
+            headers=CaseInsensitiveDict(entry["headers"]),
+            cookies=SimpleCookie(entry["cookies"]),
+            content=entry["content"],
+            encoding=entry["encoding"],
+        )
+
+    def add(self, request: Request, response: Response) -> None:
+        """Records a response to a request, replacing previous one."""
+        key = self.make_key(request)
+        entry = {
+            "status_code": response.status_code,
+            "url": response.url,
+            "headers": dict(response.headers),
+            "cookies": {name: item.value for name, item in response.cookies.items()},
+            "encoding": response.encoding,
+            "content": response.content,
+        }
+        self.entries[key] = entry
+        content = base64.b64encode(response.content).decode()
+        line = {**entry, "key": key, "content": content}
+        with self._open("at") as f:
+            f.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+def get_cassette(cassette: Union[str, os.PathLike, Cassette]) -> Cassette:
+    if isinstance(cassette, Cassette):
+        return cassette
+    return Cassette(cassette)
+
+
+def no_response(request: Request) -> exceptions.DriverError:
+    key = Cassette.make_key(request)
+    return exceptions.DriverError(f"No recorded response for: {key}")
+
+
+class ReplayDriver:
+    """
+    A driver that replays responses from a cassette instead of making requests.
+
+    If ``driver`` is provided, requests missing from the cassette are made
+    with it, and responses are recorded. Otherwise, such requests fail with
+    :py:class:`DriverError <apiwrappers.DriverError>`.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.drivers.replay import ReplayDriver
+        >>> # record responses with a real driver
+        >>> requests_driver = make_driver("requests")
+        >>> driver = ReplayDriver(cassette="github.jsonl", driver=requests_driver)
+        >>> # replay them without network
+        >>> driver = ReplayDriver(cassette="github.jsonl")
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[Middleware],
+        cassette: Union[str, os.PathLike, Cassette],
+        driver: Optional[Driver] = None,
+        timeout: Timeout = None,
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        self.middleware = middleware
+        self.cassette = get_cassette(cassette)
+        self.driver = driver
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"cassette={repr(self.cassette)}, "
+            f"driver={repr(self.driver)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'replay'>"
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        response = self.cassette.get(request)
+        if response is not None:
+            return response
+        if self.driver is None:
+            raise no_response(request)
+        response = fetch_wrapped(self.driver, request, timeout)
+        self.cassette.add(request, response)
+        return response
+
+
+class AsyncReplayDriver:
+    """
+    The same as :py:class:`ReplayDriver`, but for asynchronous code.
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[AsyncMiddleware],
+        cassette: Union[str, os.PathLike, Cassette],
+        driver: Optional[AsyncDriver] = None,
+        timeout: Timeout = None,
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        self.middleware = middleware
+        self.cassette = get_cassette(cassette)
+        self.driver = driver
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"cassette={repr(self.cassette)}, "
+            f"driver={repr(self.driver)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<AsyncDriver 'replay'>"
+
+    @middleware.wrap
+    async def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        response = self.cassette.get(request)
+        if response is not None:
+            return response
+        if self.driver is None:
+            raise no_response(request)
+        response = await fetch_wrapped(self.driver, request, timeout)
+        self.cassette.add(request, response)
+        return response
@@ -1,19 +1,129 @@
 import ssl
-from datetime import timedelta
+import time
 from http.cookies import SimpleCookie
-from typing import Type, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, Union, cast
 
 import requests
+import requests.adapters
 import requests.exceptions
+import urllib3
 
 from apiwrappers import exceptions
+from apiwrappers.dns import DNSCache
+from apiwrappers.drivers.tls import make_ssl_context
+from apiwrappers.drivers.urllib3 import (
+    HTTPConnectionPool,
+    convert_error,
+    current_trace,
+    get_connect_timeout,
+    get_pool_classes,
+    get_pool_stats,
+    prepare_timeout,
+)
 from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
 from apiwrappers.middleware import MiddlewareChain
 from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
 from apiwrappers.protocols import Middleware
-from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from apiwrappers.structures import (
+    CaseInsensitiveDict,
+    Deadline,
+    NoValue,
+    PoolStats,
+    Timeouts,
+)
 from apiwrappers.typedefs import ClientCert, Timeout, Verify
 
+CHUNK_SIZE = 2**16
+
+
+class HTTPAdapter(requests.adapters.HTTPAdapter):
+    """An adapter with pools keeping statistics and connections reporting
+    phases of connecting.
+
+    If ``unix_socket`` is set, all connections are made to it, and if ``dns``
+    is set, hosts are resolved with it. Connections with the same TLS settings
+    share SSL context, so they resume TLS sessions."""
+
+    # attributes kept on pickling, the pool manager is initialized from them
+    __attrs__ = requests.adapters.HTTPAdapter.__attrs__ + ["unix_socket", "dns"]
+
+    _ssl: Optional[Tuple[Any, Union[bool, ssl.SSLContext]]] = None
+
+    def __init__(
+        self,
+        *args,
+        unix_socket: Optional[str] = None,
+        dns: Optional[DNSCache] = None,
+        **kwargs,
+    ):
+        # pool manager is initialized by the parent
+        self.unix_socket = unix_socket
+        self.dns = dns
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = get_pool_classes(
+            self.unix_socket, self.dns
+        )
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        if "ca_cert_dir" in pool_kwargs:
+            # SSL context is only made with a CA bundle file
+            return host_params, pool_kwargs
+        context = self.get_ssl_context(verify, cert)
+        if isinstance(context, ssl.SSLContext):
+            # CA bundle and client certificate are already loaded into context
+            pool_kwargs = {
+                "cert_reqs": pool_kwargs["cert_reqs"],
+                "ssl_context": context,
+            }
+        return host_params, pool_kwargs
+
+    def get_ssl_context(
+        self, verify: Optional[Verify], cert: ClientCert
+    ) -> Union[bool, ssl.SSLContext]:
+        """Returns the same SSL context for the same TLS settings."""
+        # SSL context is a part of a pool key, so creating a new one
+        # for every request would prevent connections from being reused
+        # requests verifies with its default CA bundle, if verify isn't set
+        settings = (True if verify is None else verify, cert)
+        if self._ssl is None or self._ssl[0] != settings:
+            self._ssl = (settings, make_ssl_context(*settings))
+        return self._ssl[1]
+
+    def get_pool(
+        self, url: str, verify: Optional[Verify], cert: ClientCert
+    ) -> HTTPConnectionPool:
+        """Returns the same pool, requests to ``url`` are made with."""
+        request = requests.Request("GET", url).prepare()
+        get_connection = getattr(self, "get_connection_with_tls_context", None)
+        if get_connection is not None:
+            pool = get_connection(request, verify, cert=cert)
+        else:
+            # requests<2.32 sets TLS settings on a pool for each request
+            pool = self.get_connection(url)
+            self.cert_verify(pool, url, verify, cert)
+        # pools are created from pool classes of this adapter
+        return cast(HTTPConnectionPool, pool)
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        return get_pool_stats(self.poolmanager)
+
+
+def make_session(adapter: HTTPAdapter) -> requests.Session:
+    # session is cheap to create and keeps cookies isolated between requests,
+    # while connections are pooled by the shared adapter
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class RequestsDriver:
     middleware = MiddlewareChain(Authentication)
@@ -24,11 +134,20 @@ class RequestsDriver:
         timeout: Timeout,
         verify: Verify = True,
         cert: ClientCert = None,
+        unix_socket: Optional[str] = None,
+        dns: Optional[DNSCache] = None,
     ):
+        # pylint: disable=too-many-arguments
         self.middleware = middleware
         self.timeout = timeout
         self.verify = verify
         self.cert = cert
+        self.unix_socket = unix_socket
+        self.dns = dns
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        # a host from URL is still sent in Host header
+        self.adapter = HTTPAdapter(unix_socket=unix_socket, dns=dns)
 
     def __repr__(self) -> str:
         middleware = [m.__name__ for m in self.middleware]
@@ -52,8 +171,15 @@ class RequestsDriver:
         request: Request,
         timeout: Union[Timeout, NoValue] = NoValue(),
     ) -> Response:
+        timeout = self._get_timeout(timeout)
+        deadline = None
+        if isinstance(timeout, Timeouts) and timeout.total is not None:
+            deadline = time.monotonic() + timeout.total
+        trace = Trace(request, self.hooks)
+        token = current_trace.set(trace)
         try:
-            response = requests.request(
+            session = make_session(self._get_adapter())
+            response = session.request(
                 request.method.value,
                 str(request.url),
                 params=request.query_params,
@@ -62,18 +188,28 @@ class RequestsDriver:
                 data=request.data,
                 files=request.files,
                 json=request.json,
-                timeout=self._prepare_timeout(timeout),
+                # requests passes urllib3.Timeout through, though it isn't typed so
+                timeout=cast(Any, prepare_timeout(timeout)),
                 verify=self.verify,
                 cert=self.cert,
+                stream=True,
             )
+            trace.mark("headers")
+            content = self._read_content(response, deadline)
+            trace.mark("body")
         except requests.Timeout as exc:
             raise exceptions.Timeout from exc
         except requests.exceptions.SSLError as exc:
             raise ssl.SSLError(str(exc)) from exc
         except requests.ConnectionError as exc:
+            if exc.args and isinstance(exc.args[0], urllib3.exceptions.TimeoutError):
+                # requests reports timeouts during reading body as connection errors
+                raise exceptions.Timeout from exc
             raise exceptions.ConnectionFailed from exc
         except requests.RequestException as exc:
             raise exceptions.DriverError from exc
+        finally:
+            current_trace.reset(token)
 
         return Response(
             request=request,
@@ -82,14 +218,81 @@ class RequestsDriver:
             headers=CaseInsensitiveDict(response.headers),
             cookies=SimpleCookie(response.cookies),
             encoding=response.encoding or "utf-8",
-            content=response.content,
+            content=content,
+            timings=trace.timings(),
         )
 
-    def _prepare_timeout(
-        self, timeout: Union[Timeout, NoValue]
-    ) -> Union[int, float, None]:
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pools statistics.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        return self.adapter.pool_stats()
+
+    def warmup(
+        self,
+        hosts: Iterable[str],
+        connections_per_host: int = 1,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> None:
+        """
+        Opens connections to hosts in advance, so first requests to them
+        don't wait for DNS lookup, TCP connection and TLS handshake.
+
+        Connections are opened one by one and kept idle in pools, which
+        keep no more than 10 connections per host.
+
+        Args:
+            hosts: URLs of hosts, e.g. ``https://example.org``.
+            connections_per_host: how many connections to open to each host.
+            timeout: how long to wait for each connection.
+
+        Raises:
+            ConnectionFailed: if a connection can't be established.
+            Timeout: if a connection isn't established in time.
+        """
+        connect_timeout = get_connect_timeout(self._get_timeout(timeout))
+        adapter = self._get_adapter()
+        session = make_session(adapter)
+        try:
+            for host in hosts:
+                # the same TLS settings as for requests, e.g. CA bundle from env
+                settings = session.merge_environment_settings(
+                    host, {}, None, self.verify, self.cert
+                )
+                pool = adapter.get_pool(host, settings["verify"], settings["cert"])
+                pool.warmup(connections_per_host, connect_timeout)
+        except urllib3.exceptions.HTTPError as exc:
+            raise convert_error(exc) from exc
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.adapter.close()
+
+    def _get_adapter(self) -> HTTPAdapter:
+        settings = (self.unix_socket, self.dns)
+        if (self.adapter.unix_socket, self.adapter.dns) != settings:
+            self.close()
+            self.adapter = HTTPAdapter(unix_socket=self.unix_socket, dns=self.dns)
+        return self.adapter
+
+    def _get_timeout(self, timeout: Union[Timeout, NoValue]) -> Timeout:
         if isinstance(timeout, NoValue):
-            return self._prepare_timeout(self.timeout)
-        if isinstance(timeout, timedelta):
-            return timeout.total_seconds()
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return timeout.timeout()
         return timeout
+
+    @staticmethod
+    def _read_content(response: requests.Response, deadline: Optional[float]) -> bytes:
+        if deadline is None:
+            return response.content
+        chunks = []
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                response.close()
+                raise exceptions.Timeout
+        return b"".join(chunks)
@@ -0,0 +1,201 @@
+import os
+import socket
+import ssl
+import sys
+import weakref
+from typing import Any, Dict, Optional, Tuple, Union
+
+import certifi
+
+from apiwrappers.typedefs import ClientCert, Verify
+
+TLSConnection = Union[ssl.SSLSocket, ssl.SSLObject]
+# server name and port, if known
+SessionKey = Tuple[str, Optional[int]]
+
+
+def is_resumable(session: Optional[ssl.SSLSession]) -> bool:
+    # with TLS 1.3 a session can be resumed only after a server sends a ticket,
+    # which is received some time after handshake
+    return session is not None and bool(session.has_ticket or session.id)
+
+
+def encode_hostname(hostname: Union[str, bytes, None]) -> Optional[str]:
+    # the same way SSL sockets and objects report it
+    if isinstance(hostname, str):
+        hostname = hostname.encode("idna")
+    return hostname.decode("ascii") if hostname is not None else None
+
+
+def get_port(sock: socket.socket) -> Optional[int]:
+    try:
+        address = sock.getpeername()
+    except OSError:
+        return None
+    # e.g. a path for Unix sockets
+    return address[1] if isinstance(address, tuple) else None
+
+
+class SSLSocket(ssl.SSLSocket):
+    def close(self) -> None:
+        # session is not available once a socket is closed
+        self.context.save_session(self)  # type: ignore
+        super().close()
+
+
+class SSLContext(ssl.SSLContext):
+    """
+    An SSL context resuming TLS sessions of previous connections to the same
+    host, so new connections skip a full handshake.
+
+    Sessions are kept per server name and port, and only the latest one
+    is resumed. Port is not known for connections made by asyncio,
+    so their sessions are kept per server name only.
+    """
+
+    sslsocket_class = SSLSocket
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # pylint: disable=unused-argument
+        super().__init__()
+        self.sessions: Dict[SessionKey, ssl.SSLSession] = {}
+        self._latest: Dict[SessionKey, "weakref.ReferenceType[TLSConnection]"] = {}
+        self._keys: "weakref.WeakKeyDictionary[TLSConnection, SessionKey]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def wrap_socket(  # type: ignore
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ) -> ssl.SSLSocket:
+        # pylint: disable=too-many-arguments
+        port = get_port(sock)
+        if session is None and not server_side:
+            session = self.get_session(server_hostname, port)
+        conn = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session,
+        )
+        self._track(conn, port)
+        return conn
+
+    def wrap_bio(  # type: ignore
+        self,
+        incoming,
+        outgoing,
+        server_side=False,
+        server_hostname=None,
+        session=None,
+    ) -> ssl.SSLObject:
+        # pylint: disable=too-many-arguments
+        if session is None and not server_side:
+            session = self.get_session(server_hostname)
+        conn = super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session,
+        )
+        self._track(conn, None)
+        return conn
+
+    def get_session(
+        self, server_hostname: Union[str, bytes, None], port: Optional[int] = None
+    ) -> Optional[ssl.SSLSession]:
+        """Returns the latest resumable session of a host and port, if any."""
+        host = encode_hostname(server_hostname)
+        if host is None:
+            return None
+        key = (host, port)
+        ref = self._latest.get(key)
+        conn = ref() if ref is not None else None
+        if conn is not None:
+            # a session of an open connection may have got a ticket since
+            self.save_session(conn)
+        return self.sessions.get(key)
+
+    def save_session(self, conn: TLSConnection) -> None:
+        """Keeps a session of a connection, if it can be resumed."""
+        key = self._keys.get(conn)
+        session = conn.session
+        if key is not None and session is not None and is_resumable(session):
+            self.sessions[key] = session
+
+    def _track(self, conn: TLSConnection, port: Optional[int]) -> None:
+        if conn.server_hostname is not None:
+            key = (conn.server_hostname, port)
+            self._keys[conn] = key
+            self._latest[key] = weakref.ref(conn)
+
+
+def create_default_context(cafile: str) -> SSLContext:
+    """
+    Creates a context resuming sessions with the same settings, that
+    :py:func:`ssl.create_default_context` uses for a CA bundle.
+
+    That is, strict certificate checks on Python 3.13 and later, and
+    TLS keys logged to a file from ``SSLKEYLOGFILE`` environment variable.
+    """
+    context = SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_verify_locations(cafile)
+    if sys.version_info >= (3, 13):
+        # pylint: disable=no-member
+        context.verify_flags |= ssl.VERIFY_X509_STRICT | ssl.VERIFY_X509_PARTIAL_CHAIN
+    keylogfile = os.environ.get("SSLKEYLOGFILE")
+    if keylogfile and not sys.flags.ignore_environment:
+        context.keylog_filename = keylogfile
+    return context
+
+
+def make_ssl_context(verify: Verify, cert: ClientCert) -> Union[bool, ssl.SSLContext]:
+    """
+    Creates SSL context for drivers that don't accept paths to CA bundle
+    and client certificates.
+
+    TLS sessions are resumed by new connections made with the same context.
+
+    Returns:
+        ``False`` if verification is disabled, SSL context otherwise.
+
+    Raises:
+        FileNotFoundError: if CA bundle or client certificate doesn't exist.
+    """
+    if verify is False:
+        return False
+    if verify is True:
+        context = create_default_context(cafile=certifi.where())
+    else:
+        try:
+            context = create_default_context(cafile=verify)
+        except FileNotFoundError as exc:
+            msg = (
+                f"Could not find a suitable TLS CA certificate bundle, "
+                f"invalid path: {verify}"
+            )
+            raise FileNotFoundError(msg) from exc
+
+    certfile: Optional[str]
+    keyfile: Optional[str]
+    if isinstance(cert, tuple):
+        certfile, keyfile = cert
+    else:
+        certfile, keyfile = cert, None
+
+    if certfile is not None:
+        try:
+            context.load_cert_chain(certfile, keyfile)
+        except FileNotFoundError as exc:
+            msg = f"Could not find the TLS certificate file, invalid path: {cert}"
+            raise FileNotFoundError(msg) from exc
+
+    return context
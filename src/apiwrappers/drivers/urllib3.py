@@ -0,0 +1,608 @@
+from __future__ import annotations
+
+import functools
+import socket
+import ssl
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+from urllib.parse import urljoin
+
+import urllib3
+import urllib3.connection
+import urllib3.exceptions
+from urllib3._collections import HTTPHeaderDict
+from urllib3.util.wait import wait_for_read
+
+from apiwrappers import exceptions
+from apiwrappers.dns import DNSCache
+from apiwrappers.drivers.tls import make_ssl_context
+from apiwrappers.encoders import Body, body_length, encode_body, encode_url
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
+from apiwrappers.protocols import Middleware
+from apiwrappers.structures import (
+    CaseInsensitiveDict,
+    Deadline,
+    NoValue,
+    PoolCounters,
+    PoolStats,
+    Timeouts,
+)
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+CHUNK_SIZE = 2**16
+
+# the same limits as in requests
+POOL_SIZE = 10
+MAX_REDIRECTS = 30
+
+# failed requests are not retried, but redirects are followed
+RETRIES = urllib3.Retry(
+    total=None, connect=0, read=False, status=0, other=0, redirect=MAX_REDIRECTS
+)
+
+DEFAULT_HEADERS = {"Accept": "*/*", "Accept-Encoding": "gzip, deflate"}
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def mark(event: str) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.mark(event)
+
+
+def connect_unix(conn: urllib3.connection.HTTPConnection, path: str) -> socket.socket:
+    """Connects to a Unix socket, raising the same errors as urllib3 does."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        if isinstance(conn.timeout, (int, float)):
+            sock.settimeout(conn.timeout)
+        sock.connect(path)
+    except socket.timeout as exc:
+        sock.close()
+        msg = f"Connection to {path} timed out"
+        raise urllib3.exceptions.ConnectTimeoutError(conn, msg) from exc
+    except OSError as exc:
+        sock.close()
+        msg = f"Failed to establish a new connection: {exc}"
+        raise urllib3.exceptions.NewConnectionError(conn, msg) from exc
+    return sock
+
+
+def connect_resolved(
+    conn: urllib3.connection.HTTPConnection,
+    dns: DNSCache,
+    new_conn: Callable[[], socket.socket],
+) -> socket.socket:
+    """Connects to addresses of a host from DNS cache, one by one."""
+    mark("dns_start")
+    try:
+        addresses = dns.resolve(conn.host, conn.port)  # type: ignore
+    except socket.gaierror as exc:
+        msg = f"Failed to resolve {conn.host}: {exc}"
+        raise urllib3.exceptions.NewConnectionError(conn, msg) from exc
+    mark("dns_end")
+    # host is used for Host header and TLS, so only the address to connect to
+    # is replaced for a moment
+    dns_host = conn._dns_host  # pylint: disable=protected-access
+    error: Exception = urllib3.exceptions.NewConnectionError(
+        conn, f"No addresses to connect to {conn.host}"
+    )
+    try:
+        for address in addresses:
+            conn._dns_host = address  # pylint: disable=protected-access
+            try:
+                return new_conn()
+            except urllib3.exceptions.ConnectTimeoutError as exc:
+                error = exc
+        raise error
+    finally:
+        conn._dns_host = dns_host  # pylint: disable=protected-access
+
+
+def is_tls_connected(sock: ssl.SSLSocket) -> bool:
+    """
+    Returns whether an idle TLS connection is still open.
+
+    With TLS 1.3 servers send session tickets after handshake, so a socket
+    of a connection opened in advance is readable before any request is sent.
+    Tickets are read to tell them from a connection closed by a server.
+    """
+    if not wait_for_read(sock, timeout=0.0):
+        return True
+    timeout = sock.gettimeout()
+    sock.settimeout(0.0)
+    try:
+        # either a connection is closed or it has unexpected data
+        sock.recv(1)
+    except ssl.SSLWantReadError:
+        return True
+    except OSError:
+        pass
+    finally:
+        sock.settimeout(timeout)
+    return False
+
+
+class HTTPConnection(urllib3.connection.HTTPConnection):
+    # connect to a Unix socket instead of a host from URL, if set
+    unix_socket: Optional[str] = None
+    dns: Optional[DNSCache] = None
+
+    def connect(self) -> None:
+        mark("connect_start")
+        super().connect()
+        mark("connect_end")
+
+    def _new_conn(self) -> socket.socket:
+        if self.unix_socket is not None:
+            return connect_unix(self, self.unix_socket)
+        if self.dns is not None:
+            return connect_resolved(self, self.dns, super()._new_conn)
+        return super()._new_conn()
+
+
+class HTTPSConnection(urllib3.connection.HTTPSConnection):
+    unix_socket: Optional[str] = None
+    dns: Optional[DNSCache] = None
+    # counters of a pool to count TLS handshakes in
+    counters: Optional[PoolCounters] = None
+
+    def connect(self) -> None:
+        mark("connect_start")
+        super().connect()
+        mark("connect_end")
+        mark("tls_end")
+        if self.counters is not None and isinstance(self.sock, ssl.SSLSocket):
+            self.counters.handshake(self.sock)
+
+    @property
+    def is_connected(self) -> bool:
+        if isinstance(self.sock, ssl.SSLSocket):
+            return is_tls_connected(self.sock)
+        return super().is_connected
+
+    def _new_conn(self) -> socket.socket:
+        if self.unix_socket is not None:
+            sock = connect_unix(self, self.unix_socket)
+        elif self.dns is not None:
+            sock = connect_resolved(self, self.dns, super()._new_conn)
+        else:
+            sock = super()._new_conn()
+        # TLS handshake starts right after TCP connection is established
+        mark("tls_start")
+        return sock
+
+
+class HTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = HTTPConnection
+
+    def __init__(
+        self,
+        *args,
+        unix_socket: Optional[str] = None,
+        dns: Optional[DNSCache] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.unix_socket = unix_socket
+        self.dns = dns
+        self.counters = PoolCounters()
+
+    def _new_conn(self) -> urllib3.connection.HTTPConnection:
+        conn = super()._new_conn()
+        conn.unix_socket = self.unix_socket  # type: ignore
+        conn.dns = self.dns  # type: ignore
+        conn.counters = self.counters  # type: ignore
+        return cast(urllib3.connection.HTTPConnection, conn)
+
+    def _get_conn(
+        self, timeout: Optional[float] = None
+    ) -> urllib3.connection.HTTPConnection:
+        start = time.perf_counter()
+        conn = self._get_pooled_conn(timeout)
+        self.counters.wait_time += time.perf_counter() - start
+        self.counters.in_use += 1
+        if conn.sock is not None:
+            self.counters.reused += 1
+            mark("connection_reused")
+        else:
+            # connection is established on first use
+            self.counters.created += 1
+        return conn
+
+    def _get_pooled_conn(
+        self, timeout: Optional[float] = None
+    ) -> urllib3.connection.HTTPConnection:
+        # pool only holds connections of its ConnectionCls
+        conn = super()._get_conn(timeout)
+        return cast(urllib3.connection.HTTPConnection, conn)
+
+    def _put_conn(self, conn: Optional[HTTPConnection]) -> None:  # type: ignore
+        self.counters.in_use -= 1
+        if self.pool is not None and self.pool.full():
+            self.counters.evicted += 1
+        super()._put_conn(conn)
+
+    def warmup(self, count: int, timeout: Optional[float] = None) -> None:
+        """
+        Opens connections until ``count`` of them are idle in the pool,
+        but no more than the pool keeps.
+        """
+        if self.pool is not None:
+            count = min(count, self.pool.maxsize)
+        # connections are taken and returned by the parent, so they are not
+        # counted as used
+        conns: List[urllib3.connection.HTTPConnection] = []
+        try:
+            for _ in range(count):
+                conns.append(self._get_pooled_conn())
+            for conn in conns:
+                if conn.sock is None:
+                    conn.timeout = timeout
+                    self._connect(conn)
+                    self.counters.created += 1
+        finally:
+            for conn in conns:
+                super()._put_conn(conn)
+
+    def _connect(self, conn: urllib3.connection.HTTPConnection) -> None:
+        # urllib3 converts errors only while making a request, so the same
+        # is done here, except for TLS errors, which drivers raise as is
+        try:
+            conn.connect()
+        except Exception as exc:
+            # socket is left open, if TLS handshake fails
+            conn.close()
+            if isinstance(exc, socket.timeout):
+                msg = f"Connection to {self.host} timed out"
+                raise urllib3.exceptions.ConnectTimeoutError(conn, msg) from exc
+            if isinstance(exc, OSError) and not isinstance(exc, ssl.SSLError):
+                msg = f"Failed to establish a new connection: {exc}"
+                raise urllib3.exceptions.NewConnectionError(conn, msg) from exc
+            raise
+
+    def stats(self) -> PoolStats:
+        conns = list(self.pool.queue) if self.pool is not None else []
+        idle = sum(conn is not None and conn.sock is not None for conn in conns)
+        return self.counters.snapshot(idle)
+
+
+class HTTPSConnectionPool(HTTPConnectionPool, urllib3.HTTPSConnectionPool):
+    ConnectionCls = HTTPSConnection  # type: ignore
+
+    def _new_conn(self) -> HTTPSConnection:
+        return cast(HTTPSConnection, super()._new_conn())
+
+
+POOL_CLASSES = {"http": HTTPConnectionPool, "https": HTTPSConnectionPool}
+
+
+def get_pool_classes(
+    unix_socket: Optional[str] = None, dns: Optional[DNSCache] = None
+) -> Dict[str, Any]:
+    """
+    Returns pool classes making connections to a Unix socket or to addresses
+    from DNS cache, if any is set.
+    """
+    if unix_socket is None and dns is None:
+        return POOL_CLASSES
+    # unknown keywords can't be passed through pool manager, because
+    # they are a part of a pool key
+    return {
+        scheme: functools.partial(pool_cls, unix_socket=unix_socket, dns=dns)
+        for scheme, pool_cls in POOL_CLASSES.items()
+    }
+
+
+def get_pool_stats(poolmanager: urllib3.PoolManager) -> Dict[str, PoolStats]:
+    pools = poolmanager.pools
+    stats = {}
+    for key in pools.keys():
+        try:
+            pool = cast(HTTPConnectionPool, pools[key])
+        except KeyError:  # pool is evicted in the meantime
+            continue
+        stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = pool.stats()
+    return stats
+
+
+def make_pool_manager(
+    verify: Verify,
+    cert: ClientCert,
+    unix_socket: Optional[str] = None,
+    dns: Optional[DNSCache] = None,
+) -> urllib3.PoolManager:
+    context = make_ssl_context(verify, cert)
+    if context is False:
+        kwargs: Dict[str, Any] = {"cert_reqs": "CERT_NONE"}
+    else:
+        kwargs = {"ssl_context": context}
+    poolmanager = urllib3.PoolManager(POOL_SIZE, maxsize=POOL_SIZE, **kwargs)
+    poolmanager.pool_classes_by_scheme = get_pool_classes(unix_socket, dns)
+    return poolmanager
+
+
+def prepare_timeout(timeout: Timeout) -> Union[int, float, None, urllib3.Timeout]:
+    if isinstance(timeout, timedelta):
+        return timeout.total_seconds()
+    if isinstance(timeout, Deadline):
+        return prepare_timeout(timeout.timeout())
+    if isinstance(timeout, Timeouts):
+        # urllib3 uses connect timeout while sending request and
+        # doesn't wait for a free connection unless pool is blocking
+        connect = timeout.connect
+        if connect is not None and timeout.write is not None:
+            connect = max(connect, timeout.write)
+        return urllib3.Timeout(total=timeout.total, connect=connect, read=timeout.read)
+    return timeout
+
+
+def get_connect_timeout(timeout: Timeout) -> Optional[float]:
+    prepared = prepare_timeout(timeout)
+    if isinstance(prepared, urllib3.Timeout):
+        return prepared.connect_timeout  # type: ignore
+    return prepared
+
+
+def prepare_request(
+    request: Request,
+) -> Tuple[Optional[Body], HTTPHeaderDict]:
+    body, content_type = encode_body(request)
+    headers = HTTPHeaderDict(DEFAULT_HEADERS)
+    if request.cookies:
+        cookies = (f"{name}={value}" for name, value in request.cookies.items())
+        headers["Cookie"] = "; ".join(cookies)
+    if content_type is not None:
+        headers["Content-Type"] = content_type
+    if not isinstance(body, bytes):
+        # otherwise, streams are sent with chunked encoding
+        length = body_length(body)
+        if length is not None:
+            headers["Content-Length"] = str(length)
+    headers.update(request.headers)
+    return body or None, headers
+
+
+def get_encoding(content_type: Optional[str]) -> str:
+    for param in (content_type or "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            return value.strip().strip("\"'")
+    return "utf-8"
+
+
+def get_url(url: str, response: urllib3.BaseHTTPResponse) -> str:
+    # response only knows the path it was requested with
+    history = response.retries.history if response.retries is not None else ()
+    if history:
+        # both are set for redirects, the only requests retried
+        return urljoin(history[-1].url or url, history[-1].redirect_location or "")
+    return url
+
+
+def convert_error(exc: urllib3.exceptions.HTTPError) -> Exception:
+    if isinstance(exc, urllib3.exceptions.MaxRetryError) and exc.reason is not None:
+        exc = exc.reason  # type: ignore
+    if isinstance(exc, urllib3.exceptions.NewConnectionError):
+        return exceptions.ConnectionFailed()
+    if isinstance(exc, urllib3.exceptions.TimeoutError):
+        return exceptions.Timeout()
+    if isinstance(exc, urllib3.exceptions.SSLError):
+        return ssl.SSLError(str(exc))
+    if isinstance(exc, urllib3.exceptions.ProtocolError):
+        return exceptions.ConnectionFailed()
+    return exceptions.DriverError()
+
+
+class Urllib3Driver:
+    """
+    A driver that makes requests with urllib3 directly.
+
+    Compared to :py:class:`RequestsDriver
+    <apiwrappers.drivers.requests.RequestsDriver>`, there is no session,
+    prepared request and hooks of requests in between, so each request takes
+    less time on the client. Connections are pooled the same way.
+
+    Unlike requests, cookies set by redirect responses are not sent
+    with the following requests, and ``.netrc`` and proxy environment
+    variables are ignored.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        timeout: how long to wait for a response.
+        verify: whether to verify TLS certificate or a path to a CA bundle.
+        cert: a path to client certificate or a ('cert', 'key') tuple.
+        unix_socket: a path to a Unix socket to make all requests to.
+            A host from URL is still sent in ``Host`` header.
+        dns: a :py:class:`DNSCache <apiwrappers.DNSCache>` to resolve hosts
+            with, instead of resolving them for every new connection.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> driver = make_driver("urllib3")
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[Middleware],
+        timeout: Timeout,
+        verify: Verify = True,
+        cert: ClientCert = None,
+        unix_socket: Optional[str] = None,
+        dns: Optional[DNSCache] = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self.middleware = middleware
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.unix_socket = unix_socket
+        self.dns = dns
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+        self.poolmanager: Optional[urllib3.PoolManager] = None
+        self._settings: Optional[Tuple[Any, ...]] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"timeout={repr(self.timeout)}, "
+            f"verify={repr(self.verify)}, "
+            f"cert={repr(self.cert)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'urllib3'>"
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        timeout = self._get_timeout(timeout)
+        deadline = None
+        if isinstance(timeout, Timeouts) and timeout.total is not None:
+            deadline = time.monotonic() + timeout.total
+        url = encode_url(request)
+        body, headers = prepare_request(request)
+        poolmanager = self._get_pool_manager()
+        trace = Trace(request, self.hooks)
+        token = current_trace.set(trace)
+        try:
+            response = poolmanager.urlopen(
+                request.method.value,
+                url,
+                body=body,
+                headers=headers,
+                timeout=prepare_timeout(timeout),
+                retries=RETRIES,
+                preload_content=False,
+            )
+            trace.mark("headers")
+            try:
+                content = self._read_content(response, deadline)
+            finally:
+                response.release_conn()
+            trace.mark("body")
+        except urllib3.exceptions.HTTPError as exc:
+            raise convert_error(exc) from exc
+        finally:
+            current_trace.reset(token)
+
+        cookies: SimpleCookie = SimpleCookie()
+        for value in response.headers.getlist("Set-Cookie"):
+            cookies.load(value)
+        return Response(
+            request=request,
+            status_code=response.status,
+            url=get_url(url, response),
+            headers=CaseInsensitiveDict(response.headers),
+            cookies=cookies,
+            encoding=get_encoding(response.headers.get("Content-Type")),
+            content=content,
+            timings=trace.timings(),
+        )
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Returns a snapshot of connection pools statistics.
+
+        Returns:
+            A dictionary with pool statistics per ``scheme://host:port``.
+        """
+        if self.poolmanager is None:
+            return {}
+        return get_pool_stats(self.poolmanager)
+
+    def warmup(
+        self,
+        hosts: Iterable[str],
+        connections_per_host: int = 1,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> None:
+        """
+        Opens connections to hosts in advance, so first requests to them
+        don't wait for DNS lookup, TCP connection and TLS handshake.
+
+        Connections are opened one by one and kept idle in pools, which
+        keep no more than 10 connections per host.
+
+        Args:
+            hosts: URLs of hosts, e.g. ``https://example.org``.
+            connections_per_host: how many connections to open to each host.
+            timeout: how long to wait for each connection.
+
+        Raises:
+            ConnectionFailed: if a connection can't be established.
+            Timeout: if a connection isn't established in time.
+        """
+        connect_timeout = get_connect_timeout(self._get_timeout(timeout))
+        poolmanager = self._get_pool_manager()
+        try:
+            for host in hosts:
+                pool = cast(HTTPConnectionPool, poolmanager.connection_from_url(host))
+                pool.warmup(connections_per_host, connect_timeout)
+        except urllib3.exceptions.HTTPError as exc:
+            raise convert_error(exc) from exc
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        if self.poolmanager is not None:
+            self.poolmanager.clear()
+
+    def _get_pool_manager(self) -> urllib3.PoolManager:
+        settings = (self.verify, self.cert, self.unix_socket, self.dns)
+        if self.poolmanager is None or self._settings != settings:
+            self.close()
+            self.poolmanager = make_pool_manager(*settings)
+            self._settings = settings
+        return self.poolmanager
+
+    def _get_timeout(self, timeout: Union[Timeout, NoValue]) -> Timeout:
+        if isinstance(timeout, NoValue):
+            return self._get_timeout(self.timeout)
+        if isinstance(timeout, Deadline):
+            return timeout.timeout()
+        return timeout
+
+    @staticmethod
+    def _read_content(
+        response: urllib3.BaseHTTPResponse, deadline: Optional[float]
+    ) -> bytes:
+        if deadline is None:
+            return response.read()
+        chunks = []
+        for chunk in response.stream(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                response.close()
+                raise exceptions.Timeout
+        return b"".join(chunks)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import io
+import sys
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type, Union
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from apiwrappers import exceptions
+from apiwrappers.drivers._common import DEFAULT_PORTS, make_response
+from apiwrappers.encoders import encode_request
+from apiwrappers.entities import Request, Response
+from apiwrappers.hooks import Hooks, Trace
+from apiwrappers.middleware import MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.stats import MiddlewareStats
+from apiwrappers.protocols import Middleware
+from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from apiwrappers.typedefs import ClientCert, Timeout, Verify
+
+WSGIApp = Callable[[Any, Callable[..., Any]], Iterable[bytes]]
+
+
+class WSGIDriver:
+    """
+    A driver that calls a WSGI application in-process instead of making
+    requests over the network.
+
+    Requests are dispatched straight to the application, so the driver is
+    useful to test and benchmark API clients and middleware without
+    network overhead. The host part of a URL is only used to fill in the
+    ``Host`` header and ``SERVER_NAME``. Timeouts are not enforced, and
+    exceptions raised by the application are propagated as is.
+
+    Args:
+        *middleware: :ref:`middleware <middleware>` to apply to driver.
+        app: a WSGI application to call.
+
+    Usage::
+
+        >>> from apiwrappers.drivers.wsgi import WSGIDriver
+        >>> from myservice import app
+        >>> driver = WSGIDriver(app=app)
+    """
+
+    middleware = MiddlewareChain(Authentication)
+
+    def __init__(
+        self,
+        *middleware: Type[Middleware],
+        app: WSGIApp,
+        timeout: Timeout = None,
+        verify: Verify = True,
+        cert: ClientCert = None,
+    ):
+        self.middleware = middleware
+        self.app = app
+        self.timeout = timeout
+        self.verify = verify
+        self.cert = cert
+        self.hooks = Hooks()
+        self.middleware_stats: Optional[MiddlewareStats] = None
+
+    def __repr__(self) -> str:
+        middleware = [m.__name__ for m in self.middleware]
+        if middleware:
+            middleware.append("")
+        return (
+            f"{self.__class__.__name__}("
+            f"{', '.join(middleware)}"
+            f"app={repr(self.app)}"
+            ")"
+        )
+
+    def __str__(self) -> str:
+        return "<Driver 'wsgi'>"
+
+    @middleware.wrap
+    def fetch(
+        self,
+        request: Request,
+        timeout: Union[Timeout, NoValue] = NoValue(),
+    ) -> Response:
+        # pylint: disable=unused-argument
+        trace = Trace(request, self.hooks)
+        url, headers, content = encode_request(request)
+        status: List[Any] = []
+        chunks: List[bytes] = []
+
+        def start_response(
+            status_line: str, response_headers: List[Tuple[str, str]], exc_info=None
+        ) -> Callable[[bytes], None]:
+            # pylint: disable=unused-argument
+            # nothing is sent until the app returns, so an error response
+            # can always replace the previous one
+            status[:] = [int(status_line.split(" ", 1)[0]), response_headers]
+            return chunks.append
+
+        environ = self._make_environ(request, url, headers, content)
+        result = self.app(environ, start_response)
+        trace.mark("headers")
+        try:
+            chunks.extend(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()  # type: ignore
+        trace.mark("body")
+
+        if not status:
+            raise exceptions.DriverError("WSGI app didn't start a response")
+        status_code, response_headers = status
+        return make_response(
+            request, url, status_code, response_headers, b"".join(chunks), trace
+        )
+
+    @staticmethod
+    def _make_environ(
+        request: Request, url: str, headers: CaseInsensitiveDict[str], content: bytes
+    ) -> Any:
+        parts = urlsplit(url)
+        environ = {
+            "REQUEST_METHOD": request.method.value,
+            "SCRIPT_NAME": "",
+            # PEP 3333 requires native strings decoded as latin-1
+            "PATH_INFO": unquote_to_bytes(parts.path or "/").decode("latin-1"),
+            "QUERY_STRING": parts.query,
+            "SERVER_NAME": parts.hostname or "localhost",
+            "SERVER_PORT": str(parts.port or DEFAULT_PORTS.get(parts.scheme, 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parts.scheme or "http",
+            "wsgi.input": io.BytesIO(content),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            environ[key] = value
+        return environ
@@ -0,0 +1,251 @@
+import io
+import json
+import os
+import uuid
+from typing import IO, Any, Iterable, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode, urlsplit
+
+from apiwrappers.entities import Request
+from apiwrappers.structures import CaseInsensitiveDict
+from apiwrappers.typedefs import Data, Files
+
+Body = Union[bytes, IO[bytes], "MultipartStream"]
+
+CHUNK_SIZE = 2**16
+
+
+def encode_body(request: Request) -> Tuple[Body, Optional[str]]:
+    """
+    Encodes request body the same way drivers send it over the wire.
+
+    Files are not read into memory. Instead, they are wrapped into a
+    :py:class:`MultipartStream` that produces ``multipart/form-data`` body
+    on the fly. File-like ``data`` is returned as is.
+
+    Args:
+        request: a request which body to encode.
+
+    Returns:
+        A tuple of body and its content type. Content type is ``None`` if it
+        can't be inferred from the request.
+    """
+    if request.json is not None:
+        return json.dumps(request.json).encode(), "application/json"
+    if request.files is not None:
+        stream = MultipartStream(request.files)
+        return stream, stream.content_type
+    return encode_data(request.data)
+
+
+def encode_request(request: Request) -> Tuple[str, CaseInsensitiveDict[str], bytes]:
+    """
+    Returns URL, headers and body of a request as they are sent by a client.
+
+    Unlike :py:func:`encode_body`, the body is read into memory.
+    """
+    body, content_type = encode_body(request)
+    content = b"".join(iter_body(body))
+    headers = encode_headers(request, content_type)
+    if content:
+        headers.setdefault("Content-Length", str(len(content)))
+    return encode_url(request), headers, content
+
+
+def encode_url(request: Request) -> str:
+    """Returns request URL with query parameters appended to it."""
+    url = str(request.url)
+    query = encode_form(request.query_params)
+    if not query:
+        return url
+    separator = "&" if urlsplit(url).query else "?"
+    return f"{url}{separator}{query}"
+
+
+def encode_headers(
+    request: Request, content_type: Optional[str]
+) -> CaseInsensitiveDict[str]:
+    """
+    Returns request headers as they are sent over the wire.
+
+    ``Host``, ``Cookie`` and ``Content-Type`` headers are added,
+    unless they are set explicitly.
+
+    Args:
+        request: a request which headers to encode.
+        content_type: content type of the body, as returned by
+            :py:func:`encode_body`.
+    """
+    headers: CaseInsensitiveDict[str] = CaseInsensitiveDict()
+    headers["Host"] = urlsplit(str(request.url)).netloc
+    if request.cookies:
+        cookies = (f"{name}={value}" for name, value in request.cookies.items())
+        headers["Cookie"] = "; ".join(cookies)
+    if content_type is not None:
+        headers["Content-Type"] = content_type
+    headers.update(request.headers)
+    return headers
+
+
+def encode_data(data: Data) -> Tuple[Body, Optional[str]]:
+    if data is None:
+        return b"", None
+    if isinstance(data, bytes):
+        return data, None
+    if isinstance(data, str):
+        return data.encode(), None
+    if hasattr(data, "read"):
+        return data, None  # type: ignore
+    return encode_form(data).encode(), "application/x-www-form-urlencoded"
+
+
+def encode_form(data: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]) -> str:
+    items = data.items() if isinstance(data, Mapping) else data
+    fields: List[Tuple[str, str]] = []
+    for key, values in items:
+        if isinstance(values, (str, bytes)) or not isinstance(values, Iterable):
+            values = [values]
+        fields.extend((key, str(value)) for value in values if value is not None)
+    return urlencode(fields)
+
+
+def body_length(body: Body) -> Optional[int]:
+    """Returns number of bytes left in a body, if it can be determined."""
+    if isinstance(body, bytes):
+        return len(body)
+    if hasattr(body, "__len__"):
+        return len(body) - body.tell()  # type: ignore
+    try:
+        position = body.tell()
+        end = body.seek(0, io.SEEK_END)
+        body.seek(position)
+    except (OSError, AttributeError):
+        return None
+    return end - position
+
+
+def iter_body(body: Body, chunk_size: int = CHUNK_SIZE) -> Iterable[bytes]:
+    """
+    Yields body in chunks, restoring stream position afterwards.
+
+    That way a stream can be read again, for example, when sending it.
+    """
+    if isinstance(body, bytes):
+        yield body
+        return
+
+    position = body.tell()
+    try:
+        while True:
+            chunk = body.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        body.seek(position)
+
+
+def quote_param(value: str) -> str:
+    """
+    Escapes quotes and line breaks in a ``Content-Disposition`` parameter,
+    the same way browsers do.
+    """
+    return value.translate({10: "%0A", 13: "%0D", 34: "%22"})
+
+
+class MultipartStream(io.RawIOBase):
+    """
+    A file-like object producing ``multipart/form-data`` body on the fly.
+
+    Args:
+        files: files in the same format as :py:attr:`Request.files`.
+        boundary: a boundary to delimit parts with. Random, if not provided.
+    """
+
+    def __init__(self, files: Files, boundary: Optional[str] = None):
+        super().__init__()
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._parts: List[Union[bytes, Tuple[IO[bytes], int]]] = []
+        for name, value in (files or {}).items():
+            filename, content_type = None, None
+            if isinstance(value, tuple):
+                if len(value) == 2:
+                    filename, fileobj = value  # type: ignore
+                else:
+                    filename, fileobj, content_type = value  # type: ignore
+            else:
+                fileobj = value
+            if filename is None:
+                filename = os.path.basename(getattr(fileobj, "name", "") or name)
+            self._parts.append(self._make_part_headers(name, filename, content_type))
+            self._parts.append((fileobj, fileobj.tell()))
+            self._parts.append(b"\r\n")
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        length = 0
+        for part in self._parts:
+            if isinstance(part, bytes):
+                length += len(part)
+            else:
+                fileobj, start = part
+                position = fileobj.tell()
+                length += fileobj.seek(0, io.SEEK_END) - start
+                fileobj.seek(position)
+        return length
+
+    def _make_part_headers(
+        self, name: str, filename: str, content_type: Optional[str]
+    ) -> bytes:
+        name, filename = quote_param(name), quote_param(filename)
+        headers = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+        )
+        if content_type is not None:
+            headers += f"Content-Type: {content_type}\r\n"
+        return f"{headers}\r\n".encode()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if (whence, offset) in ((io.SEEK_CUR, 0), (io.SEEK_SET, self._position)):
+            return self._position
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("can only rewind to the beginning")
+        for part in self._parts:
+            if not isinstance(part, bytes):
+                fileobj, start = part
+                fileobj.seek(start)
+        self._index, self._offset, self._position = 0, 0, 0
+        return 0
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        while self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                end = self._offset + len(view)
+                chunk = part[self._offset : end]  # noqa: E203
+                self._offset += len(chunk)
+                if self._offset >= len(part):
+                    self._index, self._offset = self._index + 1, 0
+            else:
+                chunk = part[0].read(len(view))
+                if not chunk:
+                    self._index, self._offset = self._index + 1, 0
+                    continue
+            view[: len(chunk)] = chunk
+            self._position += len(chunk)
+            return len(chunk)
+        return 0
@@ -6,9 +6,9 @@ import enum
 import json
 from dataclasses import dataclass
 from http.cookies import SimpleCookie
-from typing import Any, MutableMapping, Union, cast
+from typing import Any, MutableMapping, Optional, Union, cast
 
-from apiwrappers.structures import CaseInsensitiveDict, Url
+from apiwrappers.structures import CaseInsensitiveDict, Timings, Url
 from apiwrappers.typedefs import Auth, Data, Files, Json, QueryParams
 
 
@@ -68,6 +68,7 @@ class Request:
             authorization headers, e.g. '{"Authorization": "Bearer ..."}'
         data: the body to attach to the request. If a dictionary or list of tuples
             ``[(key, value)]`` is provided, form-encoding will take place.
+            A file-like object is streamed without loading it into memory.
         files: Dictionary of ``'name': file-like-objects`` (or ``{'name': file-tuple}``)
             for multipart encoding upload.
             ``file-tuple`` can be a 2-tuple ``('filename', fileobj)``,
@@ -143,6 +144,8 @@ class Response:
         cookies: cookies the server sent back.
         content: content of the response, in bytes.
         encoding: encoding or the response.
+        timings: time spent on each phase of the request, if measured by
+            the driver.
     """
 
     request: Request
@@ -152,6 +155,7 @@ class Response:
     cookies: SimpleCookie
     content: bytes
     encoding: str
+    timings: Optional[Timings] = None
 
     def __str__(self) -> str:
         return f"<{self.__class__.__name__} [{self.status_code}]>"
@@ -12,13 +12,17 @@ DEFAULT_TIMEOUT = timedelta(seconds=30)
 
 DRIVER_MAP = {
     "requests": ("apiwrappers.drivers.requests", "RequestsDriver"),
+    "urllib3": ("apiwrappers.drivers.urllib3", "Urllib3Driver"),
     "aiohttp": ("apiwrappers.drivers.aiohttp", "AioHttpDriver"),
+    "asyncio": ("apiwrappers.drivers.asyncio", "AsyncioDriver"),
+    "httpx": ("apiwrappers.drivers.httpx", "HttpxDriver"),
+    "httpx-async": ("apiwrappers.drivers.httpx", "AsyncHttpxDriver"),
 }
 
 
 @overload
 def make_driver(
-    driver_type: Literal["requests"],
+    driver_type: Literal["requests", "urllib3", "httpx"],
     *middleware: Type[Middleware],
     timeout: Timeout = DEFAULT_TIMEOUT,
     verify: Verify = True,
@@ -29,7 +33,7 @@ def make_driver(
 
 @overload
 def make_driver(
-    driver_type: Literal["aiohttp"],
+    driver_type: Literal["aiohttp", "asyncio", "httpx-async"],
     *middleware: Type[AsyncMiddleware],
     timeout: Timeout = DEFAULT_TIMEOUT,
     verify: Verify = True,
@@ -66,20 +70,23 @@ def make_driver(
 
     Args:
         driver_type: specifies what kind of driver to create. Valid choices are
-            ``request`` and ``aiohttp``.
+            ``requests``, ``urllib3``, ``aiohttp``, ``asyncio``, ``httpx``
+            and ``httpx-async``.
         *middleware: :ref:`middleware <middleware>` to apply to driver. Dependant on
             ``driver_type`` it should be of one kind - either ``Type[Middleware]``
             for regular drivers and ``Type[AsyncMiddleware]`` for asynchronous ones.
         timeout: how many seconds to wait for the server to send data before giving up.
-            If set to ``None`` waits infinitely.
+            If set to ``None`` waits infinitely. Use :py:class:`Timeouts` to set
+            timeouts for each phase of a request separately.
         verify: Either a boolean, in which case it controls whether to verify the
             server's TLS certificate, or a string, in which case it must be a path
             to a CA bundle to use.
         cert: Either a path to SSL client cert file (.pem) or a ('cert', 'key') tuple.
 
     Returns:
-        * **Driver** if ``driver_type`` is ``requests``.
-        * **AsyncDriver** if ``driver_type`` is ``aiohttp``.
+        * **Driver** if ``driver_type`` is ``requests``, ``urllib3`` or ``httpx``.
+        * **AsyncDriver** if ``driver_type`` is ``aiohttp``, ``asyncio``
+          or ``httpx-async``.
 
     Raises:
         ValueError: if unknown driver type specified
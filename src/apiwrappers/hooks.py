@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import enum
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from apiwrappers.entities import Request
+from apiwrappers.structures import TimingsRecorder
+
+Callback = Callable[..., None]
+
+
+class Event(enum.Enum):
+    """
+    Events emitted while a request is being made.
+
+    The available events are:
+        * REQUEST_START - a driver starts making a request.
+        * CONNECTION_REUSED - a connection is acquired from a pool.
+        * CONNECTION_CREATED - a new connection is established.
+        * TLS_DONE - TLS handshake is completed.
+        * HEADERS_RECEIVED - response headers are received.
+        * BODY_DONE - response body is read.
+        * RETRY - a request is about to be retried.
+    """
+
+    REQUEST_START = "request_start"
+    CONNECTION_REUSED = "connection_reused"
+    CONNECTION_CREATED = "connection_created"
+    TLS_DONE = "tls_done"
+    HEADERS_RECEIVED = "headers_received"
+    BODY_DONE = "body_done"
+    RETRY = "retry"
+
+
+# events corresponding to the phases marked by drivers
+PHASES = {
+    "start": Event.REQUEST_START,
+    "connection_reused": Event.CONNECTION_REUSED,
+    "connect_end": Event.CONNECTION_CREATED,
+    "tls_end": Event.TLS_DONE,
+    "headers": Event.HEADERS_RECEIVED,
+    "body": Event.BODY_DONE,
+}
+
+
+class Hooks:
+    """
+    Subscribers to driver events.
+
+    Each callback is called with an event, a request and keyword arguments
+    specific to the event.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.hooks import Event
+        >>> driver = make_driver("requests")
+        >>> driver.hooks.subscribe(Event.HEADERS_RECEIVED, print)
+    """
+
+    __slots__ = ("_subscribers",)
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[Event, List[Callback]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._subscribers)
+
+    def __repr__(self) -> str:
+        events = ", ".join(event.value for event in self._subscribers)
+        return f"{self.__class__.__name__}({events})"
+
+    def subscribe(self, event: Event, callback: Callback) -> None:
+        self._subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event: Event, callback: Callback) -> None:
+        self._subscribers[event].remove(callback)
+        if not self._subscribers[event]:
+            del self._subscribers[event]
+
+    def emit(self, event: Event, request: Request, **kwargs: Any) -> None:
+        for callback in self._subscribers.get(event, ()):
+            callback(event, request, **kwargs)
+
+
+current_hooks: ContextVar[Optional[Hooks]] = ContextVar("current_hooks", default=None)
+
+
+def emit(event: Event, request: Request, **kwargs: Any) -> None:
+    """
+    Emits an event to the hooks of the driver making the current request.
+
+    This is intended for middleware, e.g. to report a retry::
+
+        emit(Event.RETRY, request, attempt=2)
+    """
+    hooks = current_hooks.get()
+    if hooks:
+        hooks.emit(event, request, **kwargs)
+
+
+class Trace(TimingsRecorder):
+    """
+    Records timings of a request and emits events for its phases.
+
+    Events are emitted only if there are subscribers, so a trace without
+    them costs as much as measuring timings.
+    """
+
+    __slots__ = ("request", "hooks")
+
+    def __init__(self, request: Request, hooks: Optional[Hooks] = None):
+        super().__init__()
+        self.request = request
+        # checking for None on every mark is cheaper than calling __bool__
+        self.hooks = hooks if hooks else None
+        if self.hooks is not None:
+            self.hooks.emit(Event.REQUEST_START, request)
+
+    def mark(self, event: str) -> None:
+        super().mark(event)
+        if self.hooks is not None and event in PHASES:
+            self.hooks.emit(PHASES[event], self.request)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import weakref
+from typing import Callable, Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+Key = Tuple[str, str]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+METRICS = {
+    "request_duration_seconds": ("histogram", "Time spent making a request."),
+    "requests_in_flight": ("gauge", "Number of requests in progress."),
+    "responses_total": ("counter", "Number of responses by status code."),
+    "errors_total": ("counter", "Number of requests failed with an exception."),
+}
+
+
+class Sample(NamedTuple):
+    name: str
+    labels: Dict[str, str]
+    value: float
+
+
+class Series:
+    """
+    Metrics of a single endpoint.
+
+    Each thread records into its own series, so updating one is just
+    a few attribute increments without any locking.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count", "in_flight", "statuses", "errors")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # the last one is for values greater than the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.in_flight = 0
+        self.statuses: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def add_status(self, status_code: int) -> None:
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+    def add_error(self, error: str) -> None:
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+    def merge(self, other: Series) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+        self.in_flight += other.in_flight
+        for status_code, count in other.statuses.copy().items():
+            self.statuses[status_code] = self.statuses.get(status_code, 0) + count
+        for error, count in other.errors.copy().items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+
+class ShardOwner:
+    """Lives as long as thread-local data of a thread it is created in."""
+
+
+class MetricsRegistry:
+    """
+    Stores request metrics per HTTP method and URL template.
+
+    Recording doesn't take any locks: every thread gets its own shard, and
+    shards are merged only when metrics are collected. Once a thread
+    finishes, its shard is merged into the one kept for finished threads.
+
+    Args:
+        buckets: upper bounds of latency histogram buckets, in seconds.
+        prefix: a prefix for metric names.
+
+    Usage::
+
+        >>> from apiwrappers.metrics import MetricsRegistry
+        >>> registry = MetricsRegistry()
+        >>> print(registry.to_prometheus())
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "apiwrappers"
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._local = threading.local()
+        # shards of running threads by their ids
+        self._shards: Dict[int, Dict[Key, Series]] = {}
+        self._retired: Dict[Key, Series] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} '{self.prefix}'>"
+
+    def series(self, method: str, template: str) -> Series:
+        """Returns series of the current thread for the given endpoint."""
+        shard: Dict[Key, Series]
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._add_shard()
+        try:
+            return shard[(method, template)]
+        except KeyError:
+            series = shard[(method, template)] = Series(self.buckets)
+            return series
+
+    def collect(self) -> Dict[Key, Series]:
+        """Returns a snapshot of metrics merged across all threads."""
+        result: Dict[Key, Series] = {}
+        with self._lock:
+            shards = list(self._shards.values())
+            self._merge(result, self._retired)
+        for shard in shards:
+            self._merge(result, shard)
+        return result
+
+    def _add_shard(self) -> Dict[Key, Series]:
+        shard: Dict[Key, Series] = {}
+        # thread-local data is dropped when a thread finishes, and so is the owner
+        self._local.owner = owner = ShardOwner()
+        weakref.finalize(owner, self._retire, shard)
+        self._local.shard = shard
+        with self._lock:
+            self._shards[id(shard)] = shard
+        return shard
+
+    def _retire(self, shard: Dict[Key, Series]) -> None:
+        with self._lock:
+            del self._shards[id(shard)]
+            self._merge(self._retired, shard)
+
+    def _merge(self, result: Dict[Key, Series], shard: Dict[Key, Series]) -> None:
+        for key, series in shard.copy().items():
+            if key not in result:
+                result[key] = Series(self.buckets)
+            result[key].merge(series)
+
+    def samples(self) -> Iterator[Sample]:
+        """Yields every sample in a form suitable for any metrics backend."""
+        for (method, template), series in sorted(self.collect().items()):
+            labels = {"method": method, "url": template}
+            name = f"{self.prefix}_request_duration_seconds"
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series.counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                yield Sample(f"{name}_bucket", {**labels, "le": le}, cumulative)
+            yield Sample(f"{name}_sum", labels, series.sum)
+            yield Sample(f"{name}_count", labels, series.count)
+            yield Sample(f"{self.prefix}_requests_in_flight", labels, series.in_flight)
+            for status_code, count in sorted(series.statuses.items()):
+                yield Sample(
+                    f"{self.prefix}_responses_total",
+                    {**labels, "status": str(status_code)},
+                    count,
+                )
+            for error, count in sorted(series.errors.items()):
+                yield Sample(
+                    f"{self.prefix}_errors_total", {**labels, "error": error}, count
+                )
+
+    def export(self, callback: Callable[[Sample], None]) -> None:
+        """Calls ``callback`` with every sample, e.g. to push them to StatsD."""
+        for sample in self.samples():
+            callback(sample)
+
+    def to_prometheus(self) -> str:
+        """Returns metrics in Prometheus text exposition format."""
+        lines: Dict[str, List[str]] = {name: [] for name in METRICS}
+        for sample in self.samples():
+            family = next(
+                name
+                for name in METRICS
+                if sample.name.startswith(f"{self.prefix}_{name}")
+            )
+            labels = ",".join(
+                f'{key}="{escape(value)}"' for key, value in sample.labels.items()
+            )
+            lines[family].append(f"{sample.name}{{{labels}}} {sample.value}")
+
+        output = []
+        for name, (kind, description) in METRICS.items():
+            output.append(f"# HELP {self.prefix}_{name} {description}")
+            output.append(f"# TYPE {self.prefix}_{name} {kind}")
+            output.extend(lines[name])
+        return "\n".join(output) + "\n"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+REGISTRY = MetricsRegistry()
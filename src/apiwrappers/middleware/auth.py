@@ -1,10 +1,34 @@
-from typing import Generator
+import hashlib
+import threading
+from typing import Dict, Generator, Union
 
 from apiwrappers.auth import BasicAuth
 from apiwrappers.entities import Request, Response
 from apiwrappers.middleware.base import BaseMiddleware
 from apiwrappers.protocols import AsyncHandler, Handler
 
+AuthValue = Union[Dict[str, str], Generator[Request, Response, Dict[str, str]]]
+
+BASIC_AUTH_CACHE_SIZE = 128
+
+# headers for credentials given as a tuple by their digest, so credentials
+# themselves are not kept around
+basic_auth_headers: Dict[bytes, Dict[str, str]] = {}
+basic_auth_lock = threading.Lock()
+
+
+def get_basic_auth_headers(username: str, password: str) -> Dict[str, str]:
+    key = hashlib.sha256(f"{username}:{password}".encode()).digest()
+    headers = basic_auth_headers.get(key)
+    if headers is None:
+        headers = BasicAuth(username, password).make_headers()
+        with basic_auth_lock:
+            if len(basic_auth_headers) >= BASIC_AUTH_CACHE_SIZE:
+                # the oldest ones go first
+                del basic_auth_headers[next(iter(basic_auth_headers))]
+            basic_auth_headers[key] = headers
+    return headers
+
 
 class Authentication(BaseMiddleware):
     def call_next(
@@ -14,16 +38,19 @@ class Authentication(BaseMiddleware):
         *args,
         **kwargs,
     ) -> Response:
-        gen = self.set_auth_headers(request)
-        try:
-            while True:
-                auth_request = next(gen)
-                auth_response = super().call_next(
-                    handler, auth_request, *args, **kwargs
-                )
-                gen.send(auth_response)
-        except StopIteration:
-            pass
+        if request.auth is not None:
+            value = self.get_auth_value(request)
+            if isinstance(value, Generator):
+                try:
+                    auth_request = next(value)
+                    while True:
+                        auth_response = super().call_next(
+                            handler, auth_request, *args, **kwargs
+                        )
+                        auth_request = value.send(auth_response)
+                except StopIteration as exc:
+                    value = exc.value
+            request.headers.update(value)
         return super().call_next(handler, request, *args, **kwargs)
 
     async def call_next_async(
@@ -33,29 +60,30 @@ class Authentication(BaseMiddleware):
         *args,
         **kwargs,
     ) -> Response:
-        gen = self.set_auth_headers(request)
-        try:
-            while True:
-                auth_request = next(gen)
-                auth_response = await super().call_next_async(
-                    handler, auth_request, *args, **kwargs
-                )
-                gen.send(auth_response)
-        except StopIteration:
-            pass
-        return await super().call_next_async(handler, request, *args, **kwargs)
-
-    @staticmethod
-    def set_auth_headers(request) -> Generator[Request, Response, None]:
         if request.auth is not None:
-            if isinstance(request.auth, tuple):
-                request.auth = BasicAuth(*request.auth)
-            value = request.auth()
+            value = self.get_auth_value(request)
             if isinstance(value, Generator):
                 try:
+                    auth_request = next(value)
                     while True:
-                        auth_response = yield next(value)
-                        value.send(auth_response)
+                        auth_response = await super().call_next_async(
+                            handler, auth_request, *args, **kwargs
+                        )
+                        auth_request = value.send(auth_response)
                 except StopIteration as exc:
                     value = exc.value
             request.headers.update(value)
+        return await super().call_next_async(handler, request, *args, **kwargs)
+
+    @staticmethod
+    def get_auth_value(request: Request) -> AuthValue:
+        """
+        Returns either authorization headers or an authentication flow.
+
+        Headers for tuples are the same as for :py:class:`BasicAuth` and they
+        are cached by a digest of credentials, so they are not encoded again
+        for every request.
+        """
+        if isinstance(request.auth, tuple):
+            return get_basic_auth_headers(*request.auth)
+        return request.auth()  # type: ignore
@@ -43,7 +43,7 @@ class BaseMiddleware(Generic[T]):
         ...
 
     def __call__(self, request, timeout=NoValue()):
-        if iscoroutinehandler(self.handler):
+        if self._is_async:
             call_next = self.call_next_async
         else:
             call_next = self.call_next
@@ -2,9 +2,25 @@ from __future__ import annotations
 
 import asyncio
 import functools
-from typing import Any, Callable, Iterable, List, Type, TypeVar, Union, cast, overload
-
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+from apiwrappers.entities import Request
+from apiwrappers.hooks import current_hooks
+from apiwrappers.middleware.stats import Timer
 from apiwrappers.protocols import AsyncDriver, AsyncMiddleware, Driver, Middleware
+from apiwrappers.structures import Deadline, NoValue, Timeouts
+from apiwrappers.typedefs import Timeout
 
 FuncType = Callable[..., Any]
 FT = TypeVar("FT", bound=FuncType)
@@ -37,6 +53,10 @@ class MiddlewareChain:
     ) -> List[Type[AsyncMiddleware]]:
         ...
 
+    @overload
+    def __get__(self, obj: Any, objtype: Any) -> AnyMiddlewareList:
+        ...
+
     def __get__(self, obj, objtype):
         if obj is None:
             return self.middleware
@@ -56,6 +76,10 @@ class MiddlewareChain:
     ) -> None:
         ...
 
+    @overload
+    def __set__(self, obj: Any, middleware: Iterable[AnyMiddleware]) -> None:
+        ...
+
     def __set__(self, obj: Union[Driver, AsyncDriver], middleware) -> None:
         new_middleware = list(middleware)
         defaults = [item for item in self.middleware if item not in new_middleware]
@@ -64,22 +88,78 @@ class MiddlewareChain:
 
     @staticmethod
     def wrap(func: FT) -> FT:
+        """
+        Wraps driver's ``fetch`` method with the middleware chain.
+
+        If ``total`` timeout is set, a :py:class:`Deadline` is started here, once
+        per call, so every request issued down the chain - authentication flows
+        or retries - shares the same budget.
+
+        If driver's hooks have subscribers, they are made available to middleware
+        through :py:func:`apiwrappers.hooks.emit`.
+
+        If driver has ``middleware_stats``, time spent in each middleware is
+        recorded there.
+        """
         if asyncio.iscoroutinefunction(func):
 
             async def wrapper(*args, **kwargs):
                 instance = args[0]
-                handler = functools.partial(func, instance)
-                for middleware in reversed(instance.middleware):
-                    handler = middleware(handler)
-                return await handler(*args[1:], **kwargs)
+                handler = build_handler(func, instance)
+                args = start_deadline(instance, *args[1:], **kwargs)
+                hooks = getattr(instance, "hooks", None)
+                if not hooks:
+                    return await handler(*args)
+                token = current_hooks.set(hooks)
+                try:
+                    return await handler(*args)
+                finally:
+                    current_hooks.reset(token)
 
         else:
 
             def wrapper(*args, **kwargs):
                 instance = args[0]
-                handler = functools.partial(func, instance)
-                for middleware in reversed(instance.middleware):
-                    handler = middleware(handler)
-                return handler(*args[1:], **kwargs)
+                handler = build_handler(func, instance)
+                args = start_deadline(instance, *args[1:], **kwargs)
+                hooks = getattr(instance, "hooks", None)
+                if not hooks:
+                    return handler(*args)
+                token = current_hooks.set(hooks)
+                try:
+                    return handler(*args)
+                finally:
+                    current_hooks.reset(token)
 
         return cast(FT, functools.wraps(func)(wrapper))
+
+
+def build_handler(func: FuncType, driver: Any) -> Any:
+    # driver instances have a list of middleware, not the MiddlewareChain
+    # their protocols declare
+    handler = functools.partial(func, driver)
+    stats = getattr(driver, "middleware_stats", None)
+    if stats is None:
+        for middleware in reversed(driver.middleware):
+            handler = middleware(handler)
+        return handler
+
+    timer = Timer(stats)
+    is_async = asyncio.iscoroutinefunction(func)
+    handler = timer.wrap(handler, func.__name__, is_async)
+    for middleware in reversed(driver.middleware):
+        layer = middleware(handler)
+        timer.instrument(layer)
+        handler = timer.wrap(layer, middleware.__name__, is_async)
+    return handler
+
+
+def start_deadline(
+    driver: Union[Driver, AsyncDriver],
+    request: Request,
+    timeout: Union[Timeout, NoValue] = NoValue(),
+) -> Tuple[Request, Union[Timeout, NoValue]]:
+    value = driver.timeout if isinstance(timeout, NoValue) else timeout
+    if isinstance(value, Timeouts) and value.total is not None:
+        return request, Deadline(value)
+    return request, timeout
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from typing import Type
+
+from apiwrappers.entities import Request, Response
+from apiwrappers.metrics import REGISTRY, MetricsRegistry, Series
+from apiwrappers.middleware.base import BaseMiddleware
+from apiwrappers.protocols import AsyncHandler, Handler
+
+
+class Metrics(BaseMiddleware):
+    """
+    Records latency, status codes, errors and in-flight requests.
+
+    Metrics are recorded per HTTP method and :py:attr:`Url.template
+    <apiwrappers.Url.template>`, so ``/users/1`` and ``/users/2`` are counted
+    as the same endpoint.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.metrics import MetricsRegistry
+        >>> from apiwrappers.middleware.metrics import Metrics
+        >>> registry = MetricsRegistry()
+        >>> make_driver("requests", Metrics.using(registry))
+        RequestsDriver(Authentication, Metrics, ...
+    """
+
+    registry: MetricsRegistry = REGISTRY
+
+    @classmethod
+    def using(cls, registry: MetricsRegistry) -> Type[Metrics]:
+        return type(cls.__name__, (cls,), {"registry": registry})
+
+    def get_series(self, request: Request) -> Series:
+        return self.registry.series(request.method.value, request.url.template)
+
+    def call_next(
+        self,
+        handler: Handler,
+        request: Request,
+        *args,
+        **kwargs,
+    ) -> Response:
+        series = self.get_series(request)
+        series.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = super().call_next(handler, request, *args, **kwargs)
+        except Exception as exc:
+            series.observe(time.perf_counter() - start)
+            series.add_error(type(exc).__name__)
+            raise
+        else:
+            series.observe(time.perf_counter() - start)
+            series.add_status(response.status_code)
+            return response
+        finally:
+            series.in_flight -= 1
+
+    async def call_next_async(
+        self,
+        handler: AsyncHandler,
+        request: Request,
+        *args,
+        **kwargs,
+    ) -> Response:
+        series = self.get_series(request)
+        series.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = await super().call_next_async(handler, request, *args, **kwargs)
+        except Exception as exc:
+            series.observe(time.perf_counter() - start)
+            series.add_error(type(exc).__name__)
+            raise
+        else:
+            series.observe(time.perf_counter() - start)
+            series.add_status(response.status_code)
+            return response
+        finally:
+            series.in_flight -= 1
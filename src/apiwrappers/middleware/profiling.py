@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import cProfile
+import itertools
+import threading
+from typing import Iterator, Optional, Type
+
+from apiwrappers.entities import Request, Response
+from apiwrappers.middleware.base import BaseMiddleware
+from apiwrappers.profiling import PROFILER, Key, Profiler
+from apiwrappers.protocols import AsyncHandler, Handler
+
+# only one profile can be enabled in a thread at a time
+ACTIVE = threading.local()
+
+
+class Profiling(BaseMiddleware):
+    """
+    Profiles slow requests.
+
+    Stacks of requests taking longer than ``threshold`` seconds are sampled,
+    and, if ``every`` is set, one in ``every`` requests is profiled with
+    :py:mod:`cProfile`. Results are aggregated per HTTP method and
+    :py:attr:`Url.template <apiwrappers.Url.template>`.
+
+    For async drivers, stacks are sampled from the event loop thread, and
+    a profile covers everything the loop did during a request, so they may
+    include other requests made concurrently. A request is not profiled,
+    if another one is already being profiled in the same thread.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.middleware.profiling import Profiling
+        >>> from apiwrappers.profiling import Profiler
+        >>> profiler = Profiler()
+        >>> make_driver("requests", Profiling.using(profiler, threshold=0.5))
+        RequestsDriver(Authentication, Profiling, ...
+    """
+
+    profiler: Profiler = PROFILER
+    threshold: Optional[float] = 1.0
+    every: Optional[int] = None
+    counter: Iterator[int] = itertools.count(1)
+
+    @classmethod
+    def using(
+        cls,
+        profiler: Optional[Profiler] = None,
+        threshold: Optional[float] = 1.0,
+        every: Optional[int] = None,
+    ) -> Type[Profiling]:
+        """
+        Args:
+            profiler: where to store results. Defaults to a global profiler.
+            threshold: sample stacks of requests running longer than this,
+                in seconds. If ``None``, stacks are not sampled.
+            every: profile one in ``every`` requests with cProfile.
+        """
+        attrs = {
+            "profiler": profiler or cls.profiler,
+            "threshold": threshold,
+            "every": every,
+            "counter": itertools.count(1),
+        }
+        return type(cls.__name__, (cls,), attrs)
+
+    def get_key(self, request: Request) -> Key:
+        return (request.method.value, request.url.template)
+
+    def should_profile(self) -> bool:
+        return self.every is not None and next(self.counter) % self.every == 0
+
+    def start_profile(self) -> Optional[cProfile.Profile]:
+        if not self.should_profile() or getattr(ACTIVE, "profile", None):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is already running, e.g. outside of apiwrappers
+            return None
+        ACTIVE.profile = profile
+        return profile
+
+    def stop_profile(self, request: Request, profile: cProfile.Profile) -> None:
+        profile.disable()
+        ACTIVE.profile = None
+        self.profiler.add_profile(self.get_key(request), profile)
+
+    def call_next(
+        self,
+        handler: Handler,
+        request: Request,
+        *args,
+        **kwargs,
+    ) -> Response:
+        profile = self.start_profile()
+        if profile is not None:
+            try:
+                return super().call_next(handler, request, *args, **kwargs)
+            finally:
+                self.stop_profile(request, profile)
+
+        if self.threshold is None:
+            return super().call_next(handler, request, *args, **kwargs)
+
+        token = self.profiler.track(self.get_key(request), self.threshold)
+        try:
+            return super().call_next(handler, request, *args, **kwargs)
+        finally:
+            self.profiler.untrack(token)
+
+    async def call_next_async(
+        self,
+        handler: AsyncHandler,
+        request: Request,
+        *args,
+        **kwargs,
+    ) -> Response:
+        profile = self.start_profile()
+        if profile is not None:
+            try:
+                return await super().call_next_async(handler, request, *args, **kwargs)
+            finally:
+                self.stop_profile(request, profile)
+
+        if self.threshold is None:
+            return await super().call_next_async(handler, request, *args, **kwargs)
+
+        token = self.profiler.track(self.get_key(request), self.threshold)
+        try:
+            return await super().call_next_async(handler, request, *args, **kwargs)
+        finally:
+            self.profiler.untrack(token)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import weakref
+from typing import IO, Any, Type, cast
+
+from apiwrappers import encoders
+from apiwrappers.entities import Request
+from apiwrappers.middleware.base import BaseMiddleware
+from apiwrappers.signing import Signer
+from apiwrappers.typedefs import Data
+
+# positions streams of signed requests start at
+stream_starts: weakref.WeakKeyDictionary[Any, int] = weakref.WeakKeyDictionary()
+
+
+class Signing(BaseMiddleware):
+    """
+    Signs every request with a :py:attr:`signer`.
+
+    Before signing, request body is encoded the way it will be sent, so the
+    signature covers exactly the bytes that go over the wire. Files and
+    file-like bodies are streamed rather than loaded into memory.
+
+    Since any change to the request invalidates signature, this middleware
+    should go last in the chain.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.middleware.signing import Signing
+        >>> from apiwrappers.signing import HmacSigner
+        >>> make_driver("requests", Signing.using(HmacSigner("key-id", "secret")))
+        RequestsDriver(Authentication, Signing, ...
+    """
+
+    signer: Signer
+
+    @classmethod
+    def using(cls, signer: Signer) -> Type[Signing]:
+        return type(cls.__name__, (cls,), {"signer": signer})
+
+    def process_request(self, request: Request) -> Request:
+        stream = cast(IO[bytes], request.data)
+        if hasattr(stream, "seek") and stream in stream_starts:
+            # the request is signed again, e.g. on retry, after the body
+            # was sent, so it is read again from where it started
+            stream.seek(stream_starts[stream])
+        elif any(
+            body is not None for body in (request.data, request.files, request.json)
+        ):
+            body, content_type = encoders.encode_body(request)
+            # any binary file-like body is sent the same way as BinaryIO data
+            request.data, request.files, request.json = cast(Data, body), None, None
+            if not isinstance(body, bytes):
+                stream_starts[body] = body.tell()
+            has_content_type = any(
+                key.lower() == "content-type" for key in request.headers
+            )
+            if content_type is not None and not has_content_type:
+                request.headers["Content-Type"] = content_type
+            if isinstance(body, encoders.MultipartStream):
+                # otherwise some drivers fall back to chunked transfer encoding
+                request.headers["Content-Length"] = str(len(body))
+        request.headers.update(self.signer.sign(request))
+        return super().process_request(request)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import functools
+import math
+import time
+from typing import Any, Callable, Dict, List
+
+HOOKS = ("process_request", "process_response", "process_exception")
+
+
+class Stat:
+    """Cumulative statistics of a single step, in seconds."""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"count={self.count}, total={self.total:.6f}, mean={self.mean:.6f})"
+        )
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+
+class MiddlewareStats:
+    """
+    Time spent in each middleware of a driver.
+
+    Time spent in ``process_request``, ``process_response`` and
+    ``process_exception`` of a middleware is recorded separately from the rest
+    of the middleware. Time spent in driver's ``fetch`` is recorded as ``fetch``.
+    Time of each step excludes steps it calls, so they add up to the total
+    time of a call.
+
+    Usage::
+
+        >>> from apiwrappers import make_driver
+        >>> from apiwrappers.middleware.stats import MiddlewareStats
+        >>> driver = make_driver("requests")
+        >>> driver.middleware_stats = MiddlewareStats()  # enable
+        >>> print(driver.middleware_stats.report())
+        >>> driver.middleware_stats = None  # disable
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, Stat] = {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(self.stats)})"
+
+    def add(self, name: str, seconds: float) -> None:
+        try:
+            stat = self.stats[name]
+        except KeyError:
+            stat = self.stats[name] = Stat()
+        stat.add(seconds)
+
+    def clear(self) -> None:
+        self.stats.clear()
+
+    def report(self) -> str:
+        """Returns statistics as a table, times are in microseconds."""
+        width = max((len(name) for name in self.stats), default=4)
+        lines = [
+            f"{'name':<{width}} {'calls':>8} {'total':>12} "
+            f"{'mean':>10} {'min':>10} {'max':>10}"
+        ]
+        for name, stat in self.stats.items():
+            lines.append(
+                f"{name:<{width}} {stat.count:>8} {stat.total * 1e6:>12.1f} "
+                f"{stat.mean * 1e6:>10.1f} {stat.min * 1e6:>10.1f} "
+                f"{stat.max * 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+class Timer:
+    """
+    Measures a single call of a middleware chain.
+
+    Time spent in inner handlers is subtracted from the outer ones,
+    so each step gets only its own time.
+    """
+
+    def __init__(self, stats: MiddlewareStats):
+        self.stats = stats
+        self._inner: List[float] = []
+
+    def start(self) -> float:
+        self._inner.append(0.0)
+        return time.perf_counter()
+
+    def stop(self, name: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        self.stats.add(name, elapsed - self._inner.pop())
+        if self._inner:
+            self._inner[-1] += elapsed
+
+    def wrap(self, handler: Callable[..., Any], name: str, is_async: bool) -> Any:
+        if is_async:
+
+            async def timed_async(*args, **kwargs):
+                start = self.start()
+                try:
+                    return await handler(*args, **kwargs)
+                finally:
+                    self.stop(name, start)
+
+            # let middleware know the handler is a coroutine
+            return functools.partial(timed_async)
+
+        def timed(*args, **kwargs):
+            start = self.start()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self.stop(name, start)
+
+        return timed
+
+    def instrument(self, middleware: Any) -> None:
+        """Replaces middleware hooks with timed ones."""
+        name = type(middleware).__name__
+        for hook in HOOKS:
+            method = getattr(middleware, hook, None)
+            if method is not None:
+                timed = self.wrap(method, f"{name}.{hook}", is_async=False)
+                setattr(middleware, hook, timed)
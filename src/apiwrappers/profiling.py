@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import math
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+# HTTP method and URL template
+Key = Tuple[str, str]
+
+DEFAULT_INTERVAL = 0.005
+
+
+class Profiler:
+    """
+    Collects profiles of slow requests per HTTP method and URL template.
+
+    Stacks of requests running longer than a threshold are sampled by
+    a background thread, so requests that finish in time only pay for
+    registering themselves. The thread is running only while there are
+    requests in flight, and sleeps until the earliest threshold is reached.
+
+    Args:
+        interval: how often to sample stacks, in seconds.
+
+    Usage::
+
+        >>> from apiwrappers.profiling import Profiler
+        >>> profiler = Profiler()
+        >>> print(profiler.report())
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Dict[Key, Counter] = {}
+        self.profiles: Dict[Key, pstats.Stats] = {}
+        self._tokens = itertools.count()
+        self._active: Dict[int, Tuple[Key, int, float]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake_at = math.inf
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} interval={self.interval}>"
+
+    def track(self, key: Key, threshold: float) -> int:
+        """
+        Starts sampling stack of the current thread after ``threshold`` seconds.
+
+        Returns:
+            A token to stop tracking with.
+        """
+        token = next(self._tokens)
+        deadline = time.perf_counter() + threshold
+        with self._lock:
+            self._active[token] = (key, threading.get_ident(), deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            elif deadline < self._wake_at:
+                self._changed.notify()
+        return token
+
+    def untrack(self, token: int) -> None:
+        with self._lock:
+            del self._active[token]
+            if not self._active:
+                self._changed.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active.values())
+                self._wake_at = min(deadline for _, _, deadline in active)
+                delay = self._wake_at - time.perf_counter()
+                if delay > 0:
+                    # woken up earlier by requests with a closer deadline
+                    self._changed.wait(delay)
+                    continue
+            self.sample(active)
+            time.sleep(self.interval)
+
+    def sample(self, active: List[Tuple[Key, int, float]]) -> None:
+        frames = sys._current_frames()  # pylint: disable=protected-access
+        now = time.perf_counter()
+        samples = []
+        for key, thread_id, deadline in active:
+            frame = frames.get(thread_id)
+            if now >= deadline and frame is not None:
+                samples.append((key, fold(frame)))
+        with self._lock:
+            for key, stack in samples:
+                self.stacks.setdefault(key, Counter())[stack] += 1
+
+    def add_profile(self, key: Key, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if key in self.profiles:
+                self.profiles[key].add(profile)
+            else:
+                self.profiles[key] = pstats.Stats(profile)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.profiles.clear()
+
+    def _snapshot(self) -> Tuple[Dict[Key, Counter], Dict[Key, pstats.Stats]]:
+        # the sampling thread may add stacks while they are iterated over
+        with self._lock:
+            stacks = {key: Counter(counter) for key, counter in self.stacks.items()}
+            return stacks, dict(self.profiles)
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Returns the most frequent stacks and functions for every endpoint.
+
+        Args:
+            limit: how many stacks and functions to show per endpoint.
+        """
+        all_stacks, profiles = self._snapshot()
+        output = []
+        for (method, template), stacks in sorted(all_stacks.items()):
+            total = sum(stacks.values())
+            output.append(f"{method} {template}: {total} samples")
+            for stack, count in stacks.most_common(limit):
+                output.append(f"  {count:>6}  {stack.rsplit(';', 1)[-1]}")
+        for (method, template), stats in sorted(profiles.items()):
+            stream = io.StringIO()
+            stats.stream = stream  # type: ignore
+            stats.sort_stats("cumulative").print_stats(limit)
+            output.append(f"{method} {template}: profile")
+            output.append(stream.getvalue().strip("\n"))
+        return "\n".join(output)
+
+    def dump(self, directory: str) -> None:
+        """
+        Saves collected profiles into a directory.
+
+        Sampled stacks are saved in collapsed format as ``stacks.folded``,
+        which is understood by most flame graph tools. Profiles are saved
+        as ``<method>_<template>.prof`` and can be loaded with
+        :py:class:`pstats.Stats`.
+        """
+        all_stacks, profiles = self._snapshot()
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "stacks.folded"), "w") as f:
+            for (method, template), stacks in sorted(all_stacks.items()):
+                for stack, count in stacks.items():
+                    f.write(f"{method} {template};{stack} {count}\n")
+        for (method, template), stats in profiles.items():
+            name = re.sub(r"[^\w.-]+", "_", f"{method}_{template}").strip("_")
+            stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+
+
+def fold(frame: Optional[FrameType]) -> str:
+    """Returns a stack as semicolon-separated frames, from outermost."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        frames.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+PROFILER = Profiler()
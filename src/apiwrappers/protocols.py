@@ -25,7 +25,8 @@ class Driver(Protocol):
     Attributes:
         middleware: list of :ref:`middleware <middleware>` to be run on every request.
         timeout: how many seconds to wait for the server to send data before giving up.
-            If set to ``None`` should wait infinitely.
+            If set to ``None`` should wait infinitely. Use :py:class:`Timeouts`
+            to set timeouts for each phase of a request separately.
         verify: Either a boolean, in which case it controls whether to verify the
             server's TLS certificate, or a string, in which case it must be a path
             to a CA bundle to use.
@@ -48,8 +49,9 @@ class Driver(Protocol):
         Args:
             request: a request object with data to send to server.
             timeout: how many seconds to wait for the server to send data before
-                giving up. If set to ``None`` waits infinitely. If provided, will take
-                precedence over the :py:attr:`Driver.timeout`.
+                giving up. If set to ``None`` waits infinitely. Can be set per phase
+                with :py:class:`Timeouts`. If provided, will take precedence over
+                the :py:attr:`Driver.timeout`.
 
         Returns: response from the server.
 
@@ -69,7 +71,8 @@ class AsyncDriver(Protocol):
     Attributes:
         middleware: list of :ref:`middleware <middleware>` to be run on every request.
         timeout: how many seconds to wait for the server to send data before giving up.
-            If set to ``None`` should wait infinitely.
+            If set to ``None`` should wait infinitely. Use :py:class:`Timeouts`
+            to set timeouts for each phase of a request separately.
         verify: Either a boolean, in which case it controls whether to verify the
             server's TLS certificate, or a string, in which case it must be a path
             to a CA bundle to use.
@@ -92,8 +95,9 @@ class AsyncDriver(Protocol):
         Args:
             request: a request object with data to send to server.
             timeout: how many seconds to wait for the server to send data before
-                giving up. If set to ``None`` waits infinitely. If provided, will take
-                precedence over the :py:attr:`AsyncDriver.timeout`.
+                giving up. If set to ``None`` waits infinitely. Can be set per phase
+                with :py:class:`Timeouts`. If provided, will take precedence over
+                the :py:attr:`AsyncDriver.timeout`.
 
         Returns: response from the server.
 
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import urllib.parse
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from apiwrappers import encoders
+from apiwrappers.compat import Protocol
+from apiwrappers.entities import Request
+
+Clock = Callable[[], datetime]
+
+
+class Signer(Protocol):
+    def sign(self, request: Request) -> Dict[str, str]:
+        """
+        Returns headers to add to the request to make it signed.
+
+        Request body is already encoded by the time signer is called, so it is
+        safe to hash it.
+        """
+        ...
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def payload_hash(request: Request, algorithm: str = "sha256") -> str:
+    """
+    Returns hex digest of the request body.
+
+    Streaming bodies are hashed incrementally, chunk by chunk, and rewound
+    afterwards, so they are never fully loaded into memory.
+    """
+    body, _ = encoders.encode_body(request)
+    digest = hashlib.new(algorithm)
+    for chunk in encoders.iter_body(body):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def canonical_uri(request: Request, double_encode: bool = False) -> str:
+    """
+    Returns request path URI-encoded the way it is sent over the wire.
+
+    With ``double_encode``, the path is encoded once more, as AWS Signature
+    Version 4 requires for every service except S3.
+    """
+    path = urllib.parse.urlsplit(str(request.url)).path or "/"
+    # escapes that are already in the path are kept as they are
+    path = urllib.parse.quote(path, safe="/~%")
+    if double_encode:
+        return urllib.parse.quote(path, safe="/~")
+    return path
+
+
+def canonical_query_string(request: Request) -> str:
+    query = urllib.parse.urlsplit(str(request.url)).query
+    params: List[Tuple[str, str]] = urllib.parse.parse_qsl(
+        query, keep_blank_values=True
+    )
+    for key, values in request.query_params.items():
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = [values]
+        params.extend((key, value) for value in values)
+    return "&".join(f"{quote(key)}={quote(value)}" for key, value in sorted(params))
+
+
+def quote(value: str) -> str:
+    return urllib.parse.quote(value, safe="-_.~")
+
+
+def canonical_headers(request: Request, names: Iterable[str]) -> Tuple[str, str]:
+    """
+    Returns canonical headers and signed headers for the given header names.
+
+    Host header is taken from the request URL, if not set explicitly.
+    """
+    headers = {key.lower(): value for key, value in request.headers.items()}
+    headers.setdefault("host", host(request))
+    signed = sorted({name.lower() for name in names} & headers.keys())
+    canonical = "".join(
+        f"{name}:{' '.join(headers[name].split())}\n" for name in signed
+    )
+    return canonical, ";".join(signed)
+
+
+def host(request: Request) -> str:
+    parts = urllib.parse.urlsplit(str(request.url))
+    default_port = {"http": 80, "https": 443}.get(parts.scheme)
+    if parts.port is None or parts.port == default_port:
+        return parts.hostname or ""
+    return f"{parts.hostname}:{parts.port}"
+
+
+def canonical_request(
+    request: Request,
+    signed_headers: Iterable[str],
+    content_hash: str,
+    double_encode: bool = False,
+) -> Tuple[str, str]:
+    """
+    Returns canonical representation of the request and its signed headers.
+
+    The format follows AWS Signature Version 4, which is widely used
+    for HMAC-signed requests.
+    """
+    headers, signed = canonical_headers(request, signed_headers)
+    canonical = "\n".join(
+        [
+            request.method.value,
+            canonical_uri(request, double_encode),
+            canonical_query_string(request),
+            headers,
+            signed,
+            content_hash,
+        ]
+    )
+    return canonical, signed
+
+
+def hmac_digest(key: bytes, msg: str, algorithm: str = "sha256") -> bytes:
+    return hmac.new(key, msg.encode(), algorithm).digest()
+
+
+class HmacSigner:
+    """
+    Signs requests with a shared secret key.
+
+    Adds the following headers to each request:
+        * ``X-Date`` - time of signing in ``YYYYMMDDTHHMMSSZ`` format.
+        * ``X-Content-SHA256`` - hex digest of the request body.
+        * ``Authorization`` - ``HMAC-SHA256 KeyId=..., SignedHeaders=...,
+          Signature=...``.
+
+    Args:
+        key_id: an identifier of the key, so server can find the secret.
+        secret: a secret key to sign requests with.
+        headers: names of the headers to sign, if present in the request.
+        clock: a callable returning current time in UTC.
+    """
+
+    algorithm = "sha256"
+
+    def __init__(
+        self,
+        key_id: str,
+        secret: str,
+        headers: Iterable[str] = ("host", "content-type", "x-content-sha256", "x-date"),
+        clock: Clock = utcnow,
+    ):
+        self.key_id = key_id
+        self.secret = secret
+        self.headers = tuple(headers)
+        self.clock = clock
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} '{self.key_id}'>"
+
+    def sign(self, request: Request) -> Dict[str, str]:
+        timestamp = self.clock().strftime("%Y%m%dT%H%M%SZ")
+        content_hash = payload_hash(request, self.algorithm)
+        request.headers.update({"X-Date": timestamp, "X-Content-SHA256": content_hash})
+        canonical, signed_headers = canonical_request(
+            request, self.headers, content_hash
+        )
+        string_to_sign = "\n".join(
+            [
+                f"HMAC-{self.algorithm.upper()}",
+                timestamp,
+                hashlib.new(self.algorithm, canonical.encode()).hexdigest(),
+            ]
+        )
+        signature = hmac_digest(self.secret.encode(), string_to_sign, self.algorithm)
+        return {
+            "X-Date": timestamp,
+            "X-Content-SHA256": content_hash,
+            "Authorization": (
+                f"HMAC-{self.algorithm.upper()} "
+                f"KeyId={self.key_id}, "
+                f"SignedHeaders={signed_headers}, "
+                f"Signature={signature.hex()}"
+            ),
+        }
+
+
+class SigV4Signer:
+    """
+    Signs requests with AWS Signature Version 4.
+
+    Derived signing keys are cached per day, region and service,
+    so only one HMAC is computed per request after the first one.
+
+    Args:
+        access_key: access key ID.
+        secret_key: secret access key.
+        region: region name, e.g. ``us-east-1``.
+        service: service name, e.g. ``execute-api``.
+        session_token: security token for temporary credentials.
+        sign_content_hash: whether to send and sign ``X-Amz-Content-SHA256``
+            header. Required by some services, e.g. S3.
+        double_encode: whether to URI-encode request path twice. Defaults to
+            ``True`` for all services, but S3.
+        clock: a callable returning current time in UTC.
+    """
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        service: str,
+        session_token: Optional[str] = None,
+        sign_content_hash: bool = True,
+        double_encode: Optional[bool] = None,
+        clock: Clock = utcnow,
+    ):
+        # pylint: disable=too-many-arguments
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.service = service
+        self.session_token = session_token
+        self.sign_content_hash = sign_content_hash
+        if double_encode is None:
+            double_encode = service != "s3"
+        self.double_encode = double_encode
+        self.clock = clock
+        self._signing_keys: Dict[Tuple[str, str, str], bytes] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} "
+            f"'{self.access_key}' {self.region}/{self.service}>"
+        )
+
+    def signing_key(self, date: str, region: str, service: str) -> bytes:
+        try:
+            return self._signing_keys[(date, region, service)]
+        except KeyError:
+            pass
+        key = hmac_digest(f"AWS4{self.secret_key}".encode(), date)
+        key = hmac_digest(key, region)
+        key = hmac_digest(key, service)
+        key = hmac_digest(key, "aws4_request")
+        # keys for previous days are never used again
+        self._signing_keys = {
+            params: value
+            for params, value in self._signing_keys.items()
+            if params[0] == date
+        }
+        self._signing_keys[(date, region, service)] = key
+        return key
+
+    def sign(self, request: Request) -> Dict[str, str]:
+        now = self.clock()
+        timestamp, date = now.strftime("%Y%m%dT%H%M%SZ"), now.strftime("%Y%m%d")
+        content_hash = payload_hash(request)
+
+        headers = {"X-Amz-Date": timestamp}
+        if self.sign_content_hash:
+            headers["X-Amz-Content-SHA256"] = content_hash
+        if self.session_token is not None:
+            headers["X-Amz-Security-Token"] = self.session_token
+        request.headers.update(headers)
+
+        names = [key for key in request.headers if key.lower().startswith("x-amz-")]
+        names += ["host", "content-type"]
+        canonical, signed_headers = canonical_request(
+            request, names, content_hash, self.double_encode
+        )
+        scope = f"{date}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                timestamp,
+                scope,
+                hashlib.sha256(canonical.encode()).hexdigest(),
+            ]
+        )
+        key = self.signing_key(date, self.region, self.service)
+        signature = hmac_digest(key, string_to_sign).hex()
+        headers["Authorization"] = (
+            f"AWS4-HMAC-SHA256 "
+            f"Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, "
+            f"Signature={signature}"
+        )
+        return headers
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import ssl
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import timedelta
 from typing import (
     Any,
     Dict,
@@ -9,12 +13,15 @@ from typing import (
     Optional,
     Tuple,
     TypeVar,
+    Union,
 )
 
-from apiwrappers import utils
+from apiwrappers import exceptions, utils
 
 VT = TypeVar("VT")
 
+Seconds = Union[int, float, None, timedelta]
+
 
 class NoValue:
     __slots__: Tuple[str, ...] = tuple()
@@ -110,3 +117,242 @@ class Url:
                 and self.replacements == other.replacements
             )
         return NotImplemented
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    """
+    Fine-grained timeouts for different phases of a request.
+
+    Any of the values can be either a number of seconds, a ``timedelta`` or
+    ``None`` to wait infinitely. Time deltas are converted to seconds.
+
+    Args:
+        connect: how long to wait for a connection to be established,
+            including TLS handshake.
+        read: how long to wait for the next chunk of data from the server.
+            This is not a time limit on the entire response download.
+        write: how long to wait for a chunk of request data to be sent.
+        pool: how long to wait for a free connection from a connection pool.
+        total: how long the whole request may take, including reading the
+            response body.
+
+    Usage::
+
+        >>> from apiwrappers import Timeouts, make_driver
+        >>> make_driver("requests", timeout=Timeouts(connect=1, read=10))
+        RequestsDriver(Authentication, timeout=Timeouts(connect=1, read=10, ...
+    """
+
+    connect: Optional[float] = None
+    read: Optional[float] = None
+    write: Optional[float] = None
+    pool: Optional[float] = None
+    total: Optional[float] = None
+
+    def __init__(
+        self,
+        connect: Seconds = None,
+        read: Seconds = None,
+        write: Seconds = None,
+        pool: Seconds = None,
+        total: Seconds = None,
+    ):
+        # pylint: disable=too-many-arguments
+        values = (connect, read, write, pool, total)
+        for field, value in zip(fields(self), values):
+            if isinstance(value, timedelta):
+                value = value.total_seconds()
+            object.__setattr__(self, field.name, value)
+
+
+class Deadline:
+    """
+    A point in time by which a request should be completed.
+
+    Deadline is created once per :py:meth:`Driver.fetch` call and is passed down
+    through middleware as a ``timeout``. That way authentication sub-requests and
+    retries share the same budget, and every next attempt gets only the time
+    that is left.
+
+    Args:
+        timeout: either total number of seconds or :py:class:`Timeouts` with
+            ``total`` set.
+
+    Usage::
+
+        >>> from apiwrappers import Deadline, fetch
+        >>> fetch(driver, request, timeout=Deadline(5))
+    """
+
+    __slots__ = ("timeouts", "expires_at")
+
+    def __init__(self, timeout: Union[Seconds, Timeouts]):
+        if not isinstance(timeout, Timeouts):
+            timeout = Timeouts(total=timeout)
+        if timeout.total is None:
+            raise ValueError("Deadline requires `total` timeout to be set")
+        self.timeouts = timeout
+        self.expires_at = time.monotonic() + timeout.total
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(remaining={self.remaining():.3f})"
+
+    def remaining(self) -> float:
+        """Returns number of seconds left, but never less than zero."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def timeout(self) -> Timeouts:
+        """
+        Returns timeouts for the next attempt with total budget set to the
+        time that is left.
+
+        Raises:
+            Timeout: if deadline is exceeded.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise exceptions.Timeout("Deadline exceeded")
+        return replace(self.timeouts, total=remaining)
+
+
+@dataclass(frozen=True)
+class Timings:
+    """
+    Time spent on each phase of a request, in seconds.
+
+    Phases that didn't happen, e.g. connecting when a connection is reused,
+    or that a driver can't measure, are ``None``.
+
+    Args:
+        dns: resolving host name.
+        connect: establishing a connection, including DNS lookup and TLS
+            handshake.
+        tls: TLS handshake.
+        ttfb: time to first byte, from the start of the request till response
+            headers are received.
+        download: reading response body.
+        total: the whole request.
+    """
+
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    total: Optional[float] = None
+
+
+class TimingsRecorder:
+    """
+    Collects timestamps of request phases.
+
+    Drivers mark phases with the following events: ``dns_start``, ``dns_end``,
+    ``connect_start``, ``tls_start``, ``connect_end``, ``headers`` and ``body``.
+    If an event happens several times, e.g. on redirects, the last one wins.
+    """
+
+    __slots__ = ("marks",)
+
+    def __init__(self) -> None:
+        self.marks: Dict[str, float] = {"start": time.perf_counter()}
+
+    def mark(self, event: str) -> None:
+        self.marks[event] = time.perf_counter()
+
+    def elapsed(self, start: str, end: str) -> Optional[float]:
+        try:
+            return self.marks[end] - self.marks[start]
+        except KeyError:
+            return None
+
+    def timings(self) -> Timings:
+        return Timings(
+            dns=self.elapsed("dns_start", "dns_end"),
+            connect=self.elapsed("connect_start", "connect_end"),
+            tls=self.elapsed("tls_start", "connect_end"),
+            ttfb=self.elapsed("start", "headers"),
+            download=self.elapsed("headers", "body"),
+            total=self.elapsed("start", "body"),
+        )
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    A snapshot of pooled connections to a single host.
+
+    Args:
+        open: connections currently open, both idle and in use.
+        idle: open connections waiting in the pool to be reused.
+        in_use: connections currently acquired by requests.
+        created: new connections established so far.
+        reused: requests served with a connection from the pool so far.
+        evicted: idle connections closed by the pool so far, e.g. because
+            the pool is full or connection is expired.
+        wait_time: total time spent waiting for a connection from the pool,
+            in seconds, excluding establishing new connections.
+        tls_handshakes: full TLS handshakes made by new connections so far.
+        tls_resumed: new connections that resumed a TLS session of a previous
+            connection so far, skipping a full handshake.
+    """
+
+    open: int = 0
+    idle: int = 0
+    in_use: int = 0
+    created: int = 0
+    reused: int = 0
+    evicted: int = 0
+    wait_time: float = 0.0
+    tls_handshakes: int = 0
+    tls_resumed: int = 0
+
+
+class PoolCounters:
+    """
+    Running counters of a connection pool.
+
+    Counters are updated without locking, so under heavy concurrency they are
+    approximate, which is fine for monitoring.
+    """
+
+    __slots__ = (
+        "in_use",
+        "created",
+        "reused",
+        "evicted",
+        "wait_time",
+        "tls_handshakes",
+        "tls_resumed",
+    )
+
+    def __init__(self) -> None:
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self.wait_time = 0.0
+        self.tls_handshakes = 0
+        self.tls_resumed = 0
+
+    def handshake(self, ssl_object: Union[ssl.SSLSocket, ssl.SSLObject, None]) -> None:
+        """Counts TLS handshake of a new connection, if it uses TLS."""
+        if ssl_object is None:
+            return
+        if ssl_object.session_reused:
+            self.tls_resumed += 1
+        else:
+            self.tls_handshakes += 1
+
+    def snapshot(self, idle: int) -> PoolStats:
+        return PoolStats(
+            open=idle + self.in_use,
+            idle=idle,
+            in_use=self.in_use,
+            created=self.created,
+            reused=self.reused,
+            evicted=self.evicted,
+            wait_time=self.wait_time,
+            tls_handshakes=self.tls_handshakes,
+            tls_resumed=self.tls_resumed,
+        )
@@ -0,0 +1,155 @@
+import runpy
+import sys
+from collections import Counter
+from typing import Optional
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Method, Request, Response, bench
+
+from . import factories
+
+
+class Wrapper:
+    def __init__(self, host: Optional[str], driver):
+        self.host = host
+        self.driver = driver
+
+    def get(self, id: int = 0) -> Response:  # pylint: disable=redefined-builtin
+        return self.driver.fetch(Request(Method.GET, f"{self.host}/{id}"))
+
+
+def test_report() -> None:
+    report = bench.Report(latencies=[0.001, 0.003, 0.002], elapsed=2, cpu_time=0.3)
+    report.errors["Timeout"] += 1
+    assert report.throughput == 1.5
+    assert report.cpu_per_call == pytest.approx(0.1)
+    assert report.percentile(50) == 0.002
+    assert report.percentile(100) == 0.003
+    assert report.format() == "\n".join(
+        [
+            "Calls:          3 in 2.00s",
+            "Throughput:     1.5 calls/s",
+            "CPU per call:   100.000 ms",
+            "Latency, ms:    p50=2.00  p90=3.00  p99=3.00  max=3.00",
+            "Errors:         1",
+            "    Timeout: 1",
+        ]
+    )
+
+
+def test_empty_report() -> None:
+    report = bench.Report()
+    assert report.throughput == 0
+    assert report.cpu_per_call == 0
+    assert report.percentile(99) == 0
+    assert "Calls:          0 in 0.00s" in report.format()
+
+
+def test_report_records_errors() -> None:
+    report = bench.Report()
+    report.record(TimeoutError(), scheduled=0)
+    report.record(factories.make_response(b"", status_code=503), scheduled=0)
+    report.record(factories.make_response(b"", status_code=200), scheduled=0)
+    report.record(None, scheduled=0)
+    assert len(report.latencies) == 4
+    assert report.errors == Counter({"TimeoutError": 1, "HTTP 503": 1})
+
+
+def test_schedule_with_rate() -> None:
+    schedule = bench.Schedule(duration=1, rate=4)
+    times = [schedule.next() for _ in range(5)]
+    assert [t - schedule.start for t in times[:4]] == [0, 0.25, 0.5, 0.75]
+    assert times[4] is None
+
+
+def test_run() -> None:
+    call = mock.Mock(side_effect=[ValueError(), *[None] * 1000])
+    report = bench.run(call, duration=0.1, concurrency=2, rate=50)
+    assert call.call_count == len(report.latencies) == 5
+    assert report.errors == Counter({"ValueError": 1})
+    assert report.elapsed >= 0.08
+
+
+def test_run_as_fast_as_possible() -> None:
+    report = bench.run(lambda: None, duration=0.05, concurrency=2)
+    assert len(report.latencies) > 5
+    assert not report.errors
+
+
+@pytest.mark.asyncio
+async def test_run_async() -> None:
+    calls = []
+
+    async def call() -> None:
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError()
+
+    report = await bench.run_async(call, duration=0.1, concurrency=2, rate=50)
+    assert len(calls) == len(report.latencies) == 5
+    assert report.errors == Counter({"ValueError": 1})
+
+
+@pytest.mark.asyncio
+async def test_run_async_as_fast_as_possible() -> None:
+    calls = []
+
+    async def call() -> None:
+        calls.append(None)
+
+    report = await bench.run_async(call, duration=0.05, concurrency=2)
+    assert len(calls) == len(report.latencies) > 5
+
+
+def test_make_call_with_request() -> None:
+    driver = factories.make_driver(factories.make_response(b""))
+    call = bench.make_call("POST  https://example.org/users", driver)
+    response = call()
+    assert response.request.method == Method.POST
+    assert response.request.url == "https://example.org/users"
+
+
+def test_make_call_with_wrapper_method() -> None:
+    driver = factories.make_driver(factories.make_response(b""))
+    target = f"{__name__}.Wrapper.get"
+    call = bench.make_call(target, driver, "https://example.org", {"id": 1})
+    assert call().request.url == "https://example.org/1"
+
+
+def test_make_call_with_unknown_module() -> None:
+    driver = factories.make_driver(factories.make_response(b""))
+    with pytest.raises(ImportError):
+        bench.make_call("unknown.Wrapper.get", driver)
+
+
+def test_parse_kwargs() -> None:
+    kwargs = bench.parse_kwargs(["id=1", "name=John", "tags=[1, 2]", "flag="])
+    assert kwargs == {"id": 1, "name": "John", "tags": [1, 2], "flag": ""}
+
+
+@pytest.mark.requests
+def test_main_with_requests(httpbin, capsys) -> None:
+    target = f"{__name__}.Wrapper.get"
+    argv = [target, "--host", f"{httpbin.url}/status", "--arg", "id=500"]
+    report = bench.main([*argv, "--duration", "0.2", "--rps", "10"])
+    assert report.errors == Counter({"HTTP 500": len(report.latencies)})
+    assert "HTTP 500" in capsys.readouterr().out
+
+
+@pytest.mark.aiohttp
+def test_main_with_aiohttp(httpbin) -> None:
+    argv = [f"GET {httpbin.url}/get", "--driver", "aiohttp", "--duration", "0.2"]
+    report = bench.main(argv)
+    assert report.latencies
+    assert not report.errors
+
+
+@pytest.mark.requests
+@pytest.mark.filterwarnings("ignore:'apiwrappers.bench' found in sys.modules")
+def test_main_as_module(httpbin, capsys) -> None:
+    argv = ["bench", f"GET {httpbin.url}/get", "--duration", "0.1"]
+    with mock.patch.object(sys, "argv", argv):
+        runpy.run_module("apiwrappers.bench", run_name="__main__")
+    assert "Throughput" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+import socket
+from unittest import mock
+
+from apiwrappers import DNSCache
+
+
+def test_representation():
+    dns = DNSCache(ttl=60, overrides={"example.org": "127.0.0.1"})
+    assert repr(dns) == "DNSCache(ttl=60, overrides={'example.org': ['127.0.0.1']})"
+
+
+def test_overrides():
+    dns = DNSCache(overrides={"a.example.org": "127.0.0.1", "b.example.org": ["::1"]})
+    assert dns.get("a.example.org") == ["127.0.0.1"]
+    assert dns.get("b.example.org") == ["::1"]
+    assert dns.get("c.example.org") is None
+
+
+def test_ip_address_is_not_resolved():
+    dns = DNSCache()
+    assert dns.get("127.0.0.1") == ["127.0.0.1"]
+    assert dns.get("::1") == ["::1"]
+
+
+def test_addresses_expire():
+    dns = DNSCache(ttl=10)
+    with mock.patch("time.monotonic", return_value=100):
+        dns.set("example.org", ["127.0.0.1"])
+    with mock.patch("time.monotonic", return_value=109):
+        assert dns.get("example.org") == ["127.0.0.1"]
+    with mock.patch("time.monotonic", return_value=110):
+        assert dns.get("example.org") is None
+        assert dns.get("example.org") is None
+
+
+def test_addresses_are_kept_without_ttl():
+    dns = DNSCache(ttl=None)
+    dns.set("example.org", ["127.0.0.1"])
+    with mock.patch("time.monotonic", return_value=10**9):
+        assert dns.get("example.org") == ["127.0.0.1"]
+    dns.clear()
+    assert dns.get("example.org") is None
+
+
+def test_resolve():
+    infos = [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 80)),
+        (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("::2", 80, 0, 0)),
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 80)),
+    ]
+    dns = DNSCache()
+    with mock.patch("socket.getaddrinfo", return_value=infos) as getaddrinfo:
+        assert dns.resolve("example.org", 80) == ["10.0.0.1", "::2"]
+        assert dns.resolve("example.org", 80) == ["10.0.0.1", "::2"]
+    getaddrinfo.assert_called_once_with("example.org", 80, type=socket.SOCK_STREAM)
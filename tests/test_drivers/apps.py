@@ -0,0 +1,77 @@
+import asyncio
+import json
+from urllib.parse import parse_qsl
+
+
+def echo(method, path, query, headers, body):
+    return json.dumps(
+        {
+            "method": method,
+            "path": path,
+            "query": parse_qsl(query),
+            "headers": headers,
+            "body": body.decode(),
+        }
+    ).encode()
+
+
+RESPONSE_HEADERS = [
+    ("Content-Type", "application/json; charset=latin-1"),
+    ("Set-Cookie", "a=1"),
+    ("Set-Cookie", "b=2; Path=/"),
+]
+
+
+def wsgi_app(environ, start_response):
+    headers = {
+        key[5:].replace("_", "-").lower(): value
+        for key, value in environ.items()
+        if key.startswith("HTTP_")
+    }
+    for key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+        if key in environ:
+            headers[key.replace("_", "-").lower()] = environ[key]
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length)
+    start_response("201 Created", RESPONSE_HEADERS)
+    yield echo(
+        environ["REQUEST_METHOD"],
+        environ["PATH_INFO"],
+        environ["QUERY_STRING"],
+        headers,
+        body,
+    )
+
+
+async def asgi_app(scope, receive, send):
+    message = await receive()
+    headers = {name.decode(): value.decode() for name, value in scope["headers"]}
+    content = echo(
+        scope["method"],
+        scope["path"],
+        scope["query_string"].decode(),
+        headers,
+        message["body"],
+    )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 201,
+            "headers": [(k.encode(), v.encode()) for k, v in RESPONSE_HEADERS],
+        }
+    )
+    await send({"type": "http.response.body", "body": content[:10], "more_body": True})
+    await send({"type": "http.response.body", "body": content[10:]})
+
+
+async def streaming_asgi_app(scope, receive, send):
+    # pylint: disable=unused-argument
+    await receive()
+    disconnected = asyncio.ensure_future(receive())
+    await send({"type": "http.response.start", "status": 200})
+    for chunk in (b"a", b"b", b"c"):
+        await asyncio.sleep(0)
+        assert not disconnected.done()
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body"})
+    assert (await disconnected) == {"type": "http.disconnect"}
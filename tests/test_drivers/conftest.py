@@ -1,5 +1,15 @@
 # pylint: disable=import-outside-toplevel
 
+import contextlib
+import http.server
+import json
+import os
+import socket
+import socketserver
+import ssl
+import tempfile
+import threading
+
 import pytest
 
 
@@ -11,3 +21,107 @@ def httpbin_ca_bundle():
     from pytest_httpbin import certs
 
     return certs.where()
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TCPHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+
+
+class TLSHTTPServer(TCPHTTPServer):
+    def __init__(self, *args, **kwargs):
+        from pytest_httpbin import certs
+
+        super().__init__(*args, **kwargs)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        cert_dir = os.path.dirname(certs.where())
+        self.context.load_cert_chain(
+            os.path.join(cert_dir, "server.pem"),
+            os.path.join(cert_dir, "server.key"),
+        )
+
+    def get_request(self):
+        sock, address = super().get_request()
+        # handshake is done by a thread serving the connection
+        sock = self.context.wrap_socket(
+            sock, server_side=True, do_handshake_on_connect=False
+        )
+        return sock, address
+
+    def handle_error(self, request, client_address):
+        # clients failing to verify the certificate are expected
+        pass
+
+
+class EchoHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps({"path": self.path, "host": self.headers["Host"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.fixture
+def unix_socket():
+    """Returns a path to a Unix socket of a server echoing request path and host."""
+    # tmp_path may be longer than a Unix socket path is allowed to be
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "server.sock")
+    try:
+        with serve(UnixHTTPServer(path, EchoHandler)):
+            yield path
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+
+@pytest.fixture
+def echo_server():
+    """
+    Returns a URL of a server echoing request path and host.
+
+    Unlike httpbin, the server handles connections concurrently, so idle
+    keep-alive connections don't block it.
+    """
+    server = TCPHTTPServer(("127.0.0.1", 0), EchoHandler)
+    with serve(server):
+        yield "http://127.0.0.1:{}".format(server.server_address[1])
+
+
+@pytest.fixture
+def echo_server_secure():
+    """The same as ``echo_server``, but over TLS with the httpbin certificate."""
+    server = TLSHTTPServer(("127.0.0.1", 0), EchoHandler)
+    with serve(server):
+        yield "https://127.0.0.1:{}".format(server.server_address[1])
+
+
+@pytest.fixture
+def silent_server():
+    """Returns a URL of a server accepting connections, but never responding."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(16)
+        yield "https://127.0.0.1:{}".format(sock.getsockname()[1])
@@ -47,6 +47,24 @@ class HttpBin:
         request = Request(Method.GET, self.url("/delay/{delay}", delay=delay))
         return self.driver.fetch(request, timeout=timeout)
 
+    def drip(self, duration, numbytes, timeout):
+        """Drips data over a duration."""
+        params = {"duration": str(duration), "numbytes": str(numbytes), "delay": "0"}
+        request = Request(Method.GET, self.url("/drip"), query_params=params)
+        return self.driver.fetch(request, timeout=timeout)
+
+    def range(self, numbytes, duration, timeout):
+        """Streams n random bytes in chunks of 1024 bytes over a duration."""
+        url = self.url("/range/{numbytes}", numbytes=numbytes)
+        params = {"duration": str(duration), "chunk_size": "1024"}
+        request = Request(Method.GET, url, query_params=params)
+        return self.driver.fetch(request, timeout=timeout)
+
+    def redirect(self, times):
+        """Redirects to the same host given number of times."""
+        request = Request(Method.GET, self.url("/redirect/{n}", n=times))
+        return self.driver.fetch(request)
+
     def html(self):
         """Returns a simple HTML document."""
         request = Request(Method.GET, self.url("/html"))
@@ -70,6 +70,26 @@ class HttpBin(Generic[T]):
         self: HttpBin[AsyncDriver], delay: int, timeout: Timeout
     ) -> Awaitable[Response]: ...
     @overload
+    def drip(
+        self: HttpBin[Driver], duration: float, numbytes: int, timeout: Timeout
+    ) -> Response: ...
+    @overload
+    def drip(
+        self: HttpBin[AsyncDriver], duration: float, numbytes: int, timeout: Timeout
+    ) -> Awaitable[Response]: ...
+    @overload
+    def range(
+        self: HttpBin[Driver], numbytes: int, duration: float, timeout: Timeout
+    ) -> Response: ...
+    @overload
+    def range(
+        self: HttpBin[AsyncDriver], numbytes: int, duration: float, timeout: Timeout
+    ) -> Awaitable[Response]: ...
+    @overload
+    def redirect(self: HttpBin[Driver], times: int) -> Response: ...
+    @overload
+    def redirect(self: HttpBin[AsyncDriver], times: int) -> Awaitable[Response]: ...
+    @overload
     def html(self: HttpBin[Driver]) -> Response: ...
     @overload
     def html(self: HttpBin[AsyncDriver]) -> Awaitable[Response]: ...
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from apiwrappers import Deadline, Method, Request, Timeouts, exceptions
+from apiwrappers.drivers.asgi import ASGIDriver
+
+from .apps import asgi_app, streaming_asgi_app
+from .middleware import RequestMiddleware, ResponseMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+
+async def slow_app(scope, receive, send):
+    # pylint: disable=unused-argument
+    await asyncio.sleep(1)
+
+
+async def test_representation() -> None:
+    driver = ASGIDriver(app=asgi_app)
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == f"ASGIDriver(app={asgi_app!r}, timeout=None)"
+
+
+async def test_representation_with_middleware() -> None:
+    driver = ASGIDriver(RequestMiddleware, ResponseMiddleware, app=asgi_app, timeout=1)
+    assert repr(driver) == (
+        "ASGIDriver("
+        "Authentication, RequestMiddleware, ResponseMiddleware, "
+        f"app={asgi_app!r}, timeout=1"
+        ")"
+    )
+
+
+async def test_string_representation() -> None:
+    assert str(ASGIDriver(app=asgi_app)) == "<AsyncDriver 'asgi'>"
+
+
+async def test_fetch() -> None:
+    driver = ASGIDriver(app=asgi_app)
+    request = Request(
+        Method.POST,
+        "https://example.org/users/jane%20doe",
+        query_params=[("a", "1"), ("a", "2")],
+        cookies={"session": "abc"},
+        data={"key": "value"},
+    )
+    response = await driver.fetch(request)
+    assert response.request is request
+    assert response.status_code == 201
+    assert response.url == "https://example.org/users/jane%20doe?a=1&a=2"
+    assert response.cookies["a"].value == "1"
+    assert response.encoding == "latin-1"
+    assert response.json() == {
+        "method": "POST",
+        "path": "/users/jane doe",
+        "query": [["a", "1"], ["a", "2"]],
+        "headers": {
+            "host": "example.org",
+            "cookie": "session=abc",
+            "content-type": "application/x-www-form-urlencoded",
+            "content-length": "9",
+        },
+        "body": "key=value",
+    }
+
+
+async def test_fetch_scope() -> None:
+    scopes = []
+
+    async def app(scope, receive, send):
+        scopes.append(scope)
+        await asgi_app(scope, receive, send)
+
+    await ASGIDriver(app=app).fetch(Request(Method.GET, "http://localhost:8000"))
+    assert scopes[0]["server"] == ("localhost", 8000)
+    assert scopes[0]["scheme"] == "http"
+    assert scopes[0]["raw_path"] == b"/"
+
+
+async def test_fetch_with_middleware() -> None:
+    driver = ASGIDriver(RequestMiddleware, ResponseMiddleware, app=asgi_app)
+    response = await driver.fetch(Request(Method.GET, "http://localhost"))
+    assert response.json()["headers"]["request"] == "middleware"
+    assert response.headers["Response"] == "middleware"
+
+
+async def test_fetch_streaming_response() -> None:
+    driver = ASGIDriver(app=streaming_asgi_app)
+    response = await driver.fetch(Request(Method.GET, "http://localhost"))
+    assert response.content == b"abc"
+    assert response.headers == {}
+    assert response.encoding == "utf-8"
+
+
+async def test_fetch_without_response() -> None:
+    async def app(scope, receive, send):
+        # pylint: disable=unused-argument
+        await send({"type": "http.response.trailers"})
+
+    driver = ASGIDriver(app=app)
+    with pytest.raises(exceptions.DriverError) as excinfo:
+        await driver.fetch(Request(Method.GET, "http://localhost"))
+    assert str(excinfo.value) == "ASGI app didn't start a response"
+
+
+@pytest.mark.parametrize(
+    "timeout",
+    [0.01, timedelta(seconds=0.01), Timeouts(total=0.01), Deadline(0.01)],
+)
+async def test_fetch_timeout(timeout) -> None:
+    driver = ASGIDriver(app=slow_app)
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(Request(Method.GET, "http://localhost"), timeout=timeout)
+
+
+async def test_fetch_with_default_timeout() -> None:
+    driver = ASGIDriver(app=slow_app, timeout=0.01)
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(Request(Method.GET, "http://localhost"))
+
+
+async def test_fetch_propagates_app_errors() -> None:
+    async def app(scope, receive, send):
+        raise ZeroDivisionError
+
+    with pytest.raises(ZeroDivisionError):
+        await ASGIDriver(app=app).fetch(Request(Method.GET, "http://localhost"))
@@ -0,0 +1,884 @@
+# pylint: disable=import-outside-toplevel,too-many-lines
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import ssl
+import sys
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, List, Sequence, Type, Union
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Method, Request, Response, exceptions, make_driver
+from apiwrappers.middleware.signing import Signing
+from apiwrappers.protocols import AsyncMiddleware
+from apiwrappers.signing import HmacSigner, payload_hash
+from apiwrappers.structures import CaseInsensitiveDict, Deadline, PoolStats, Timeouts
+
+from .httpbin_client import HttpBin
+from .middleware import RequestMiddleware, ResponseMiddleware
+
+if TYPE_CHECKING:
+    from apiwrappers.drivers.asyncio import AsyncioDriver
+
+pytestmark = [pytest.mark.asyncio_driver]
+
+BASE_DIR = Path(__file__).absolute().parent
+INVALID_CA_BUNDLE_PATH = str(BASE_DIR.joinpath("certs/no-ca-bundle.crt"))
+
+CLIENT_CERT = str(BASE_DIR.joinpath("certs/client.pem"))
+CLIENT_CERT_PAIR = (
+    str(BASE_DIR.joinpath("certs/client.crt")),
+    str(BASE_DIR.joinpath("certs/client.key")),
+)
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+# a reply is either raw response, fragments of it sent with a pause in between,
+# or None to close connection without responding
+Reply = Union[None, bytes, Sequence[bytes]]
+
+
+def asyncio_driver(*middleware: Type[AsyncMiddleware], **kwargs) -> AsyncioDriver:
+    from apiwrappers.drivers.asyncio import AsyncioDriver
+
+    kwargs.setdefault("timeout", 30)
+    return AsyncioDriver(*middleware, **kwargs)
+
+
+@pytest.fixture(name="use_httptools", params=[True, False], ids=["httptools", "python"])
+def use_httptools_fixture(request) -> bool:
+    return request.param
+
+
+class Server:
+    """
+    A server replying to requests with prepared responses in order.
+
+    Connection is closed when there are no more replies, unless it is
+    kept open until a client closes it.
+    """
+
+    def __init__(self, replies: Sequence[Reply], keep_open: bool = False):
+        self.replies = list(replies)
+        self.keep_open = keep_open
+        self.requests: List[bytes] = []
+        self.connections = 0
+        self.url = ""
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while self.replies:
+                self.requests.append(await self.read_request(reader))
+                reply = self.replies.pop(0)
+                if reply is None:
+                    break
+                for fragment in [reply] if isinstance(reply, bytes) else reply:
+                    writer.write(fragment)
+                    await writer.drain()
+                    await asyncio.sleep(0.01)
+            if self.keep_open:
+                await reader.read()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_request(reader: asyncio.StreamReader) -> bytes:
+        head = await reader.readuntil(b"\r\n\r\n")
+        headers = head.decode().lower()
+        if "transfer-encoding: chunked" in headers:
+            body = b""
+            while True:
+                size = int(await reader.readuntil(b"\r\n"), 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    break
+                body += chunk[:-2]
+            return head + body
+        for line in headers.split("\r\n"):
+            if line.startswith("content-length:"):
+                return head + await reader.readexactly(int(line.split(":")[1]))
+        return head
+
+
+@contextlib.asynccontextmanager
+async def serve(*replies: Reply, keep_open: bool = False) -> AsyncIterator[Server]:
+    server = Server(replies, keep_open=keep_open)
+    tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    host, port = tcp_server.sockets[0].getsockname()
+    server.url = f"http://{host}:{port}"
+    try:
+        yield server
+    finally:
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+def get(url: str, **kwargs) -> Request:
+    return Request(Method.GET, url, **kwargs)
+
+
+def subscribe(driver: AsyncioDriver, events: List) -> None:
+    from apiwrappers.hooks import Event
+
+    def callback(event, request, **kwargs):
+        events.append(event)
+
+    for event in Event:
+        driver.hooks.subscribe(event, callback)
+
+
+def test_make_driver() -> None:
+    from apiwrappers.drivers.asyncio import AsyncioDriver
+
+    assert isinstance(make_driver("asyncio"), AsyncioDriver)
+
+
+def test_representation() -> None:
+    driver = asyncio_driver()
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == "AsyncioDriver(timeout=30, verify=True, cert=None)"
+
+
+def test_representation_with_middleware() -> None:
+    driver = asyncio_driver(RequestMiddleware, ResponseMiddleware)
+    assert repr(driver) == (
+        "AsyncioDriver("
+        "Authentication, RequestMiddleware, ResponseMiddleware, "
+        "timeout=30, verify=True, cert=None"
+        ")"
+    )
+
+
+def test_string_representation() -> None:
+    assert str(asyncio_driver()) == "<AsyncDriver 'asyncio'>"
+
+
+def test_load_httptools() -> None:
+    from apiwrappers.drivers.asyncio import load_httptools
+
+    assert load_httptools() is not None
+    with mock.patch.dict(sys.modules, {"httptools": None}):
+        assert load_httptools() is None
+
+
+@pytest.mark.parametrize(
+    ["response", "status_code", "headers", "body", "keep_alive"],
+    [
+        (
+            b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nX-Key: a: b\r\n\r\nhello",
+            200,
+            [("Content-Length", "5"), ("X-Key", "a: b")],
+            b"hello",
+            True,
+        ),
+        (
+            b"HTTP/1.1 201 Created\r\nContent-Length: 0\r\n\r\n",
+            201,
+            [("Content-Length", "0")],
+            b"",
+            True,
+        ),
+        (
+            b"HTTP/1.1 100 Continue\r\n\r\n"
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n",
+            200,
+            [("Transfer-Encoding", "chunked")],
+            b"hello world",
+            True,
+        ),
+        (
+            b"HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n",
+            204,
+            [("Connection", "close")],
+            b"",
+            False,
+        ),
+        (
+            b"HTTP/1.0 200 OK\r\nConnection: keep-alive\r\nContent-Length: 2\r\n\r\nok",
+            200,
+            [("Connection", "keep-alive"), ("Content-Length", "2")],
+            b"ok",
+            True,
+        ),
+    ],
+)
+@pytest.mark.parametrize("fragment_size", [1, 1024])
+def test_parse_response(
+    use_httptools, response, status_code, headers, body, keep_alive, fragment_size
+) -> None:
+    from apiwrappers.drivers.asyncio import HttptoolsParser, ResponseParser
+
+    parser_cls = HttptoolsParser if use_httptools else ResponseParser
+    parser = parser_cls("GET")
+    for i in range(0, len(response), fragment_size):
+        assert not parser.complete
+        parser.feed(response[i : i + fragment_size])  # noqa: E203
+    assert parser.complete
+    assert parser.status_code == status_code
+    assert parser.headers == headers
+    assert b"".join(parser.body) == body
+    assert parser.keep_alive is keep_alive
+
+
+def test_parse_response_until_eof(use_httptools) -> None:
+    from apiwrappers.drivers.asyncio import HttptoolsParser, ResponseParser
+
+    parser = (HttptoolsParser if use_httptools else ResponseParser)("GET")
+    parser.feed(b"HTTP/1.1 200 OK\r\n\r\n")
+    parser.feed(b"hello")
+    parser.feed(b" world")
+    assert not parser.complete
+    parser.feed_eof()
+    assert parser.complete
+    assert b"".join(parser.body) == b"hello world"
+    assert parser.keep_alive is False
+
+
+def test_parse_response_to_head(use_httptools) -> None:
+    from apiwrappers.drivers.asyncio import HttptoolsParser, ResponseParser
+
+    parser = (HttptoolsParser if use_httptools else ResponseParser)("HEAD")
+    parser.feed(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n")
+    assert parser.complete
+    assert parser.body == []
+    assert parser.keep_alive is True
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nx", b"garbage"],
+)
+def test_parse_response_with_unexpected_data(use_httptools, extra) -> None:
+    from apiwrappers.drivers.asyncio import HttptoolsParser, ResponseParser
+
+    parser = (HttptoolsParser if use_httptools else ResponseParser)("GET")
+    parser.feed(OK + extra)
+    assert parser.complete
+    assert parser.headers == [("Content-Length", "2")]
+    assert parser.body == [b"ok"]
+    assert parser.keep_alive is False
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        b"HTTP/2 200 OK\r\n\r\n",
+        b"HTTP/1.1 2000 OK\r\n\r\n",
+        b"HTTP/1.1 abc OK\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nInvalid\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: abc\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nxyz\r\n",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n1\r\nabc",
+    ],
+)
+def test_parse_invalid_response(use_httptools, response) -> None:
+    from apiwrappers.drivers.asyncio import HttptoolsParser, ParseError, ResponseParser
+
+    parser = (HttptoolsParser if use_httptools else ResponseParser)("GET")
+    with pytest.raises(ParseError):
+        parser.feed(response)
+
+
+def test_parse_too_long_head() -> None:
+    from apiwrappers.drivers.asyncio import ParseError, ResponseParser
+
+    parser = ResponseParser("GET")
+    with pytest.raises(ParseError):
+        parser.feed(b"HTTP/1.1 200 OK\r\nX-Long: " + b"x" * 2**16)
+
+
+def test_parse_incomplete_response() -> None:
+    from apiwrappers.drivers.asyncio import ResponseParser
+
+    parser = ResponseParser("GET")
+    parser.feed(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhel")
+    with pytest.raises(ConnectionResetError):
+        parser.feed_eof()
+
+
+def test_base_parser_is_abstract() -> None:
+    from apiwrappers.drivers.asyncio import BaseParser
+
+    with pytest.raises(TypeError):
+        BaseParser("GET")  # type: ignore  # pylint: disable=abstract-class-instantiated
+
+
+def test_pool_evicts_connections_when_full() -> None:
+    from apiwrappers.drivers.asyncio import Pool
+
+    pool = Pool(maxsize=1)
+    conns = [
+        mock.Mock(
+            reusable=True,
+            closed=False,
+            **{"transport.get_extra_info.return_value": None},
+        )
+        for _ in range(2)
+    ]
+    for conn in conns:
+        pool.created(conn)
+    for conn in conns:
+        pool.release(conn)
+    assert pool.acquire() is conns[0]
+    assert pool.stats() == PoolStats(open=1, in_use=1, created=2, reused=1, evicted=1)
+    conns[1].close.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_requests_over_limit_wait_for_connection() -> None:
+    driver = asyncio_driver(limit=1)
+    async with serve(*[[OK[:20], OK[20:]]] * 3) as server:
+        responses = await asyncio.gather(
+            *(driver.fetch(get(server.url)) for _ in range(3))
+        )
+        stats = driver.pool_stats()[server.url]
+        await driver.close()
+    assert [response.content for response in responses] == [b"ok"] * 3
+    assert server.connections == 1
+    assert (stats.created, stats.reused) == (1, 2)
+    assert stats.wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout() -> None:
+    driver = asyncio_driver(limit=1, timeout=Timeouts(pool=0.001))
+    async with serve([OK[:20], OK[20:]]) as server:
+        first, second = await asyncio.gather(
+            *(driver.fetch(get(server.url)) for _ in range(2)),
+            return_exceptions=True,
+        )
+    assert isinstance(first, Response)
+    assert isinstance(second, exceptions.Timeout)
+    assert server.connections == 1
+
+
+def test_expire() -> None:
+    from apiwrappers.drivers.asyncio import expire
+
+    loop = asyncio.new_event_loop()
+    try:
+        waiter = loop.create_future()
+        waiter.set_result(None)
+        expire(waiter)
+        assert waiter.result() is None
+    finally:
+        loop.close()
+
+
+def test_get_timeout() -> None:
+    from apiwrappers.drivers.asyncio import get_timeout
+
+    loop = mock.Mock(time=mock.Mock(return_value=10))
+    assert get_timeout(loop, 1, None) == 1
+    assert get_timeout(loop, None, 15) == 5
+    assert get_timeout(loop, 1, 15) == 1
+    with pytest.raises(asyncio.TimeoutError):
+        get_timeout(loop, 1, 10)
+
+
+@pytest.mark.parametrize(
+    ["headers", "content"],
+    [
+        ([], b"hello"),
+        ([("Content-Encoding", "gzip")], gzip.compress(b"hello")),
+        ([("Content-Encoding", "deflate")], zlib.compress(b"hello")),
+        ([("Content-Encoding", "deflate")], zlib.compress(b"hello")[2:-4]),
+    ],
+)
+def test_decode_content(headers, content) -> None:
+    from apiwrappers.drivers.asyncio import decode_content
+
+    assert decode_content(headers, content) == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_keep_alive(use_httptools) -> None:
+    from apiwrappers.hooks import Event
+
+    events: List = []
+    driver = asyncio_driver(use_httptools=use_httptools)
+    subscribe(driver, events)
+    async with serve(OK, OK) as server:
+        for _ in range(2):
+            response = await driver.fetch(get(server.url))
+            assert response.content == b"ok"
+        assert driver.pool_stats() == {
+            server.url: PoolStats(open=1, idle=1, created=1, reused=1)
+        }
+        await driver.close()
+    assert server.connections == 1
+    assert events == [
+        Event.REQUEST_START,
+        Event.CONNECTION_CREATED,
+        Event.HEADERS_RECEIVED,
+        Event.BODY_DONE,
+        Event.REQUEST_START,
+        Event.CONNECTION_REUSED,
+        Event.HEADERS_RECEIVED,
+        Event.BODY_DONE,
+    ]
+    assert driver.pool_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_fragmented_response(use_httptools) -> None:
+    response = [
+        b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-16\r\n",
+        b"Transfer-Encoding: chunked\r\n\r\n4\r\n",
+        "hi".encode("utf-16-le") + b"\r\n0\r\n\r\n",
+    ]
+    driver = asyncio_driver(use_httptools=use_httptools)
+    async with serve(response) as server:
+        response = await driver.fetch(get(server.url))
+    assert response.text() == "hi"
+    assert response.url == server.url
+
+
+@pytest.mark.asyncio
+async def test_response_until_connection_is_closed(use_httptools) -> None:
+    driver = asyncio_driver(use_httptools=use_httptools)
+    async with serve([b"HTTP/1.0 200 OK\r\n\r\nhello", b" world"]) as server:
+        response = await driver.fetch(get(server.url))
+    assert response.content == b"hello world"
+    assert driver.pool_stats()[server.url] == PoolStats(created=1)
+
+
+@pytest.mark.asyncio
+async def test_compressed_response() -> None:
+    content = gzip.compress(b"hello")
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(content), content)
+    )
+    driver = asyncio_driver()
+    async with serve(response) as server:
+        response = await driver.fetch(get(server.url))
+    assert response.content == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_invalid_compressed_response() -> None:
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: 2\r\n\r\nok"
+    )
+    driver = asyncio_driver()
+    async with serve(response) as server:
+        with pytest.raises(exceptions.DriverError):
+            await driver.fetch(get(server.url))
+
+
+@pytest.mark.asyncio
+async def test_invalid_response(use_httptools) -> None:
+    driver = asyncio_driver(use_httptools=use_httptools)
+    async with serve(b"HTTP/1.1 abc OK\r\n\r\n") as server:
+        with pytest.raises(exceptions.DriverError):
+            await driver.fetch(get(server.url))
+
+
+@pytest.mark.asyncio
+async def test_unexpected_data_on_idle_connection() -> None:
+    driver = asyncio_driver()
+    async with serve([OK, b"garbage"], OK) as server:
+        await driver.fetch(get(server.url))
+        await asyncio.sleep(0.05)
+        assert driver.pool_stats()[server.url].idle == 0
+        await driver.fetch(get(server.url))
+    assert server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_on_closed_idle_connection() -> None:
+    driver = asyncio_driver()
+    async with serve(OK, None, OK) as server:
+        await driver.fetch(get(server.url))
+        response = await driver.fetch(get(server.url))
+    assert response.content == b"ok"
+    assert server.connections == 2
+    assert driver.pool_stats()[server.url] == PoolStats(
+        open=1, idle=1, created=2, reused=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_in_the_middle_of_response() -> None:
+    driver = asyncio_driver()
+    partial = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhe"
+    async with serve(OK, partial) as server:
+        await driver.fetch(get(server.url))
+        with pytest.raises(exceptions.ConnectionFailed):
+            await driver.fetch(get(server.url))
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_redirects() -> None:
+    driver = asyncio_driver()
+    async with serve(
+        b"HTTP/1.1 307 Temporary Redirect\r\nLocation: /a\r\nContent-Length: 0\r\n"
+        b"Set-Cookie: session=1; Path=/\r\n\r\n",
+        b"HTTP/1.1 301 Moved Permanently\r\nLocation: /b\r\nContent-Length: 0\r\n\r\n",
+        OK,
+    ) as server:
+        request = Request(
+            Method.POST, server.url, json={"key": "value"}, cookies={"a": "b"}
+        )
+        response = await driver.fetch(request)
+    assert response.url == f"{server.url}/b"
+    post, redirected_post, redirected_get = server.requests
+    assert post.startswith(b"POST / HTTP/1.1\r\n")
+    assert redirected_post.startswith(b"POST /a HTTP/1.1\r\n")
+    assert redirected_post.endswith(b'\r\n\r\n{"key": "value"}')
+    assert b"Cookie: a=b; session=1\r\n" in redirected_post
+    assert redirected_get.startswith(b"GET /b HTTP/1.1\r\n")
+    assert b"Content-Type" not in redirected_get
+    assert redirected_get.endswith(b"\r\n\r\n")
+
+
+@pytest.mark.asyncio
+async def test_redirect_to_other_host() -> None:
+    driver = asyncio_driver()
+    async with serve(OK) as other, serve(
+        b"HTTP/1.1 303 See Other\r\nLocation: %s/other\r\nContent-Length: 0\r\n\r\n"
+        % other.url.replace("127.0.0.1", "localhost").encode()
+    ) as server:
+        request = Request(
+            Method.POST,
+            server.url,
+            data=b"data",
+            headers={"Authorization": "Bearer token"},
+            cookies={"a": "b"},
+        )
+        response = await driver.fetch(request)
+    assert response.url.startswith("http://localhost:")
+    (redirected,) = other.requests
+    assert redirected.startswith(b"GET /other HTTP/1.1\r\n")
+    assert f"Host: {response.url[7:-6]}\r\n".encode() in redirected
+    assert b"Authorization" not in redirected
+    assert b"Cookie" not in redirected
+
+
+@pytest.mark.asyncio
+async def test_head_is_not_changed_on_redirect() -> None:
+    driver = asyncio_driver()
+    async with serve(
+        b"HTTP/1.1 303 See Other\r\nLocation: /a\r\nContent-Length: 0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n",
+    ) as server:
+        response = await driver.fetch(Request(Method.HEAD, server.url))
+    assert response.content == b""
+    assert server.requests[1].startswith(b"HEAD /a HTTP/1.1\r\n")
+
+
+@pytest.mark.asyncio
+async def test_too_many_redirects() -> None:
+    redirect = b"HTTP/1.1 302 Found\r\nLocation: /\r\nContent-Length: 0\r\n\r\n"
+    driver = asyncio_driver()
+    async with serve(*[redirect] * 11) as server:
+        with pytest.raises(exceptions.DriverError):
+            await driver.fetch(get(server.url))
+
+
+@pytest.mark.asyncio
+async def test_send_stream_with_unknown_length() -> None:
+    class Stream(io.BytesIO):
+        def seek(self, offset, whence=io.SEEK_SET):
+            if whence == io.SEEK_END:
+                raise OSError("unseekable")
+            return super().seek(offset, whence)
+
+    driver = asyncio_driver()
+    async with serve(OK) as server:
+        data = Stream(b"x" * 100_000)
+        await driver.fetch(Request(Method.POST, server.url, data=data))
+    (request,) = server.requests
+    assert b"Transfer-Encoding: chunked\r\n" in request
+    assert request.endswith(b"\r\n\r\n" + b"x" * 100_000)
+
+
+@pytest.mark.asyncio
+async def test_send_large_stream() -> None:
+    driver = asyncio_driver()
+    async with serve(OK) as server:
+        data = io.BytesIO(b"x" * 2**24)
+        await driver.fetch(Request(Method.POST, server.url, data=data))
+    assert server.requests[0].endswith(b"\r\n\r\n" + b"x" * 2**24)
+
+
+@pytest.mark.asyncio
+async def test_write_timeout_exceeds() -> None:
+    done = asyncio.Event()
+
+    async def handle(reader, writer):
+        # request is never read
+        await done.wait()
+        writer.close()
+
+    tcp_server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = tcp_server.sockets[0].getsockname()
+    driver = asyncio_driver()
+    data = io.BytesIO(b"x" * 2**26)
+    request = Request(Method.POST, f"http://{host}:{port}", data=data)
+    try:
+        with pytest.raises(exceptions.Timeout):
+            await driver.fetch(request, timeout=Timeouts(write=0.1))
+    finally:
+        done.set()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_exceeds() -> None:
+    driver = asyncio_driver()
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n"
+    async with serve(response, keep_open=True) as server:
+        with pytest.raises(exceptions.Timeout):
+            await driver.fetch(get(server.url), timeout=Timeouts(read=0.1))
+
+
+@pytest.mark.asyncio
+async def test_total_timeout_exceeds() -> None:
+    driver = asyncio_driver()
+    async with serve(
+        [b"HTTP/1.1 200 OK\r\n", b"Content-Length: 2\r\n\r\nok"]
+    ) as server:
+        with pytest.raises(exceptions.Timeout):
+            await driver.fetch(get(server.url), timeout=0.005)
+
+
+@pytest.mark.asyncio
+async def test_exceeded_deadline() -> None:
+    driver = asyncio_driver()
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(get("http://localhost"), timeout=Deadline(0))
+
+
+@pytest.mark.asyncio
+async def test_connect_timeout_exceeds() -> None:
+    async def create_connection(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    driver = asyncio_driver()
+    loop = asyncio.get_event_loop()
+    with mock.patch.object(loop, "create_connection", create_connection):
+        with pytest.raises(exceptions.Timeout):
+            await driver.fetch(get("http://localhost"), timeout=Timeouts(connect=0.01))
+
+
+@pytest.mark.asyncio
+async def test_connection_failed() -> None:
+    driver = asyncio_driver()
+    with pytest.raises(exceptions.ConnectionFailed):
+        await driver.fetch(get("http://doesnotexist.google.com"))
+
+
+@pytest.mark.asyncio
+async def test_unsupported_url() -> None:
+    driver = asyncio_driver()
+    with pytest.raises(exceptions.DriverError):
+        await driver.fetch(get("ftp://localhost"))
+
+
+@pytest.mark.asyncio
+async def test_invalid_header() -> None:
+    driver = asyncio_driver()
+    request = get("http://localhost", headers={"X-Key": "a\r\nb"})
+    with pytest.raises(exceptions.DriverError):
+        await driver.fetch(request)
+
+
+@pytest.mark.asyncio
+async def test_pools_are_closed_on_settings_change() -> None:
+    driver = asyncio_driver()
+    async with serve(OK, OK) as server:
+        await driver.fetch(get(server.url))
+        (pool,) = driver.pools.values()
+        driver.verify = False
+        await driver.fetch(get(server.url))
+    assert pool.stats().idle == 0
+    assert server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_get(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.get(params={"type": "user", "id": ["1", "2"]})
+    assert response.status_code == 200
+    assert response.json()["url"].endswith("/get?type=user&id=1&id=2")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_timings(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    timings = (await client.get()).timings
+    assert timings is not None
+    assert timings.connect is not None and timings.connect > 0
+    assert timings.tls is None
+    assert 0 < timings.ttfb < timings.total
+
+
+@pytest.mark.asyncio
+async def test_tls_session_is_resumed(echo_server_secure, httpbin_ca_bundle) -> None:
+    driver = asyncio_driver(verify=httpbin_ca_bundle)
+    request = Request(Method.GET, echo_server_secure)
+    await driver.fetch(request)
+    # the first request takes an idle connection, while the second opens a new one
+    await asyncio.gather(driver.fetch(request), driver.fetch(request))
+    stats = driver.pool_stats()[echo_server_secure]
+    assert (stats.created, stats.tls_handshakes, stats.tls_resumed) == (2, 1, 1)
+    await driver.close()
+
+
+@pytest.mark.asyncio
+async def test_hooks_with_tls(httpbin_secure, httpbin_ca_bundle) -> None:
+    from apiwrappers.hooks import Event
+
+    events: List = []
+    driver = asyncio_driver(verify=httpbin_ca_bundle)
+    subscribe(driver, events)
+    response = await HttpBin(httpbin_secure.url, driver=driver).get()
+    assert response.status_code == 200
+    assert response.timings is not None
+    assert 0 < response.timings.tls < response.timings.connect
+    assert events == [
+        Event.REQUEST_START,
+        Event.CONNECTION_CREATED,
+        Event.TLS_DONE,
+        Event.HEADERS_RECEIVED,
+        Event.BODY_DONE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_headers(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.headers({"Custom-Header": "value"})
+    assert response.json()["headers"]["Custom-Header"] == "value"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_response_headers(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.response_headers({"Custom-Header": "value"})
+    assert isinstance(response.headers, CaseInsensitiveDict)
+    assert response.headers["Custom-Header"] == "value"
+
+
+@pytest.mark.asyncio
+async def test_set_cookie(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.set_cookie("mycookie", "mycookievalue")
+    assert "mycookie" not in response.cookies
+    assert response.json()["cookies"]["mycookie"] == "mycookievalue"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_send_data(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.post(data={"name": "apiwrappers", "tags": ["a", "b"]})
+    assert response.json()["form"] == {  # type: ignore
+        "name": "apiwrappers",
+        "tags": ["a", "b"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_send_json(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.post(json={"name": "apiwrappers"})
+    assert response.json()["json"] == {"name": "apiwrappers"}  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_send_signed_files(httpbin) -> None:
+    driver = asyncio_driver(Signing.using(HmacSigner("key-id", "secret")))
+    client = HttpBin(httpbin.url, driver=driver)
+    with open(CLIENT_CERT, "rb") as file:
+        response = await client.post(files={"file": ("ca-bundle", file)})
+        response.request.data.seek(0)  # type: ignore
+        content_hash = payload_hash(response.request)
+    data = response.json()
+    assert data["files"]["file"].startswith("-----BEGIN")  # type: ignore
+    assert data["headers"]["X-Content-Sha256"] == content_hash  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_verify_failure(httpbin_secure) -> None:
+    client = HttpBin(httpbin_secure.url, driver=asyncio_driver())
+    with pytest.raises(ssl.SSLError) as excinfo:
+        await client.get()
+    assert "CERTIFICATE_VERIFY_FAILED" in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_verify_disabled(httpbin_secure) -> None:
+    client = HttpBin(httpbin_secure.url, driver=asyncio_driver(verify=False))
+    response = await client.get()
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_verify_with_invalid_path_to_ca_bundle(httpbin) -> None:
+    driver = asyncio_driver(verify=INVALID_CA_BUNDLE_PATH)
+    client = HttpBin(httpbin.url, driver=driver)
+    with pytest.raises(OSError) as excinfo:
+        await client.get()
+    assert str(excinfo.value).startswith("Could not find a suitable TLS CA")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cert", [CLIENT_CERT, CLIENT_CERT_PAIR])
+async def test_cert(httpbin_secure, httpbin_ca_bundle, cert) -> None:
+    driver = asyncio_driver(verify=httpbin_ca_bundle, cert=cert)
+    client = HttpBin(httpbin_secure.url, driver=driver)
+    response = await client.get()
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_tls_handshake_timeout(httpbin_secure, httpbin_ca_bundle) -> None:
+    async def start_tls(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    driver = asyncio_driver(verify=httpbin_ca_bundle)
+    client = HttpBin(httpbin_secure.url, driver=driver)
+    loop = asyncio.get_event_loop()
+    with mock.patch.object(loop, "start_tls", start_tls):
+        with pytest.raises(exceptions.Timeout):
+            await client.delay(1, timeout=Timeouts(connect=0.1))
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_response(httpbin) -> None:
+    response = await HttpBin(httpbin.url, driver=asyncio_driver()).html()
+    with pytest.raises(json.JSONDecodeError):
+        response.json()
+
+
+@pytest.mark.asyncio
+async def test_middleware(httpbin) -> None:
+    driver = asyncio_driver(RequestMiddleware, ResponseMiddleware)
+    response = await HttpBin(httpbin.url, driver=driver).get()
+    assert response.json()["headers"]["Request"] == "middleware"  # type: ignore
+    assert response.headers["Response"] == "middleware"
+
+
+@pytest.mark.asyncio
+async def test_basic_auth(httpbin) -> None:
+    client = HttpBin(httpbin.url, driver=asyncio_driver())
+    response = await client.basic_auth("admin", "root")
+    assert response.json() == {"authenticated": True, "user": "admin"}
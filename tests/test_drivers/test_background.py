@@ -0,0 +1,197 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Method, Request, exceptions, fetch
+from apiwrappers.auth import TokenAuth
+from apiwrappers.drivers.asgi import ASGIDriver
+from apiwrappers.drivers.background import BackgroundDriver
+
+from .. import factories
+from .apps import asgi_app
+from .httpbin_client import HttpBin
+from .middleware import RequestMiddleware, ResponseMiddleware
+
+
+class ConcurrencyApp:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.threads = set()
+
+    async def __call__(self, scope, receive, send):
+        self.threads.add(threading.get_ident())
+        self.running += 1
+        self.max_running = max(self.running, self.max_running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        if scope["path"] == "/slow":
+            await asyncio.sleep(1)
+        await asgi_app(scope, receive, send)
+
+
+class ClosingDriver:
+    timeout = None
+    verify = True
+    cert = None
+
+    def __init__(self):
+        self.pool_stats = mock.Mock(return_value={})
+        # records calls made by the coroutines, as they run only when awaited
+        self.calls = mock.Mock()
+
+    async def warmup(self, *args, **kwargs) -> None:
+        self.calls.warmup(*args, **kwargs)
+
+    async def close(self) -> None:
+        self.calls.close()
+
+
+def test_representation() -> None:
+    inner = ASGIDriver(app=asgi_app)
+    driver = BackgroundDriver(driver=inner)
+    assert repr(driver) == f"BackgroundDriver(driver={inner!r})"
+
+
+def test_representation_with_middleware() -> None:
+    inner = ASGIDriver(app=asgi_app)
+    driver = BackgroundDriver(RequestMiddleware, ResponseMiddleware, driver=inner)
+    assert repr(driver) == (
+        f"BackgroundDriver(RequestMiddleware, ResponseMiddleware, driver={inner!r})"
+    )
+
+
+def test_string_representation() -> None:
+    driver = BackgroundDriver(driver=ASGIDriver(app=asgi_app))
+    assert str(driver) == "<Driver 'background'>"
+
+
+def test_settings_are_shared_with_driver() -> None:
+    inner = ASGIDriver(app=asgi_app, timeout=1)
+    driver = BackgroundDriver(driver=inner)
+    assert (driver.timeout, driver.verify, driver.cert) == (1, True, None)
+    driver.timeout, driver.verify, driver.cert = 5, False, "client.pem"
+    assert (inner.timeout, inner.verify, inner.cert) == (5, False, "client.pem")
+
+
+def test_fetch() -> None:
+    inner = ASGIDriver(app=asgi_app)
+    driver = BackgroundDriver(RequestMiddleware, ResponseMiddleware, driver=inner)
+    request = Request(Method.GET, "https://example.org/", auth=TokenAuth("token"))
+    response = fetch(driver, request)
+    driver.close()
+    assert response.status_code == 201
+    assert response.headers["Response"] == "middleware"
+    assert response.json()["headers"]["request"] == "middleware"
+    assert response.json()["headers"]["authorization"] == "Bearer token"
+
+
+def test_fetch_runs_on_the_same_background_thread() -> None:
+    app = ConcurrencyApp()
+    driver = BackgroundDriver(driver=ASGIDriver(app=app))
+    request = Request(Method.GET, "https://example.org/")
+    threads = [threading.Thread(target=driver.fetch, args=(request,)) for _ in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    driver.close()
+    assert app.max_running == 2
+    assert len(app.threads) == 1
+    assert threading.get_ident() not in app.threads
+
+
+def test_fetch_with_timeout() -> None:
+    driver = BackgroundDriver(driver=ASGIDriver(app=ConcurrencyApp()))
+    with pytest.raises(exceptions.Timeout):
+        driver.fetch(Request(Method.GET, "https://example.org/slow"), timeout=0.1)
+    driver.close()
+
+
+def test_fetch_many() -> None:
+    app = ConcurrencyApp()
+    driver = BackgroundDriver(driver=ASGIDriver(app=app))
+    requests = [Request(Method.GET, f"https://example.org/{i}") for i in range(5)]
+    responses = driver.fetch_many(requests)
+    driver.close()
+    assert [r.json()["path"] for r in responses] == [f"/{i}" for i in range(5)]
+    assert app.max_running == 5
+
+
+def test_fetch_many_raises_first_error() -> None:
+    driver = BackgroundDriver(driver=ASGIDriver(app=ConcurrencyApp(), timeout=0.1))
+    requests = [
+        Request(Method.GET, "https://example.org/"),
+        Request(Method.GET, "https://example.org/slow"),
+    ]
+    with pytest.raises(exceptions.Timeout):
+        driver.fetch_many(requests)
+    driver.close()
+
+
+def test_fetch_cancels_request_on_interrupt() -> None:
+    driver = BackgroundDriver(driver=ASGIDriver(app=ConcurrencyApp()))
+    request = Request(Method.GET, "https://example.org/slow")
+    with mock.patch.object(Future, "result", side_effect=KeyboardInterrupt):
+        with mock.patch.object(
+            Future, "cancel", autospec=True, side_effect=Future.cancel
+        ) as cancel:
+            with pytest.raises(KeyboardInterrupt):
+                driver.fetch(request)
+    driver.close()
+    (future,) = cancel.call_args.args
+    assert future.cancelled()
+
+
+def test_pool_stats_and_warmup() -> None:
+    inner = ClosingDriver()
+    driver = BackgroundDriver(driver=inner)  # type: ignore
+    assert driver.pool_stats() == {}
+    driver.warmup(["https://example.org"], connections_per_host=2, timeout=1)
+    inner.calls.warmup.assert_called_once_with(["https://example.org"], 2, timeout=1)
+
+
+def test_pool_stats_without_pool() -> None:
+    driver = BackgroundDriver(driver=ASGIDriver(app=asgi_app))
+    assert driver.pool_stats() == {}
+
+
+def test_close_closes_driver_and_stops_loop() -> None:
+    inner = ClosingDriver()
+    driver = BackgroundDriver(driver=inner)  # type: ignore
+    driver.close()
+    inner.calls.close.assert_not_called()
+
+    driver.warmup(["https://example.org"])
+    thread = driver._thread  # pylint: disable=protected-access
+    driver.close()
+    inner.calls.close.assert_called_once_with()
+    assert thread is not None and not thread.is_alive()
+
+
+def test_driver_can_be_used_after_close() -> None:
+    response = factories.make_response(b"{}")
+    driver = BackgroundDriver(driver=factories.make_async_driver(response))
+    assert driver.fetch(Request(Method.GET, "https://example.org")).status_code == 200
+    driver.close()
+    assert driver.fetch(Request(Method.GET, "https://example.org")).status_code == 200
+    driver.close()
+
+
+@pytest.mark.aiohttp
+def test_aiohttp_driver(echo_server) -> None:
+    from apiwrappers.drivers.aiohttp import AioHttpDriver
+
+    driver = BackgroundDriver(driver=AioHttpDriver(timeout=30))
+    client = HttpBin(echo_server, driver=driver)
+    driver.warmup([echo_server], connections_per_host=2)
+    assert client.get().json()["path"] == "/get"
+    requests = [Request(Method.GET, f"{echo_server}/{i}") for i in range(4)]
+    responses = driver.fetch_many(requests)
+    assert [r.json()["path"] for r in responses] == [f"/{i}" for i in range(4)]
+    stats = driver.pool_stats()[echo_server]
+    assert (stats.created, stats.reused) == (4, 3)
+    driver.close()
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+
+import pytest
+
+from apiwrappers.drivers._common import close_replaced
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_close_replaced_on_current_loop() -> None:
+    closed = []
+
+    async def close() -> None:
+        closed.append(threading.get_ident())
+
+    await close_replaced(close, None)
+    await close_replaced(close, asyncio.get_event_loop())
+    assert closed == [threading.get_ident()] * 2
+
+
+async def test_close_replaced_on_running_loop() -> None:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    closed = threading.Event()
+
+    async def close() -> None:
+        assert asyncio.get_event_loop() is loop
+        closed.set()
+
+    try:
+        await close_replaced(close, loop)
+        assert closed.wait(5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def test_close_replaced_on_closed_loop() -> None:
+    loop = asyncio.new_event_loop()
+    loop.close()
+
+    async def close() -> None:
+        raise RuntimeError("Event loop is closed")
+
+    await close_replaced(close, loop)
@@ -0,0 +1,249 @@
+import random
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Deadline, Method, Request, Timeouts, Url, exceptions
+from apiwrappers.auth import TokenAuth
+from apiwrappers.drivers.faults import (
+    AsyncFaultDriver,
+    FaultDriver,
+    FaultInjector,
+    Faults,
+    exponential,
+    fixed,
+    limit_latency,
+    lognormal,
+    uniform,
+)
+
+from .. import factories
+from .middleware import ResponseMiddleware
+
+USERS = Url("http://localhost/users/{id}")
+
+
+def make_fault_driver(*middleware, **kwargs) -> FaultDriver:
+    driver = factories.make_driver(factories.make_response(b"{}"))
+    return FaultDriver(*middleware, driver=driver, **kwargs)
+
+
+def test_representation() -> None:
+    driver = make_fault_driver(seed=1)
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == (
+        f"FaultDriver(driver={driver.driver!r}, injector=FaultInjector("
+        f"faults={Faults()!r}, templates={{}}, seed=1))"
+    )
+
+
+def test_representation_with_middleware() -> None:
+    driver = make_fault_driver(ResponseMiddleware)
+    assert repr(driver).startswith(
+        "FaultDriver(Authentication, ResponseMiddleware, driver="
+    )
+
+
+def test_string_representation() -> None:
+    assert str(make_fault_driver()) == "<Driver 'faults'>"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"error_rate": -0.1}, {"error_rate": 0.5, "timeout_rate": 0.6}],
+)
+def test_faults_invalid_rates(kwargs) -> None:
+    with pytest.raises(ValueError):
+        Faults(**kwargs)
+
+
+@pytest.mark.parametrize(
+    ["distribution", "low", "high"],
+    [
+        (fixed(0.1), 0.1, 0.1),
+        (uniform(0.1, 0.2), 0.1, 0.2),
+        (exponential(0.1), 0.0, float("inf")),
+        (lognormal(0.1, 0.5), 0.0, float("inf")),
+    ],
+)
+def test_distributions(distribution, low, high) -> None:
+    rng = random.Random(0)
+    assert all(low <= distribution(rng) <= high for _ in range(100))
+
+
+def test_lognormal_median() -> None:
+    rng = random.Random(0)
+    samples = sorted(lognormal(0.1, 0.5)(rng) for _ in range(1001))
+    assert samples[500] == pytest.approx(0.1, rel=0.1)
+
+
+def test_fetch_without_faults() -> None:
+    driver = make_fault_driver()
+    request = Request(Method.GET, USERS, auth=TokenAuth("token"))
+    response = driver.fetch(request)
+    assert response.status_code == 200
+    assert response.request.auth is None
+    assert response.request.headers == {"Authorization": "Bearer token"}
+    assert driver.counts == {(USERS.template, "none"): 1}
+
+
+@pytest.mark.parametrize(
+    ["faults", "exception"],
+    [
+        (Faults(timeout_rate=1), exceptions.Timeout),
+        (Faults(connection_failure_rate=1), exceptions.ConnectionFailed),
+    ],
+)
+def test_fetch_raises(faults, exception) -> None:
+    driver = make_fault_driver(faults=faults)
+    with pytest.raises(exception):
+        driver.fetch(Request(Method.GET, USERS))
+
+
+def test_fetch_error_response() -> None:
+    driver = make_fault_driver(ResponseMiddleware, faults=Faults(error_rate=1))
+    response = driver.fetch(Request(Method.GET, Url(USERS.template, id=1)))
+    assert response.status_code == 503
+    assert response.url == "http://localhost/users/1"
+    assert response.headers == {"Response": "middleware"}
+    assert driver.counts == {(USERS.template, "error"): 1}
+
+
+def test_fetch_faults_per_template() -> None:
+    driver = make_fault_driver(
+        faults=Faults(error_rate=1, error_status=500),
+        templates={USERS.template: Faults()},
+    )
+    assert (
+        driver.fetch(Request(Method.GET, Url(USERS.template, id=1))).status_code == 200
+    )
+    assert driver.fetch(Request(Method.GET, "http://localhost")).status_code == 500
+
+
+def test_fetch_adds_latency() -> None:
+    driver = make_fault_driver(faults=Faults(latency=fixed(0.5)))
+    with mock.patch("time.sleep") as sleep:
+        driver.fetch(Request(Method.GET, USERS))
+    sleep.assert_called_once_with(0.5)
+
+
+@pytest.mark.parametrize(
+    ["timeout", "expected"],
+    [
+        (None, (0.5, False)),
+        (1, (0.5, False)),
+        (0.2, (0.2, True)),
+        (timedelta(milliseconds=200), (0.2, True)),
+        (Timeouts(connect=0.1), (0.5, False)),
+        (Timeouts(read=1, total=0.2), (0.2, True)),
+        (Timeouts(read=0.2, total=1), (0.2, True)),
+    ],
+)
+def test_limit_latency(timeout, expected) -> None:
+    assert limit_latency(0.5, timeout) == expected
+
+
+def test_limit_latency_by_deadline() -> None:
+    delay, timed_out = limit_latency(0.5, Deadline(0.2))
+    assert 0.1 < delay <= 0.2
+    assert timed_out
+
+
+@pytest.mark.parametrize("timeout", [0.2, Timeouts(total=0.2)])
+def test_fetch_latency_exceeds_timeout(timeout) -> None:
+    driver = make_fault_driver(faults=Faults(latency=fixed(0.5)), timeout=timeout)
+    with mock.patch("time.sleep") as sleep:
+        with pytest.raises(exceptions.Timeout):
+            driver.fetch(Request(Method.GET, USERS))
+    (delay,) = sleep.call_args.args
+    assert 0.1 < delay <= 0.2
+
+
+def test_fetch_latency_limited_by_driver_timeout() -> None:
+    driver = make_fault_driver(faults=Faults(latency=fixed(5)))
+    driver.driver.timeout = 0.2
+    assert driver.timeout == 0.2
+    with mock.patch("time.sleep") as sleep:
+        with pytest.raises(exceptions.Timeout):
+            driver.fetch(Request(Method.GET, USERS))
+    sleep.assert_called_once_with(0.2)
+
+
+def test_timeout_overrides_driver_timeout() -> None:
+    driver = make_fault_driver(timeout=None)
+    assert driver.timeout is None
+    driver.timeout = 2
+    assert driver.timeout == 2
+    assert driver.driver.timeout == 1
+
+
+def test_faults_are_reproducible() -> None:
+    faults = Faults(
+        latency=uniform(0, 1),
+        error_rate=0.2,
+        timeout_rate=0.2,
+        connection_failure_rate=0.2,
+    )
+    request = Request(Method.GET, USERS)
+    first = FaultInjector(faults, seed=42)
+    second = FaultInjector(faults, seed=42)
+    decisions = [first.decide(request) for _ in range(100)]
+    assert decisions == [second.decide(request) for _ in range(100)]
+    counts = first.counts
+    assert set(counts) == {
+        (USERS.template, name)
+        for name in ("none", "error", "timeout", "connection_failure")
+    }
+    assert 20 < counts[(USERS.template, "none")] < 60
+
+
+@pytest.mark.asyncio
+async def test_fetch_async() -> None:
+    real = factories.make_async_driver(factories.make_response(b"{}"))
+    driver = AsyncFaultDriver(
+        driver=real,
+        faults=Faults(latency=fixed(0.001)),
+        templates={USERS.template: Faults(timeout_rate=1)},
+    )
+    assert str(driver) == "<AsyncDriver 'faults'>"
+    assert repr(driver).startswith("AsyncFaultDriver(Authentication, driver=")
+    request = Request(Method.GET, "http://localhost", auth=TokenAuth("token"))
+    response = await driver.fetch(request)
+    assert response.request.auth is None
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(Request(Method.GET, USERS))
+    assert driver.counts == {
+        ("http://localhost", "none"): 1,
+        (USERS.template, "timeout"): 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_async_latency_exceeds_timeout() -> None:
+    real = factories.make_async_driver(factories.make_response(b"{}"))
+    driver = AsyncFaultDriver(driver=real, faults=Faults(latency=fixed(5)))
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(Request(Method.GET, USERS), timeout=Deadline(0.01))
+
+
+@pytest.mark.asyncio
+async def test_fetch_async_latency_limited_by_driver_timeout() -> None:
+    real = factories.make_async_driver(factories.make_response(b"{}"))
+    real.timeout = 0.01
+    driver = AsyncFaultDriver(driver=real, faults=Faults(latency=fixed(5)))
+    assert driver.timeout == 0.01
+    with pytest.raises(exceptions.Timeout):
+        await driver.fetch(Request(Method.GET, USERS))
+    driver.timeout = None
+    assert driver.timeout is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_async_error_response() -> None:
+    real = factories.make_async_driver(factories.make_response(b"{}"))
+    driver = AsyncFaultDriver(driver=real, faults=Faults(error_rate=1))
+    setattr(driver, "_middleware", [])
+    assert repr(driver).startswith("AsyncFaultDriver(driver=")
+    response = await driver.fetch(Request(Method.GET, "http://localhost"))
+    assert response.status_code == 503
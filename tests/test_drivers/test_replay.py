@@ -0,0 +1,211 @@
+import gzip
+import io
+from http.cookies import SimpleCookie
+
+import pytest
+
+from apiwrappers import Method, Request, exceptions
+from apiwrappers.auth import TokenAuth
+from apiwrappers.drivers.replay import AsyncReplayDriver, Cassette, ReplayDriver
+from apiwrappers.structures import CaseInsensitiveDict
+
+from .. import factories
+from .middleware import ResponseMiddleware
+
+
+def make_response(**kwargs):
+    defaults = {
+        "headers": CaseInsensitiveDict({"Content-Type": "application/json"}),
+        "cookies": SimpleCookie({"session": "abc"}),
+    }
+    return factories.make_response(b'{"id": 1}', **{**defaults, **kwargs})
+
+
+def test_representation(tmp_path) -> None:
+    path = str(tmp_path / "cassette.jsonl")
+    driver = ReplayDriver(cassette=path)
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == f"ReplayDriver(cassette=<Cassette '{path}'>, driver=None)"
+
+
+def test_representation_with_middleware(tmp_path) -> None:
+    path = str(tmp_path / "cassette.jsonl")
+    driver = ReplayDriver(ResponseMiddleware, cassette=path)
+    assert repr(driver) == (
+        f"ReplayDriver(Authentication, ResponseMiddleware, "
+        f"cassette=<Cassette '{path}'>, driver=None)"
+    )
+    assert str(driver) == "<Driver 'replay'>"
+
+
+def test_representation_async(tmp_path) -> None:
+    path = str(tmp_path / "cassette.jsonl")
+    driver = AsyncReplayDriver(cassette=path)
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == (
+        f"AsyncReplayDriver(cassette=<Cassette '{path}'>, driver=None)"
+    )
+
+
+def test_representation_with_middleware_async(tmp_path) -> None:
+    path = str(tmp_path / "cassette.jsonl")
+    driver = AsyncReplayDriver(ResponseMiddleware, cassette=path)
+    assert repr(driver) == (
+        f"AsyncReplayDriver(Authentication, ResponseMiddleware, "
+        f"cassette=<Cassette '{path}'>, driver=None)"
+    )
+    assert str(driver) == "<AsyncDriver 'replay'>"
+
+
+@pytest.mark.parametrize("filename", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_record_and_replay(tmp_path, filename) -> None:
+    path = tmp_path / filename
+    real = factories.make_driver(make_response())
+    driver = ReplayDriver(cassette=path, driver=real)
+    request = Request(Method.GET, "https://example.org/users", query_params={"a": "1"})
+    recorded = driver.fetch(request)
+    assert recorded.json() == {"id": 1}
+
+    driver = ReplayDriver(cassette=Cassette(path))
+    response = driver.fetch(request)
+    assert len(driver.cassette) == 1
+    assert response.request is request
+    assert response.status_code == 200
+    assert response.url == recorded.url
+    assert response.headers == {"Content-Type": "application/json"}
+    assert response.cookies["session"].value == "abc"
+    assert response.content == b'{"id": 1}'
+    assert response.encoding == "utf-8"
+
+
+def test_record_and_replay_files(tmp_path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    real = factories.make_driver(make_response())
+    files = {"file": ("report.csv", io.BytesIO(b"a,b"), "text/csv")}
+    request = Request(Method.POST, "https://example.org/upload", files=files)
+    ReplayDriver(cassette=path, driver=real).fetch(request)
+
+    files = {"file": ("report.csv", io.BytesIO(b"a,b"), "text/csv")}
+    request = Request(Method.POST, "https://example.org/upload", files=files)
+    assert ReplayDriver(cassette=path).fetch(request).json() == {"id": 1}
+
+
+def test_cassette_is_compressed(tmp_path) -> None:
+    path = tmp_path / "cassette.jsonl.gz"
+    driver = ReplayDriver(cassette=path, driver=factories.make_driver(make_response()))
+    driver.fetch(Request(Method.GET, "https://example.org"))
+    with gzip.open(path, "rt") as f:
+        assert '"status_code":200' in f.read()
+
+
+def test_replay_missing_response(tmp_path) -> None:
+    driver = ReplayDriver(cassette=tmp_path / "cassette.jsonl")
+    with pytest.raises(exceptions.DriverError) as excinfo:
+        driver.fetch(Request(Method.POST, "https://example.org", json={"a": 1}))
+    assert str(excinfo.value).startswith(
+        "No recorded response for: POST https://example.org  "
+    )
+
+
+def test_replay_doesnt_share_response_state(tmp_path) -> None:
+    real = factories.make_driver(make_response())
+    driver = ReplayDriver(ResponseMiddleware, cassette=tmp_path / "c", driver=real)
+    request = Request(Method.GET, "https://example.org")
+    driver.fetch(request)
+    first = driver.fetch(request)
+    second = driver.fetch(request)
+    assert first.headers is not second.headers
+    assert second.headers["Response"] == "middleware"
+
+
+def test_record_applies_auth_once(tmp_path) -> None:
+    real = factories.make_driver(make_response())
+    driver = ReplayDriver(cassette=tmp_path / "cassette.jsonl", driver=real)
+    request = Request(Method.GET, "https://example.org", auth=TokenAuth("token"))
+    response = driver.fetch(request)
+    assert response.request.auth is None
+    assert response.request.headers == {"Authorization": "Bearer token"}
+
+    # credentials are not a part of a key
+    request = Request(Method.GET, "https://example.org", auth=TokenAuth("new"))
+    assert ReplayDriver(cassette=driver.cassette).fetch(request).status_code == 200
+
+
+@pytest.mark.parametrize(
+    ["first", "second", "same"],
+    [
+        (
+            {"query_params": {"a": "1", "b": "2"}},
+            {"query_params": {"b": "2", "a": "1"}},
+            True,
+        ),  # noqa: E501
+        (
+            {"query_params": [("a", "1"), ("b", "2")]},
+            {"query_params": {"a": "1", "b": "2"}},
+            True,
+        ),  # noqa: E501
+        (
+            {"query_params": {"a": ["1", "2"]}},
+            {"query_params": {"a": ["2", "1"]}},
+            False,
+        ),  # noqa: E501
+        ({"headers": {"X-Id": "1"}}, {"headers": {"X-Id": "2"}}, True),
+        ({"json": {"a": 1}}, {"json": {"a": 2}}, False),
+        ({"data": b"body"}, {"data": io.BytesIO(b"body")}, True),
+        (
+            {"files": {"f": ("f.txt", io.BytesIO(b"1"))}},
+            {"files": {"f": ("f.txt", io.BytesIO(b"2"))}},
+            False,
+        ),  # noqa: E501
+        (
+            {"files": {"f": ("a.txt", io.BytesIO(b"1"))}},
+            {"files": {"f": ("b.txt", io.BytesIO(b"1"))}},
+            False,
+        ),  # noqa: E501
+        (
+            {"files": {"f": ("f.txt", io.BytesIO(b"1"))}},
+            {"files": {"f": ("f.txt", io.BytesIO(b"1"))}},
+            True,
+        ),  # noqa: E501
+    ],
+)
+def test_cassette_key(first, second, same) -> None:
+    first = Request(Method.POST, "https://example.org", **first)
+    second = Request(Method.POST, "https://example.org", **second)
+    assert (Cassette.make_key(first) == Cassette.make_key(second)) is same
+
+
+def test_cassette_key_keeps_stream_position() -> None:
+    stream = io.BytesIO(b"body")
+    Cassette.make_key(Request(Method.POST, "https://example.org", data=stream))
+    assert stream.tell() == 0
+
+
+def test_newer_record_replaces_older_one(tmp_path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    request = Request(Method.GET, "https://example.org")
+    cassette = Cassette(path)
+    cassette.add(request, make_response(status_code=500))
+    cassette.add(request, make_response(status_code=200))
+    assert len(Cassette(path)) == 1
+    assert ReplayDriver(cassette=path).fetch(request).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay_async(tmp_path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    real = factories.make_async_driver(make_response())
+    request = Request(Method.GET, "https://example.org", auth=TokenAuth("token"))
+    driver = AsyncReplayDriver(cassette=path, driver=real)
+    recorded = await driver.fetch(request)
+    assert recorded.request.auth is None
+
+    response = await AsyncReplayDriver(cassette=path).fetch(request)
+    assert response.json() == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_replay_missing_response_async(tmp_path) -> None:
+    driver = AsyncReplayDriver(cassette=tmp_path / "cassette.jsonl")
+    with pytest.raises(exceptions.DriverError):
+        await driver.fetch(Request(Method.GET, "https://example.org"))
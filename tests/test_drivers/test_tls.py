@@ -0,0 +1,57 @@
+import socket
+import ssl
+import sys
+from unittest import mock
+from urllib.parse import urlsplit
+
+import certifi
+
+from apiwrappers.drivers.tls import create_default_context, get_port, make_ssl_context
+
+
+def test_create_default_context() -> None:
+    context = create_default_context(cafile=certifi.where())
+    expected = ssl.create_default_context(cafile=certifi.where())
+    assert context.options == expected.options
+    assert context.verify_flags == expected.verify_flags
+    assert context.verify_mode == expected.verify_mode
+    assert context.check_hostname is expected.check_hostname
+    assert context.keylog_filename == expected.keylog_filename
+
+
+def test_create_default_context_logs_keys(monkeypatch, tmp_path) -> None:
+    keylogfile = str(tmp_path / "keys.log")
+    monkeypatch.setenv("SSLKEYLOGFILE", keylogfile)
+    context = create_default_context(cafile=certifi.where())
+    assert context.keylog_filename == keylogfile
+
+
+def test_create_default_context_is_strict_on_python_313() -> None:
+    with mock.patch.object(sys, "version_info", (3, 13)):
+        context = create_default_context(cafile=certifi.where())
+    flags = ssl.VERIFY_X509_STRICT | ssl.VERIFY_X509_PARTIAL_CHAIN
+    assert context.verify_flags & flags == flags
+
+
+def test_get_port() -> None:
+    with socket.socket() as sock:
+        assert get_port(sock) is None
+    left, right = socket.socketpair(socket.AF_UNIX)
+    with left, right:
+        assert get_port(left) is None
+
+
+def test_sessions_are_kept_per_host_and_port(
+    echo_server_secure, httpbin_ca_bundle
+) -> None:
+    parts = urlsplit(echo_server_secure)
+    context = make_ssl_context(httpbin_ca_bundle, None)
+    assert isinstance(context, ssl.SSLContext)
+    with socket.create_connection((parts.hostname, parts.port)) as sock:
+        with context.wrap_socket(sock, server_hostname=parts.hostname) as conn:
+            conn.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            # with TLS 1.3 a ticket is sent along with the first response
+            conn.recv(1024)
+    assert list(context.sessions) == [(parts.hostname, parts.port)]  # type: ignore
+    assert context.get_session(parts.hostname) is None  # type: ignore
+    assert context.get_session(parts.hostname, parts.port) is not None  # type: ignore
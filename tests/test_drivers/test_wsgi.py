@@ -0,0 +1,140 @@
+import io
+
+import pytest
+
+from apiwrappers import Method, Request, Url, exceptions
+from apiwrappers.auth import TokenAuth
+from apiwrappers.drivers.wsgi import WSGIDriver
+
+from .apps import wsgi_app
+from .middleware import RequestMiddleware, ResponseMiddleware
+
+
+def test_representation() -> None:
+    driver = WSGIDriver(app=wsgi_app)
+    setattr(driver, "_middleware", [])
+    assert repr(driver) == f"WSGIDriver(app={wsgi_app!r})"
+
+
+def test_representation_with_middleware() -> None:
+    driver = WSGIDriver(RequestMiddleware, ResponseMiddleware, app=wsgi_app)
+    assert repr(driver) == (
+        "WSGIDriver("
+        "Authentication, RequestMiddleware, ResponseMiddleware, "
+        f"app={wsgi_app!r}"
+        ")"
+    )
+
+
+def test_string_representation() -> None:
+    assert str(WSGIDriver(app=wsgi_app)) == "<Driver 'wsgi'>"
+
+
+def test_fetch() -> None:
+    driver = WSGIDriver(app=wsgi_app)
+    request = Request(
+        Method.POST,
+        Url("https://example.org/users/{name}", name="jane doe")("/?a=1"),
+        query_params={"b": ["2", "3"], "c": None},
+        headers={"X-Request-Id": "42"},
+        cookies={"session": "abc"},
+        auth=TokenAuth("token"),
+        json={"key": "value"},
+    )
+    response = driver.fetch(request)
+    assert response.request is request
+    assert response.status_code == 201
+    assert response.url == "https://example.org/users/jane doe/?a=1&b=2&b=3"
+    assert response.headers["Set-Cookie"] == "a=1, b=2; Path=/"
+    assert response.cookies["a"].value == "1"
+    assert response.cookies["b"]["path"] == "/"
+    assert response.encoding == "latin-1"
+    assert response.timings is not None
+    assert response.timings.total is not None
+    assert response.json() == {
+        "method": "POST",
+        "path": "/users/jane doe/",
+        "query": [["a", "1"], ["b", "2"], ["b", "3"]],
+        "headers": {
+            "host": "example.org",
+            "cookie": "session=abc",
+            "content-type": "application/json",
+            "content-length": "16",
+            "x-request-id": "42",
+            "authorization": "Bearer token",
+        },
+        "body": '{"key": "value"}',
+    }
+
+
+def test_fetch_without_body() -> None:
+    driver = WSGIDriver(app=wsgi_app)
+    response = driver.fetch(Request(Method.GET, "http://localhost:8000"))
+    payload = response.json()
+    assert payload["path"] == "/"
+    assert payload["headers"] == {"host": "localhost:8000"}
+    assert payload["body"] == ""
+
+
+def test_fetch_with_file_like_data() -> None:
+    driver = WSGIDriver(app=wsgi_app)
+    stream = io.BytesIO(b"content")
+    response = driver.fetch(Request(Method.PUT, "http://localhost", data=stream))
+    assert response.json()["body"] == "content"
+    assert stream.tell() == 0
+
+
+def test_fetch_with_middleware() -> None:
+    driver = WSGIDriver(RequestMiddleware, ResponseMiddleware, app=wsgi_app)
+    response = driver.fetch(Request(Method.GET, "http://localhost"))
+    assert response.json()["headers"]["request"] == "middleware"
+    assert response.headers["Response"] == "middleware"
+
+
+def test_fetch_with_write_callable() -> None:
+    def app(environ, start_response):
+        # pylint: disable=unused-argument
+        write = start_response("200 OK", [])
+        write(b"hello, ")
+        return [b"world"]
+
+    response = WSGIDriver(app=app).fetch(Request(Method.GET, "http://localhost"))
+    assert response.text() == "hello, world"
+    assert response.encoding == "utf-8"
+
+
+def test_fetch_closes_result() -> None:
+    closed = []
+
+    class Result(list):
+        def close(self):
+            closed.append(True)
+
+    def app(environ, start_response):
+        # pylint: disable=unused-argument
+        start_response("500 Internal Server Error", [])
+        start_response("503 Service Unavailable", [], exc_info=(None, None, None))
+        return Result([b"error"])
+
+    response = WSGIDriver(app=app).fetch(Request(Method.GET, "http://localhost"))
+    assert response.status_code == 503
+    assert closed == [True]
+
+
+def test_fetch_without_response() -> None:
+    def app(environ, start_response):
+        # pylint: disable=unused-argument
+        return []
+
+    driver = WSGIDriver(app=app)
+    with pytest.raises(exceptions.DriverError) as excinfo:
+        driver.fetch(Request(Method.GET, "http://localhost"))
+    assert str(excinfo.value) == "WSGI app didn't start a response"
+
+
+def test_fetch_propagates_app_errors() -> None:
+    def app(environ, start_response):
+        raise ZeroDivisionError
+
+    with pytest.raises(ZeroDivisionError):
+        WSGIDriver(app=app).fetch(Request(Method.GET, "http://localhost"))
@@ -0,0 +1,155 @@
+import io
+import os
+
+import pytest
+
+from apiwrappers import Method, Request
+from apiwrappers.encoders import (
+    MultipartStream,
+    body_length,
+    encode_body,
+    encode_headers,
+    encode_url,
+    iter_body,
+)
+
+
+@pytest.mark.parametrize(
+    ["kwargs", "body", "content_type"],
+    [
+        ({}, b"", None),
+        ({"data": b"bytes"}, b"bytes", None),
+        ({"data": "text"}, b"text", None),
+        ({"json": {"key": "value"}}, b'{"key": "value"}', "application/json"),
+        (
+            {"data": {"name": "apiwrappers", "tags": ["api", "client"], "v": None}},
+            b"name=apiwrappers&tags=api&tags=client",
+            "application/x-www-form-urlencoded",
+        ),
+        (
+            {"data": [("pre-release", True), ("version", 1)]},
+            b"pre-release=True&version=1",
+            "application/x-www-form-urlencoded",
+        ),
+    ],
+)
+def test_encode_body(kwargs, body, content_type) -> None:
+    request = Request(Method.POST, "https://example.com", **kwargs)
+    assert encode_body(request) == (body, content_type)
+
+
+def test_encode_body_with_file_like_data() -> None:
+    stream = io.BytesIO(b"content")
+    request = Request(Method.POST, "https://example.com", data=stream)
+    assert encode_body(request) == (stream, None)
+
+
+def test_encode_body_with_files() -> None:
+    files = {"file": io.BytesIO(b"content")}
+    request = Request(Method.POST, "https://example.com", files=files)
+    body, content_type = encode_body(request)
+    assert isinstance(body, MultipartStream)
+    assert content_type == f"multipart/form-data; boundary={body.boundary}"
+
+
+def test_iter_body_restores_position() -> None:
+    stream = io.BytesIO(b"Hello, World!")
+    stream.seek(7)
+    assert list(iter_body(stream, chunk_size=4)) == [b"Worl", b"d!"]
+    assert stream.tell() == 7
+
+
+def test_multipart_stream() -> None:
+    files = {
+        "first": ("first.txt", io.BytesIO(b"first"), "text/plain"),
+        "second": ("second.txt", io.BytesIO(b"second")),
+        "third": io.BytesIO(b"third"),
+    }
+    stream = MultipartStream(files, boundary="boundary")
+    expected = (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="first"; filename="first.txt"\r\n'
+        b"Content-Type: text/plain\r\n"
+        b"\r\n"
+        b"first\r\n"
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="second"; filename="second.txt"\r\n'
+        b"\r\n"
+        b"second\r\n"
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="third"; filename="third"\r\n'
+        b"\r\n"
+        b"third\r\n"
+        b"--boundary--\r\n"
+    )
+    assert len(stream) == len(expected)
+    assert b"".join(iter_body(stream, chunk_size=3)) == expected
+    assert stream.read() == expected
+    assert stream.tell() == len(expected)
+    assert stream.seek(0, io.SEEK_CUR) == len(expected)
+    assert stream.seek(len(expected)) == len(expected)
+    assert stream.seek(0) == 0
+    assert stream.read() == expected
+
+
+def test_multipart_stream_escapes_quotes_and_line_breaks() -> None:
+    files = {'a"b': ('c"d\r\n.txt', io.BytesIO(b""))}
+    stream = MultipartStream(files, boundary="boundary")
+    assert (
+        b'Content-Disposition: form-data; name="a%22b"; filename="c%22d%0D%0A.txt"'
+        in stream.read()
+    )
+
+
+def test_multipart_stream_can_only_rewind() -> None:
+    stream = MultipartStream({"file": io.BytesIO(b"content")})
+    assert stream.readable()
+    assert stream.seekable()
+    with pytest.raises(io.UnsupportedOperation):
+        stream.seek(1)
+
+
+@pytest.mark.parametrize(
+    ["url", "query_params", "expected"],
+    [
+        ("https://example.com", None, "https://example.com"),
+        ("https://example.com/", {"a": 1, "b": None}, "https://example.com/?a=1"),
+        ("https://example.com/?a=1", [("b", 2)], "https://example.com/?a=1&b=2"),
+    ],
+)
+def test_encode_url(url, query_params, expected) -> None:
+    request = Request(Method.GET, url, query_params=query_params)
+    assert encode_url(request) == expected
+
+
+def test_encode_headers() -> None:
+    request = Request(
+        Method.POST,
+        "https://example.com:8443/users",
+        headers={"content-type": "text/plain", "X-Id": "1"},
+        cookies={"a": "1", "b": "2"},
+    )
+    assert dict(encode_headers(request, "application/json")) == {
+        "Host": "example.com:8443",
+        "Cookie": "a=1; b=2",
+        "content-type": "text/plain",
+        "X-Id": "1",
+    }
+
+
+def test_body_length() -> None:
+    stream = io.BytesIO(b"content")
+    stream.read(3)
+    assert body_length(b"content") == 7
+    assert body_length(stream) == 4
+    assert stream.tell() == 3
+    assert body_length(MultipartStream({}, boundary="b")) == len(b"--b--\r\n")
+
+
+def test_body_length_of_unseekable_stream() -> None:
+    read, write = os.pipe()
+    try:
+        with open(read, "rb", buffering=0) as stream:
+            assert body_length(stream) is None
+    finally:
+        os.close(write)
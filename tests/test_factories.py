@@ -24,3 +24,19 @@ def test_make_driver_aiohttp() -> None:
 
     driver = make_driver("aiohttp")
     assert isinstance(driver, AioHttpDriver)
+
+
+@pytest.mark.asyncio_driver
+def test_make_driver_asyncio() -> None:
+    from apiwrappers.drivers.asyncio import AsyncioDriver
+
+    driver = make_driver("asyncio")
+    assert isinstance(driver, AsyncioDriver)
+
+
+@pytest.mark.urllib3
+def test_make_driver_urllib3() -> None:
+    from apiwrappers.drivers.urllib3 import Urllib3Driver
+
+    driver = make_driver("urllib3")
+    assert isinstance(driver, Urllib3Driver)
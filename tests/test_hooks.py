@@ -0,0 +1,75 @@
+from typing import List
+
+import pytest
+
+from apiwrappers import Method, Request
+from apiwrappers.hooks import Event, Hooks, Trace, current_hooks, emit
+
+
+def test_hooks_representation() -> None:
+    hooks = Hooks()
+    assert repr(hooks) == "Hooks()"
+    hooks.subscribe(Event.TLS_DONE, print)
+    hooks.subscribe(Event.RETRY, print)
+    assert repr(hooks) == "Hooks(tls_done, retry)"
+
+
+def test_hooks_subscribe_and_unsubscribe() -> None:
+    calls: List = []
+    hooks = Hooks()
+    assert not hooks
+    hooks.subscribe(Event.RETRY, lambda *args, **kwargs: calls.append(kwargs))
+    hooks.subscribe(Event.RETRY, print)
+    assert hooks
+    hooks.unsubscribe(Event.RETRY, print)
+    assert hooks
+    hooks.emit(Event.RETRY, Request(Method.GET, "https://example.org"), attempt=2)
+    assert calls == [{"attempt": 2}]
+    hooks.unsubscribe(Event.RETRY, hooks._subscribers[Event.RETRY][0])
+    assert not hooks
+
+
+def test_hooks_unsubscribe_unknown_callback() -> None:
+    with pytest.raises(KeyError):
+        Hooks().unsubscribe(Event.RETRY, print)
+
+
+def test_emit_without_current_hooks() -> None:
+    emit(Event.RETRY, Request(Method.GET, "https://example.org"))
+
+
+def test_emit_to_current_hooks() -> None:
+    calls: List = []
+    hooks = Hooks()
+    hooks.subscribe(Event.RETRY, lambda *args, **kwargs: calls.append(args))
+    request = Request(Method.GET, "https://example.org")
+    token = current_hooks.set(hooks)
+    try:
+        emit(Event.RETRY, request)
+    finally:
+        current_hooks.reset(token)
+    assert calls == [(Event.RETRY, request)]
+
+
+def test_trace_emits_events_for_phases() -> None:
+    events: List = []
+    hooks = Hooks()
+    for event in Event:
+        hooks.subscribe(event, lambda event, request: events.append(event))
+    trace = Trace(Request(Method.GET, "https://example.org"), hooks)
+    for phase in ("connect_start", "connect_end", "tls_end", "headers", "body"):
+        trace.mark(phase)
+    assert events == [
+        Event.REQUEST_START,
+        Event.CONNECTION_CREATED,
+        Event.TLS_DONE,
+        Event.HEADERS_RECEIVED,
+        Event.BODY_DONE,
+    ]
+    assert trace.timings().total is not None
+
+
+def test_trace_without_hooks() -> None:
+    trace = Trace(Request(Method.GET, "https://example.org"))
+    trace.mark("headers")
+    assert trace.timings().ttfb is not None
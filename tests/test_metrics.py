@@ -0,0 +1,122 @@
+import threading
+from typing import List
+
+from apiwrappers.metrics import REGISTRY, MetricsRegistry, Sample
+
+
+def test_registry_representation() -> None:
+    assert repr(REGISTRY) == "<MetricsRegistry 'apiwrappers'>"
+
+
+def test_series_is_reused_in_the_same_thread() -> None:
+    registry = MetricsRegistry()
+    series = registry.series("GET", "https://example.org/users/{id}")
+    assert registry.series("GET", "https://example.org/users/{id}") is series
+    assert registry.series("POST", "https://example.org/users/{id}") is not series
+
+
+def test_histogram_buckets() -> None:
+    registry = MetricsRegistry(buckets=(1, 0.1))
+    series = registry.series("GET", "/")
+    for seconds in (0.05, 0.1, 0.5, 3):
+        series.observe(seconds)
+    buckets = [
+        (sample.labels["le"], sample.value)
+        for sample in registry.samples()
+        if sample.name.endswith("_bucket")
+    ]
+    assert buckets == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+
+
+def test_collect_merges_threads() -> None:
+    registry = MetricsRegistry()
+
+    def record() -> None:
+        series = registry.series("GET", "/")
+        series.observe(0.5)
+        series.add_status(200)
+        series.add_error("Timeout")
+
+    threads = [threading.Thread(target=record) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.series("GET", "/").add_status(500)
+
+    series = registry.collect()[("GET", "/")]
+    assert series.count == 3
+    assert series.sum == 1.5
+    assert series.statuses == {200: 3, 500: 1}
+    assert series.errors == {"Timeout": 3}
+
+
+def test_shards_of_finished_threads_are_merged() -> None:
+    registry = MetricsRegistry()
+
+    def record() -> None:
+        registry.series("GET", "/").observe(0.5)
+
+    for _ in range(20):
+        thread = threading.Thread(target=record)
+        thread.start()
+        thread.join()
+    registry.series("GET", "/").observe(0.5)
+
+    assert len(registry._shards) == 1  # pylint: disable=protected-access
+    assert registry.collect()[("GET", "/")].count == 21
+
+
+def test_export() -> None:
+    registry = MetricsRegistry(buckets=(1,), prefix="client")
+    series = registry.series("GET", "/")
+    series.observe(0.5)
+    series.add_status(200)
+    samples: List[Sample] = []
+    registry.export(samples.append)
+    labels = {"method": "GET", "url": "/"}
+    assert samples == [
+        Sample("client_request_duration_seconds_bucket", {**labels, "le": "1.0"}, 1),
+        Sample("client_request_duration_seconds_bucket", {**labels, "le": "+Inf"}, 1),
+        Sample("client_request_duration_seconds_sum", labels, 0.5),
+        Sample("client_request_duration_seconds_count", labels, 1),
+        Sample("client_requests_in_flight", labels, 0),
+        Sample("client_responses_total", {**labels, "status": "200"}, 1),
+    ]
+
+
+def test_to_prometheus() -> None:
+    registry = MetricsRegistry(buckets=(1,))
+    series = registry.series("GET", 'https://example.org/"{id}"')
+    series.observe(2)
+    series.in_flight += 1
+    series.add_status(404)
+    series.add_error("ConnectionFailed")
+    labels = 'method="GET",url="https://example.org/\\"{id}\\""'
+    assert registry.to_prometheus() == "\n".join(
+        [
+            "# HELP apiwrappers_request_duration_seconds Time spent making a request.",
+            "# TYPE apiwrappers_request_duration_seconds histogram",
+            f'apiwrappers_request_duration_seconds_bucket{{{labels},le="1.0"}} 0',
+            f'apiwrappers_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+            f"apiwrappers_request_duration_seconds_sum{{{labels}}} 2.0",
+            f"apiwrappers_request_duration_seconds_count{{{labels}}} 1",
+            "# HELP apiwrappers_requests_in_flight Number of requests in progress.",
+            "# TYPE apiwrappers_requests_in_flight gauge",
+            f"apiwrappers_requests_in_flight{{{labels}}} 1",
+            "# HELP apiwrappers_responses_total Number of responses by status code.",
+            "# TYPE apiwrappers_responses_total counter",
+            f'apiwrappers_responses_total{{{labels},status="404"}} 1',
+            "# HELP apiwrappers_errors_total "
+            "Number of requests failed with an exception.",
+            "# TYPE apiwrappers_errors_total counter",
+            f'apiwrappers_errors_total{{{labels},error="ConnectionFailed"}} 1',
+            "",
+        ]
+    )
+
+
+def test_to_prometheus_escapes_labels() -> None:
+    registry = MetricsRegistry()
+    registry.series("GET", "a\\b\nc")
+    assert 'url="a\\\\b\\nc"' in registry.to_prometheus()
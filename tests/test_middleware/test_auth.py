@@ -0,0 +1,118 @@
+# pylint: disable=unused-argument
+
+import functools
+from typing import Awaitable, Dict, Generator, List, cast
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Method, Request, Response
+from apiwrappers.auth import BasicAuth, TokenAuth
+from apiwrappers.middleware.auth import (
+    BASIC_AUTH_CACHE_SIZE,
+    Authentication,
+    basic_auth_headers,
+)
+
+from .. import factories
+
+
+def make_handler(requests: List[Request]):
+    def handler(request: Request, *args, **kwargs) -> Response:
+        requests.append(request)
+        return factories.make_response(str(len(requests)).encode(), request=request)
+
+    return handler
+
+
+def make_async_handler(requests: List[Request]):
+    async def handler(request: Request, *args, **kwargs) -> Response:
+        requests.append(request)
+        return factories.make_response(str(len(requests)).encode(), request=request)
+
+    # middleware detects async handlers the same way drivers pass them in
+    return functools.partial(handler)
+
+
+def auth_flow() -> Generator[Request, Response, Dict[str, str]]:
+    first = yield Request(Method.POST, "https://example.com/token")
+    second = yield Request(Method.POST, "https://example.com/token")
+    return {"Authorization": f"{first.text()}:{second.text()}"}
+
+
+def test_no_auth() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com")
+    Authentication(make_handler(requests))(request)
+    assert requests == [request]
+    assert request.headers == {}
+
+
+def test_tuple_auth() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com", auth=("user", "pass"))
+    Authentication(make_handler(requests))(request)
+    assert request.headers == {"Authorization": "Basic dXNlcjpwYXNz"}
+
+
+def test_tuple_auth_headers_are_cached() -> None:
+    handler = make_handler([])
+    first = Request(Method.GET, "https://example.com", auth=("user", "cached"))
+    second = Request(Method.GET, "https://example.com", auth=("user", "cached"))
+    with mock.patch.object(BasicAuth, "make_headers", autospec=True) as make_headers:
+        make_headers.return_value = {"Authorization": "Basic dXNlcjpjYWNoZWQ="}
+        Authentication(handler)(first)
+        Authentication(handler)(second)
+    make_headers.assert_called_once()
+    assert first.headers == second.headers
+    # only headers are kept, not credentials
+    assert ("user", "cached") not in basic_auth_headers
+
+
+def test_tuple_auth_cache_is_bounded() -> None:
+    handler = make_handler([])
+    for i in range(BASIC_AUTH_CACHE_SIZE + 10):
+        request = Request(Method.GET, "https://example.com", auth=("user", str(i)))
+        Authentication(handler)(request)
+    assert len(basic_auth_headers) == BASIC_AUTH_CACHE_SIZE
+
+
+def test_simple_auth() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com", auth=TokenAuth("token"))
+    Authentication(make_handler(requests))(request)
+    assert requests == [request]
+    assert request.headers == {"Authorization": "Bearer token"}
+
+
+def test_auth_flow() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com", auth=auth_flow)
+    response = Authentication(make_handler(requests))(request)
+    assert len(requests) == 3
+    assert requests[-1] is request
+    assert request.headers == {"Authorization": "1:2"}
+    assert response.content == b"3"
+
+
+@pytest.mark.asyncio
+async def test_auth_flow_async() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com", auth=auth_flow)
+    middleware = Authentication(make_async_handler(requests))
+    # see https://github.com/python/mypy/issues/8283
+    response = await cast(Awaitable[Response], middleware(request))
+    assert len(requests) == 3
+    assert requests[-1] is request
+    assert request.headers == {"Authorization": "1:2"}
+    assert response.content == b"3"
+
+
+@pytest.mark.asyncio
+async def test_simple_auth_async() -> None:
+    requests: List[Request] = []
+    request = Request(Method.GET, "https://example.com", auth=("user", "pass"))
+    middleware = Authentication(make_async_handler(requests))
+    await cast(Awaitable[Response], middleware(request))
+    assert requests == [request]
+    assert request.headers == {"Authorization": "Basic dXNlcjpwYXNz"}
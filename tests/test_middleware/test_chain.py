@@ -1,9 +1,13 @@
+from typing import Dict, Generator, List
 from unittest import mock
 
 import pytest
 
 from apiwrappers.entities import Method, Request, Response
+from apiwrappers.hooks import Event, Hooks, emit
 from apiwrappers.middleware import BaseMiddleware, MiddlewareChain
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.structures import Deadline, NoValue, Timeouts
 
 from .. import factories
 
@@ -101,3 +105,88 @@ async def test_chain_order_of_execution_in_async_driver() -> None:
     response = await driver.fetch(Request(Method.GET, "https://example.org"))
     assert response.request.headers["x-request-id"] == "12"
     assert response.headers["x-response-id"] == "21"
+
+
+def auth_flow() -> Generator[Request, Response, Dict[str, str]]:
+    yield Request(Method.POST, "https://example.org/auth")
+    yield Request(Method.POST, "https://example.org/auth")
+    return {"Authorization": "Bearer token"}
+
+
+def make_timeout_recorder(timeouts: List):
+    class TimeoutRecorder(BaseMiddleware):
+        def call_next(self, handler, request, *args, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            return super().call_next(handler, request, *args, **kwargs)
+
+        async def call_next_async(self, handler, request, *args, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            return await super().call_next_async(handler, request, *args, **kwargs)
+
+    return TimeoutRecorder
+
+
+def test_chain_shares_deadline_between_auth_requests() -> None:
+    timeouts: List = []
+    response_mock = factories.make_response(b"")
+    driver = factories.make_driver(
+        response_mock, Authentication, make_timeout_recorder(timeouts)
+    )
+    driver.timeout = Timeouts(connect=1, total=5)
+    driver.fetch(Request(Method.GET, "https://example.org", auth=auth_flow))
+    assert len(timeouts) == 3
+    assert isinstance(timeouts[0], Deadline)
+    assert all(timeout is timeouts[0] for timeout in timeouts)
+    assert timeouts[0].timeouts == Timeouts(connect=1, total=5)
+
+
+@pytest.mark.asyncio
+async def test_chain_shares_deadline_between_auth_requests_in_async_driver() -> None:
+    timeouts: List = []
+    response_mock = factories.make_response(b"")
+    driver = factories.make_async_driver(
+        response_mock, Authentication, make_timeout_recorder(timeouts)
+    )
+    request = Request(Method.GET, "https://example.org", auth=auth_flow)
+    await driver.fetch(request, timeout=Timeouts(total=5))
+    assert len(timeouts) == 3
+    assert isinstance(timeouts[0], Deadline)
+    assert all(timeout is timeouts[0] for timeout in timeouts)
+
+
+@pytest.mark.parametrize(
+    "timeout", [NoValue(), 1, None, Timeouts(connect=1), Deadline(5)]
+)
+def test_chain_passes_timeout_without_total_as_is(timeout) -> None:
+    timeouts: List = []
+    response_mock = factories.make_response(b"")
+    driver = factories.make_driver(response_mock, make_timeout_recorder(timeouts))
+    driver.fetch(Request(Method.GET, "https://example.org"), timeout)
+    assert timeouts == [timeout]
+
+
+class Retry(BaseMiddleware):
+    def process_request(self, request: Request) -> Request:
+        emit(Event.RETRY, request, attempt=1)
+        return super().process_request(request)
+
+
+def test_chain_exposes_driver_hooks_to_middleware() -> None:
+    calls: List = []
+    driver = factories.make_driver(factories.make_response(b""), Retry)
+    driver.hooks = Hooks()  # type: ignore
+    driver.hooks.subscribe(Event.RETRY, lambda *args, **kwargs: calls.append(kwargs))
+    driver.fetch(Request(Method.GET, "https://example.org"))
+    assert calls == [{"attempt": 1}]
+    emit(Event.RETRY, Request(Method.GET, "https://example.org"), attempt=2)
+    assert calls == [{"attempt": 1}]
+
+
+@pytest.mark.asyncio
+async def test_chain_exposes_driver_hooks_to_middleware_in_async_driver() -> None:
+    calls: List = []
+    driver = factories.make_async_driver(factories.make_response(b""), Retry)
+    driver.hooks = Hooks()  # type: ignore
+    driver.hooks.subscribe(Event.RETRY, lambda *args, **kwargs: calls.append(kwargs))
+    await driver.fetch(Request(Method.GET, "https://example.org"))
+    assert calls == [{"attempt": 1}]
@@ -0,0 +1,104 @@
+import functools
+
+import pytest
+
+from apiwrappers import Method, Request, Response, Url, exceptions
+from apiwrappers.metrics import REGISTRY, MetricsRegistry
+from apiwrappers.middleware.auth import Authentication
+from apiwrappers.middleware.metrics import Metrics
+
+from .. import factories
+
+URL = Url("https://example.org")("/users/{id}", id=1)
+
+
+def test_metrics_using() -> None:
+    registry = MetricsRegistry()
+    middleware = Metrics.using(registry)
+    assert middleware.__name__ == "Metrics"
+    assert issubclass(middleware, Metrics)
+    assert middleware.registry is registry
+    assert Metrics.registry is REGISTRY
+
+
+def test_metrics_records_response() -> None:
+    registry = MetricsRegistry()
+    response = factories.make_response(b"", status_code=404)
+    driver = factories.make_driver(response, Metrics.using(registry))
+    driver.fetch(Request(Method.GET, URL))
+    driver.fetch(Request(Method.GET, Url(URL.template, id=2)))
+    series = registry.collect()[("GET", "https://example.org/users/{id}")]
+    assert series.count == 2
+    assert series.statuses == {404: 2}
+    assert series.errors == {}
+    assert series.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_response_in_async_driver() -> None:
+    registry = MetricsRegistry()
+    response = factories.make_response(b"")
+    driver = factories.make_async_driver(response, Metrics.using(registry))
+    await driver.fetch(Request(Method.POST, URL))
+    series = registry.collect()[("POST", "https://example.org/users/{id}")]
+    assert series.count == 1
+    assert series.statuses == {200: 1}
+    assert series.in_flight == 0
+
+
+def test_metrics_records_in_flight_requests() -> None:
+    registry = MetricsRegistry()
+    in_flight = []
+
+    def handler(request: Request, *args, **kwargs) -> Response:
+        in_flight.append(registry.collect()[("GET", URL.template)].in_flight)
+        return factories.make_response(b"", request=request)
+
+    Metrics.using(registry)(handler)(Request(Method.GET, URL))
+    assert in_flight == [1]
+    assert registry.collect()[("GET", URL.template)].in_flight == 0
+
+
+def test_metrics_records_errors() -> None:
+    registry = MetricsRegistry()
+
+    def handler(request: Request, *args, **kwargs) -> Response:
+        raise exceptions.Timeout
+
+    with pytest.raises(exceptions.Timeout):
+        Metrics.using(registry)(handler)(Request(Method.GET, URL))
+    series = registry.collect()[("GET", URL.template)]
+    assert series.count == 1
+    assert series.statuses == {}
+    assert series.errors == {"Timeout": 1}
+    assert series.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_errors_in_async_driver() -> None:
+    registry = MetricsRegistry()
+
+    async def handler(request: Request, *args, **kwargs) -> Response:
+        raise exceptions.ConnectionFailed
+
+    middleware = Metrics.using(registry)(functools.partial(handler))
+    with pytest.raises(exceptions.ConnectionFailed):
+        await middleware(Request(Method.GET, URL))
+    series = registry.collect()[("GET", URL.template)]
+    assert series.errors == {"ConnectionFailed": 1}
+    assert series.in_flight == 0
+
+
+def test_metrics_records_authentication_requests() -> None:
+    def auth_flow():
+        yield Request(Method.POST, "https://example.org/auth")
+        return {"Authorization": "Bearer token"}
+
+    registry = MetricsRegistry()
+    response = factories.make_response(b"")
+    driver = factories.make_driver(response, Authentication, Metrics.using(registry))
+    driver.fetch(Request(Method.GET, URL, auth=auth_flow))
+    assert set(registry.collect()) == {
+        ("POST", "https://example.org/auth"),
+        ("GET", "https://example.org/users/{id}"),
+    }
@@ -0,0 +1,122 @@
+import asyncio
+import cProfile
+import functools
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Method, Request, Response, Url
+from apiwrappers.middleware.profiling import Profiling
+from apiwrappers.profiling import PROFILER, Profiler
+
+from .. import factories
+from ..test_profiling import busy
+
+URL = Url("https://example.org")("/users/{id}", id=1)
+KEY = ("GET", URL.template)
+
+
+def slow_handler(request: Request, *args, **kwargs) -> Response:
+    busy(0.03)
+    return factories.make_response(b"", request=request)
+
+
+async def slow_async_handler(request: Request, *args, **kwargs) -> Response:
+    return slow_handler(request)
+
+
+def test_profiling_using() -> None:
+    profiler = Profiler()
+    middleware = Profiling.using(profiler, threshold=None, every=10)
+    assert middleware.__name__ == "Profiling"
+    assert issubclass(middleware, Profiling)
+    assert middleware.profiler is profiler
+    assert middleware.threshold is None
+    assert middleware.every == 10
+    assert Profiling.using().profiler is PROFILER
+    assert Profiling.profiler is PROFILER
+    assert Profiling.threshold == 1
+
+
+def test_profiling_samples_slow_requests() -> None:
+    profiler = Profiler(interval=0.001)
+    middleware = Profiling.using(profiler, threshold=0.01)
+    middleware(slow_handler)(Request(Method.GET, URL))
+    assert sum(profiler.stacks[KEY].values()) > 0
+    assert profiler.profiles == {}
+
+
+@pytest.mark.asyncio
+async def test_profiling_samples_slow_requests_in_async_driver() -> None:
+    profiler = Profiler(interval=0.001)
+    middleware = Profiling.using(profiler, threshold=0.01)
+    await middleware(functools.partial(slow_async_handler))(Request(Method.GET, URL))
+    assert sum(profiler.stacks[KEY].values()) > 0
+
+
+def test_profiling_skips_fast_requests() -> None:
+    profiler = Profiler()
+    response = factories.make_response(b"")
+    driver = factories.make_driver(response, Profiling.using(profiler))
+    driver.fetch(Request(Method.GET, URL))
+    assert profiler.stacks == {}
+    assert profiler._active == {}  # pylint: disable=protected-access
+
+
+def test_profiling_profiles_every_nth_request() -> None:
+    profiler = Profiler()
+    response = factories.make_response(b"")
+    middleware = Profiling.using(profiler, threshold=None, every=2)
+    driver = factories.make_driver(response, middleware)
+    driver.fetch(Request(Method.GET, URL))
+    assert profiler.profiles == {}
+    driver.fetch(Request(Method.GET, URL))
+    assert list(profiler.profiles) == [KEY]
+    assert profiler.stacks == {}
+
+
+@pytest.mark.asyncio
+async def test_profiling_profiles_every_nth_request_in_async_driver() -> None:
+    profiler = Profiler()
+    response = factories.make_response(b"")
+    middleware = Profiling.using(profiler, threshold=None, every=1)
+    driver = factories.make_async_driver(response, middleware)
+    await driver.fetch(Request(Method.POST, URL))
+    await driver.fetch(Request(Method.POST, URL))
+    stats = profiler.profiles[("POST", URL.template)]
+    assert stats.total_calls > 0  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_profiling_profiles_one_request_at_a_time_in_async_driver() -> None:
+    async def handler(request: Request, *args, **kwargs) -> Response:
+        await asyncio.sleep(0.01)
+        return factories.make_response(b"", request=request)
+
+    profiler = Profiler()
+    middleware = Profiling.using(profiler, threshold=None, every=1)
+    requests = [Request(Method.GET, URL) for _ in range(3)]
+    await asyncio.gather(*(middleware(handler)(request) for request in requests))
+    stats = profiler.profiles[KEY]
+    assert stats.total_calls > 0  # type: ignore
+    await middleware(handler)(Request(Method.POST, URL))
+    assert ("POST", URL.template) in profiler.profiles
+
+
+def test_profiling_doesnt_fail_request_if_profiler_cant_start() -> None:
+    profiler = Profiler()
+    response = factories.make_response(b"")
+    middleware = Profiling.using(profiler, threshold=None, every=1)
+    driver = factories.make_driver(response, middleware)
+    with mock.patch.object(cProfile.Profile, "enable", side_effect=ValueError):
+        assert driver.fetch(Request(Method.GET, URL)).status_code == 200
+    assert profiler.profiles == {}
+
+
+@pytest.mark.asyncio
+async def test_profiling_without_threshold_in_async_driver() -> None:
+    profiler = Profiler()
+    middleware = Profiling.using(profiler, threshold=None)
+    await middleware(functools.partial(slow_async_handler))(Request(Method.GET, URL))
+    assert profiler.stacks == {}
+    assert profiler.profiles == {}
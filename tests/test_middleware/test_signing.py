@@ -0,0 +1,110 @@
+# pylint: disable=unused-argument
+
+import io
+from typing import Dict
+
+from apiwrappers import Method, Request, Response
+from apiwrappers.encoders import MultipartStream, iter_body
+from apiwrappers.middleware.signing import Signing
+
+from .. import factories
+
+
+class SignerMock:
+    def __init__(self):
+        self.requests = []
+
+    def sign(self, request: Request) -> Dict[str, str]:
+        self.requests.append(request)
+        return {"Authorization": "signed"}
+
+
+def handler(request: Request, *args, **kwargs) -> Response:
+    return factories.make_response(b"", request=request)
+
+
+def test_signing_using() -> None:
+    signer = SignerMock()
+    middleware = Signing.using(signer)
+    assert middleware.__name__ == "Signing"
+    assert issubclass(middleware, Signing)
+    assert middleware.signer is signer
+
+
+def test_signing_without_body() -> None:
+    signer = SignerMock()
+    request = Request(Method.GET, "https://example.com")
+    response = Signing.using(signer)(handler)(request)
+    assert signer.requests == [request]
+    assert request.data is None
+    assert response.request.headers == {"Authorization": "signed"}
+
+
+def test_signing_encodes_json() -> None:
+    request = Request(Method.POST, "https://example.com", json={"key": "value"})
+    Signing.using(SignerMock())(handler)(request)
+    assert request.json is None
+    assert request.data == b'{"key": "value"}'
+    assert request.headers["Content-Type"] == "application/json"
+
+
+def test_signing_keeps_content_type() -> None:
+    request = Request(
+        Method.POST,
+        "https://example.com",
+        json={"key": "value"},
+        headers={"content-type": "application/vnd.api+json"},
+    )
+    Signing.using(SignerMock())(handler)(request)
+    assert request.headers == {
+        "content-type": "application/vnd.api+json",
+        "Authorization": "signed",
+    }
+
+
+def test_signing_streams_files() -> None:
+    request = Request(
+        Method.POST, "https://example.com", files={"file": io.BytesIO(b"content")}
+    )
+    Signing.using(SignerMock())(handler)(request)
+    assert request.files is None
+    assert isinstance(request.data, MultipartStream)
+    assert request.headers["Content-Type"] == request.data.content_type
+    assert request.headers["Content-Length"] == str(len(request.data))
+
+
+def test_signing_rewinds_files_when_signed_again() -> None:
+    class BodyRecorder(SignerMock):
+        def sign(self, request: Request) -> Dict[str, str]:
+            self.requests.append(b"".join(iter_body(request.data)))
+            return {}
+
+    signer = BodyRecorder()
+    request = Request(
+        Method.POST, "https://example.com", files={"file": io.BytesIO(b"content")}
+    )
+    middleware = Signing.using(signer)(handler)
+    middleware(request)
+    request.data.read()  # type: ignore  # the body is sent
+    middleware(request)
+    first, second = signer.requests
+    assert b"content" in first
+    assert first == second
+
+
+def test_signing_rewinds_file_like_data_when_signed_again() -> None:
+    class BodyRecorder(SignerMock):
+        def sign(self, request: Request) -> Dict[str, str]:
+            self.requests.append(b"".join(iter_body(request.data)))
+            return {}
+
+    signer = BodyRecorder()
+    body = io.BytesIO(b"--content")
+    body.seek(2)
+    request = Request(Method.POST, "https://example.com", data=body)
+    middleware = Signing.using(signer)(handler)
+    middleware(request)
+    body.read()  # the body is sent, as drivers pass file-like data as is
+    middleware(request)
+    assert signer.requests == [b"content", b"content"]
+    assert body.tell() == 2
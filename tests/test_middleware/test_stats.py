@@ -0,0 +1,123 @@
+import pytest
+
+from apiwrappers import Method, Request, Response, exceptions
+from apiwrappers.middleware import BaseMiddleware
+from apiwrappers.middleware.stats import MiddlewareStats, Stat
+
+from .. import factories
+
+HOOKS = ["process_request", "process_response", "process_exception"]
+
+
+class First(BaseMiddleware):
+    pass
+
+
+class Second(BaseMiddleware):
+    pass
+
+
+class Failing(BaseMiddleware):
+    def process_request(self, request: Request) -> Request:
+        raise exceptions.Timeout
+
+
+class Plain:
+    def __init__(self, handler):
+        self.handler = handler
+
+    def __call__(self, request: Request, *args, **kwargs) -> Response:
+        return self.handler(request, *args, **kwargs)
+
+
+def test_stat() -> None:
+    stat = Stat()
+    assert stat.mean == 0
+    stat.add(0.2)
+    stat.add(0.4)
+    assert (stat.count, stat.min, stat.max) == (2, 0.2, 0.4)
+    assert stat.mean == pytest.approx(0.3)
+    assert repr(stat) == "Stat(count=2, total=0.600000, mean=0.300000)"
+
+
+def test_middleware_stats_report() -> None:
+    stats = MiddlewareStats()
+    assert stats.report().split() == ["name", "calls", "total", "mean", "min", "max"]
+    stats.add("First", 0.001)
+    stats.add("First", 0.003)
+    assert repr(stats) == "MiddlewareStats(First)"
+    assert stats.report().splitlines()[1].split() == [
+        "First",
+        "2",
+        "4000.0",
+        "2000.0",
+        "1000.0",
+        "3000.0",
+    ]
+    stats.clear()
+    assert stats.stats == {}
+
+
+def test_middleware_stats_are_disabled_by_default() -> None:
+    driver = factories.make_driver(factories.make_response(b""), First)
+    driver.fetch(Request(Method.GET, "https://example.org"))
+    assert getattr(driver, "middleware_stats", None) is None
+
+
+def test_middleware_stats() -> None:
+    driver = factories.make_driver(factories.make_response(b""), First, Second)
+    driver.middleware_stats = stats = MiddlewareStats()  # type: ignore
+    for _ in range(2):
+        driver.fetch(Request(Method.GET, "https://example.org"))
+    assert {name: stat.count for name, stat in stats.stats.items()} == {
+        "First": 2,
+        "First.process_request": 2,
+        "First.process_response": 2,
+        "Second": 2,
+        "Second.process_request": 2,
+        "Second.process_response": 2,
+        "fetch": 2,
+    }
+    assert all(stat.min >= 0 for stat in stats.stats.values())
+
+    driver.middleware_stats = None  # type: ignore
+    driver.fetch(Request(Method.GET, "https://example.org"))
+    assert stats.stats["fetch"].count == 2
+
+
+@pytest.mark.asyncio
+async def test_middleware_stats_in_async_driver() -> None:
+    response = factories.make_response(b"")
+    driver = factories.make_async_driver(response, First, Second)
+    driver.middleware_stats = stats = MiddlewareStats()  # type: ignore
+    await driver.fetch(Request(Method.GET, "https://example.org"))
+    assert set(stats.stats) == {
+        "First",
+        "First.process_request",
+        "First.process_response",
+        "Second",
+        "Second.process_request",
+        "Second.process_response",
+        "fetch",
+    }
+
+
+def test_middleware_stats_records_exceptions() -> None:
+    driver = factories.make_driver(factories.make_response(b""), First, Failing)
+    driver.middleware_stats = stats = MiddlewareStats()  # type: ignore
+    with pytest.raises(exceptions.Timeout):
+        driver.fetch(Request(Method.GET, "https://example.org"))
+    assert set(stats.stats) == {
+        "First",
+        "First.process_request",
+        "First.process_exception",
+        "Failing",
+        "Failing.process_request",
+    }
+
+
+def test_middleware_stats_with_middleware_without_hooks() -> None:
+    driver = factories.make_driver(factories.make_response(b""), Plain)  # type: ignore
+    driver.middleware_stats = stats = MiddlewareStats()  # type: ignore
+    driver.fetch(Request(Method.GET, "https://example.org"))
+    assert set(stats.stats) == {"Plain", "fetch"}
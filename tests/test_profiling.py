@@ -0,0 +1,137 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from apiwrappers.profiling import PROFILER, Profiler, fold
+
+KEY = ("GET", "https://example.org/users/{id}")
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_representation() -> None:
+    assert repr(PROFILER) == "<Profiler interval=0.005>"
+
+
+def test_fold() -> None:
+    frame = sys._getframe()  # pylint: disable=protected-access
+    stack, lineno = fold(frame), frame.f_lineno
+    assert stack.endswith(f";test_fold (test_profiling.py:{lineno})")
+
+
+def test_track_samples_slow_requests() -> None:
+    profiler = Profiler(interval=0.001)
+    tokens = [profiler.track(KEY, threshold=0.01) for _ in range(2)]
+    busy(0.05)
+    for token in tokens:
+        profiler.untrack(token)
+    stacks = profiler.stacks[KEY]
+    assert sum(stacks.values()) > 0
+    assert any("busy (test_profiling.py" in stack for stack in stacks)
+
+
+def test_track_ignores_fast_requests() -> None:
+    profiler = Profiler(interval=0.001)
+    token = profiler.track(KEY, threshold=1)
+    busy(0.01)
+    profiler.untrack(token)
+    assert profiler.stacks == {}
+
+
+def test_track_does_not_sample_before_threshold() -> None:
+    profiler = Profiler(interval=0.001)
+    with mock.patch.object(profiler, "sample") as sample:
+        tokens = [profiler.track(KEY, threshold=1)]
+        busy(0.02)
+        tokens.append(profiler.track(KEY, threshold=2))
+        for token in tokens:
+            profiler.untrack(token)
+        thread = profiler._thread  # pylint: disable=protected-access
+        assert thread is not None
+        thread.join(1)
+    sample.assert_not_called()
+
+
+def test_track_wakes_up_for_closer_threshold() -> None:
+    profiler = Profiler(interval=0.001)
+    tokens = [profiler.track(KEY, threshold=threshold) for threshold in (1, 0.01)]
+    busy(0.05)
+    for token in tokens:
+        profiler.untrack(token)
+    assert sum(profiler.stacks[KEY].values()) > 0
+
+
+def test_sampling_thread_stops_without_requests() -> None:
+    profiler = Profiler(interval=0.001)
+    profiler.untrack(profiler.track(KEY, threshold=1))
+    thread = profiler._thread  # pylint: disable=protected-access
+    assert thread is not None
+    thread.join(1)
+    assert profiler._thread is None  # pylint: disable=protected-access
+
+
+def test_sample_skips_finished_threads() -> None:
+    profiler = Profiler()
+    thread = threading.Thread(target=lambda: None)
+    thread.start()
+    thread.join()
+    profiler.sample([(KEY, thread.ident, 0)])  # type: ignore
+    assert profiler.stacks == {}
+
+
+def test_add_profile() -> None:
+    profiler = Profiler()
+    for _ in range(2):
+        profile = cProfile.Profile()
+        profile.runcall(busy, 0.001)
+        profiler.add_profile(KEY, profile)
+    stats = profiler.profiles[KEY].stats  # type: ignore
+    calls = [value[0] for func, value in stats.items() if func[2] == "busy"]
+    assert calls == [2]
+
+
+def test_report() -> None:
+    profiler = Profiler()
+    profiler.stacks[KEY] = Counter({"main;fetch;fromjson": 3, "main;fetch;read": 1})
+    profile = cProfile.Profile()
+    profile.runcall(busy, 0.001)
+    profiler.add_profile(("POST", "/users"), profile)
+    report = profiler.report(limit=1).splitlines()
+    assert report[:3] == [
+        "GET https://example.org/users/{id}: 4 samples",
+        "       3  fromjson",
+        "POST /users: profile",
+    ]
+    assert any("busy" in line for line in report[3:])
+
+
+def test_dump(tmp_path) -> None:
+    profiler = Profiler()
+    profiler.stacks[KEY] = Counter({"main;fetch": 2})
+    profile = cProfile.Profile()
+    profile.runcall(busy, 0.001)
+    profiler.add_profile(KEY, profile)
+    profiler.dump(str(tmp_path / "profiles"))
+    folded = (tmp_path / "profiles" / "stacks.folded").read_text()
+    assert folded == "GET https://example.org/users/{id};main;fetch 2\n"
+    path = tmp_path / "profiles" / "GET_https_example.org_users_id.prof"
+    assert pstats.Stats(str(path)).total_calls > 0  # type: ignore
+
+
+def test_clear() -> None:
+    profiler = Profiler()
+    profiler.stacks[KEY] = Counter({"main;fetch": 2})
+    profile = cProfile.Profile()
+    profile.runcall(busy, 0)
+    profiler.add_profile(KEY, profile)
+    profiler.clear()
+    assert profiler.stacks == {}
+    assert profiler.profiles == {}
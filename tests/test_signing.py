@@ -0,0 +1,209 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from apiwrappers import Method, Request
+from apiwrappers.signing import (
+    HmacSigner,
+    SigV4Signer,
+    canonical_request,
+    canonical_uri,
+    payload_hash,
+    utcnow,
+)
+
+EMPTY_HASH = "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+
+
+def clock() -> datetime:
+    return datetime(2015, 8, 30, 12, 36, tzinfo=timezone.utc)
+
+
+def sigv4_signer(**kwargs) -> SigV4Signer:
+    kwargs.setdefault("clock", clock)
+    return SigV4Signer(
+        "AKIDEXAMPLE",
+        "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+        "us-east-1",
+        "service",
+        **kwargs,
+    )
+
+
+class ChunkRecorder(io.BytesIO):
+    def __init__(self, content: bytes):
+        super().__init__(content)
+        self.sizes = []
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.sizes.append(len(chunk))
+        return chunk
+
+
+def test_payload_hash_for_empty_body() -> None:
+    request = Request(Method.GET, "https://example.com")
+    assert payload_hash(request) == EMPTY_HASH
+
+
+def test_payload_hash_streams_body() -> None:
+    stream = ChunkRecorder(b"x" * (2**16 + 1))
+    request = Request(Method.POST, "https://example.com", data=stream)
+    assert payload_hash(request) == payload_hash(
+        Request(Method.POST, "https://example.com", data=b"x" * (2**16 + 1))
+    )
+    assert stream.sizes == [2**16, 1, 0]
+    assert stream.tell() == 0
+
+
+def test_canonical_request() -> None:
+    request = Request(
+        Method.GET,
+        "https://example.com:8443/path/with space?b=2&a=1",
+        query_params={"c": ["3", "1"], "d": None, "e": "~ &"},
+        headers={"X-Custom": "  some   value ", "X-Ignored": "value"},
+    )
+    canonical, signed = canonical_request(request, ["host", "x-custom"], EMPTY_HASH)
+    assert signed == "host;x-custom"
+    assert canonical == "\n".join(
+        [
+            "GET",
+            "/path/with%20space",
+            "a=1&b=2&c=1&c=3&e=~%20%26",
+            "host:example.com:8443",
+            "x-custom:some value",
+            "",
+            "host;x-custom",
+            EMPTY_HASH,
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    ["url", "double_encode", "expected"],
+    [
+        ("https://example.com", False, "/"),
+        ("https://example.com/a b/~c", False, "/a%20b/~c"),
+        ("https://example.com/a%20b", False, "/a%20b"),
+        ("https://example.com/a b/~c", True, "/a%2520b/~c"),
+        ("https://example.com/a%20b", True, "/a%2520b"),
+    ],
+)
+def test_canonical_uri(url, double_encode, expected) -> None:
+    request = Request(Method.GET, url)
+    assert canonical_uri(request, double_encode) == expected
+
+
+@pytest.mark.parametrize(
+    ["service", "double_encode", "expected"],
+    [
+        ("execute-api", None, True),
+        ("s3", None, False),
+        ("s3", True, True),
+    ],
+)
+def test_sigv4_double_encode(service, double_encode, expected) -> None:
+    signer = SigV4Signer(
+        "key", "secret", "us-east-1", service, double_encode=double_encode
+    )
+    assert signer.double_encode is expected
+
+
+def test_sigv4_signs_double_encoded_path() -> None:
+    request = Request(Method.GET, "https://example.amazonaws.com/a b")
+    signature = sigv4_signer().sign(request)["Authorization"]
+    assert sigv4_signer(double_encode=False).sign(request)["Authorization"] != (
+        signature
+    )
+
+
+def test_sigv4_get_vanilla() -> None:
+    # see: AWS Signature Version 4 test suite
+    signer = sigv4_signer(sign_content_hash=False)
+    request = Request(Method.GET, "https://example.amazonaws.com/")
+    assert signer.sign(request) == {
+        "X-Amz-Date": "20150830T123600Z",
+        "Authorization": (
+            "AWS4-HMAC-SHA256 "
+            "Credential=AKIDEXAMPLE/20150830/us-east-1/service/aws4_request, "
+            "SignedHeaders=host;x-amz-date, "
+            "Signature="
+            "5fa00fa31553b73ebf1942676e86291e8372ff2a2260956d9b8aae1d763fbf31"
+        ),
+    }
+
+
+def test_sigv4_get_vanilla_query_order_key_case() -> None:
+    # see: AWS Signature Version 4 test suite
+    signer = sigv4_signer(sign_content_hash=False)
+    request = Request(
+        Method.GET,
+        "https://example.amazonaws.com/",
+        query_params={"Param2": "value2", "Param1": "value1"},
+    )
+    assert signer.sign(request)["Authorization"].endswith(
+        "Signature=b97d918cfa904a5beff61c982a1b6f458b799221646efd99d3219ec94cdf2500"
+    )
+
+
+def test_sigv4_signs_content_hash_and_session_token() -> None:
+    signer = sigv4_signer(session_token="token")
+    request = Request(Method.POST, "https://example.amazonaws.com/", data=b"")
+    headers = signer.sign(request)
+    assert headers["X-Amz-Content-SHA256"] == EMPTY_HASH
+    assert headers["X-Amz-Security-Token"] == "token"
+    assert (
+        "SignedHeaders=host;x-amz-content-sha256;x-amz-date;x-amz-security-token"
+        in headers["Authorization"]
+    )
+
+
+def test_sigv4_caches_signing_key_per_day() -> None:
+    now = [datetime(2015, 8, 30, tzinfo=timezone.utc)]
+    signer = sigv4_signer(clock=lambda: now[0])
+    request = Request(Method.GET, "https://example.amazonaws.com/")
+
+    signer.sign(request)
+    key = signer.signing_key("20150830", "us-east-1", "service")
+    signer.sign(request)
+    assert signer.signing_key("20150830", "us-east-1", "service") is key
+
+    now[0] = datetime(2015, 8, 31, tzinfo=timezone.utc)
+    signer.sign(request)
+    assert list(signer._signing_keys) == [  # pylint: disable=protected-access
+        ("20150831", "us-east-1", "service")
+    ]
+
+
+def test_sigv4_representation() -> None:
+    assert repr(sigv4_signer()) == "<SigV4Signer 'AKIDEXAMPLE' us-east-1/service>"
+
+
+def test_hmac_signer() -> None:
+    signer = HmacSigner("key-id", "secret", clock=clock)
+    request = Request(
+        Method.POST,
+        "https://example.com/users",
+        data=b"{}",
+        headers={"Content-Type": "application/json"},
+    )
+    headers = signer.sign(request)
+    assert headers["X-Date"] == "20150830T123600Z"
+    assert headers["X-Content-SHA256"] == (
+        "44136fa355b3678a1146ad16f7e8649e94fb4fc21fe77e8310c060f61caaff8a"
+    )
+    assert headers["Authorization"].startswith(
+        "HMAC-SHA256 KeyId=key-id, "
+        "SignedHeaders=content-type;host;x-content-sha256;x-date, "
+        "Signature="
+    )
+    assert signer.sign(request) == headers
+
+
+def test_hmac_signer_representation() -> None:
+    assert repr(HmacSigner("key-id", "secret")) == "<HmacSigner 'key-id'>"
+
+
+def test_utcnow() -> None:
+    assert utcnow().tzinfo is timezone.utc
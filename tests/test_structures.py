@@ -1,5 +1,10 @@
-from apiwrappers import Url
-from apiwrappers.structures import CaseInsensitiveDict, NoValue
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from apiwrappers import Deadline, Timeouts, Timings, Url, exceptions
+from apiwrappers.structures import CaseInsensitiveDict, NoValue, TimingsRecorder
 
 
 def test_representation_no_value():
@@ -92,3 +97,74 @@ def test_url_join_path():
 
     url = Url("https://example.org")("/{version}", version="v1")("/users/{id}", id=1)
     assert url == "https://example.org/v1/users/1"
+
+
+def test_timeouts_converts_timedelta_to_seconds() -> None:
+    timeouts = Timeouts(connect=1, read=timedelta(minutes=1), total=None)
+    assert timeouts == Timeouts(connect=1, read=60)
+    assert timeouts.read == 60.0
+    assert timeouts.total is None
+
+
+def test_timeouts_representation() -> None:
+    assert repr(Timeouts(connect=1)) == (
+        "Timeouts(connect=1, read=None, write=None, pool=None, total=None)"
+    )
+
+
+def test_deadline_from_seconds() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.monotonic.side_effect = [100, 102, 103]
+        deadline = Deadline(timedelta(seconds=5))
+        assert deadline.remaining() == 3
+        assert deadline.timeout() == Timeouts(total=2)
+
+
+def test_deadline_keeps_other_timeouts() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.monotonic.side_effect = [100, 101]
+        deadline = Deadline(Timeouts(connect=1, read=2, total=5))
+        assert deadline.timeout() == Timeouts(connect=1, read=2, total=4)
+
+
+def test_deadline_exceeded() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.monotonic.side_effect = [100, 106, 106]
+        deadline = Deadline(5)
+        assert deadline.remaining() == 0
+        with pytest.raises(exceptions.Timeout):
+            deadline.timeout()
+
+
+def test_deadline_requires_total_timeout() -> None:
+    with pytest.raises(ValueError):
+        Deadline(Timeouts(connect=1))
+
+
+def test_deadline_representation() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.monotonic.side_effect = [100, 101.5]
+        assert repr(Deadline(5)) == "Deadline(remaining=3.500)"
+
+
+def test_timings_recorder() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.perf_counter.side_effect = [0, 1, 3, 4, 6, 7, 10]
+        recorder = TimingsRecorder()
+        for event in ("connect_start", "dns_start", "dns_end", "tls_start"):
+            recorder.mark(event)
+        recorder.mark("connect_end")
+        recorder.mark("headers")
+    assert recorder.timings() == Timings(
+        dns=1, connect=6, tls=1, ttfb=10, download=None, total=None
+    )
+
+
+def test_timings_recorder_keeps_last_mark() -> None:
+    with mock.patch("apiwrappers.structures.time") as time_mock:
+        time_mock.perf_counter.side_effect = [0, 1, 2, 3]
+        recorder = TimingsRecorder()
+        recorder.mark("headers")
+        recorder.mark("headers")
+        recorder.mark("body")
+    assert recorder.timings() == Timings(ttfb=2, download=1, total=3)